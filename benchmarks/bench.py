@@ -0,0 +1,254 @@
+"""
+utils/데이터 가공 핫패스 벤치마크.
+
+    python -m benchmarks.bench                          # 전체 실행, 결과를 benchmarks/results.json에 저장
+    python -m benchmarks.bench --quick                  # 작은 크기만 (배포 전 빠른 확인용)
+    python -m benchmarks.bench -k candlestick           # 이름에 candlestick이 들어간 케이스만
+    python -m benchmarks.bench --save-baseline          # 결과를 기준값(benchmarks/baseline.json)으로 저장
+    python -m benchmarks.bench --baseline benchmarks/baseline.json   # 기준값과 비교, 느려지면 exit 1
+
+케이스마다 실행 시간(중앙값/최소값)과 tracemalloc으로 잰 최대 메모리(peak)를 기록합니다.
+기준값은 실행한 머신에 따라 다르므로 같은 머신(CI 러너)에서 만든 것끼리 비교하세요.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS = os.path.join(BENCH_DIR, 'results.json')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# 기준값 대비 중앙값이 이 비율 이상 느려지면 회귀로 봅니다.
+DEFAULT_THRESHOLD = 0.25
+# 이보다 짧은 케이스는 측정 잡음이 커서 회귀 판정에서 제외합니다.
+NOISE_FLOOR_S = 0.002
+
+
+def _cases(quick=False):
+    """
+    (이름, 크기 라벨, setup) 목록. setup()은 입력을 만들고 측정할 호출(인자 없는 함수)을 돌려줍니다.
+    """
+    # 무거운 import(streamlit 등)는 벤치마크 대상이 아니므로 여기서 불러옵니다.
+    import compare
+    import correlation
+    import insider_analytics
+    import performance
+    import ratios
+    import risk
+    import screener
+    import utils
+    import statements
+
+    daily_years = (1, 5) if quick else (1, 5, 10, 30)
+    intraday = [] if quick else [('5m', 1)]
+    statement_periods = (4, 20) if quick else (4, 20, 40, 120)
+    scenario_counts = (5, 100) if quick else (5, 100, 1000)
+    insider_rows = (100, 1000) if quick else (100, 1000, 10000)
+    universe_sizes = (50,) if quick else (50, 500)
+    screener_sizes = (500,) if quick else (500, 5000)
+    compare_sizes = (10,) if quick else (10, 50)
+    correlation_sizes = (100,) if quick else (100, 500)
+    risk_sizes = (500,) if quick else (500, 5000)
+
+    cases = []
+
+    def ohlcv_sizes():
+        for years in daily_years:
+            yield f'daily_{years}y', (lambda y=years: synthetic.make_ohlcv(years=y, seed=y))
+        for interval, years in intraday:
+            yield f'{interval}_{years}y', (lambda i=interval, y=years: synthetic.make_ohlcv(years=y, interval=i, seed=y))
+
+    for label, make in ohlcv_sizes():
+        cases.append(('calculate_technical_indicators', label,
+                      lambda make=make: (lambda df=make(): utils.calculate_technical_indicators(df))))
+        cases.append(('detect_candlestick_patterns', label,
+                      lambda make=make: (lambda df=make(): utils.detect_candlestick_patterns(df))))
+
+    for years in daily_years:
+        def per_setup(years=years):
+            history = synthetic.make_ohlcv(years=years, seed=years)
+            quarterly = synthetic.make_statement(synthetic.INCOME_ITEMS, years * 4 + 3, quarterly=True, seed=years)
+            splits = synthetic.make_splits(count=3, years=years, seed=years)
+            eps, _ = utils.select_eps_series(None, quarterly)
+            return lambda: utils.build_per_bands(history, utils.split_adjust_eps(eps, splits))
+        cases.append(('per_band_split_adjust_merge_asof', f'daily_{years}y', per_setup))
+
+    for periods in statement_periods:
+        def growth_setup(periods=periods):
+            df = synthetic.make_statement(synthetic.INCOME_ITEMS + synthetic.BALANCE_ITEMS, periods, quarterly=True, seed=periods)
+            return lambda: statements.create_growth_dataframe(df)
+        cases.append(('create_growth_dataframe', f'{periods}_periods', growth_setup))
+
+        def view_setup(periods=periods):
+            df = synthetic.make_statement(synthetic.INCOME_ITEMS + synthetic.BALANCE_ITEMS, periods, quarterly=True, seed=periods)
+            return lambda: statements.build_statement_view(df, quarterly=True)
+        cases.append(('build_statement_view', f'{periods}_periods', view_setup))
+
+    for count in scenario_counts:
+        def dcf_setup(count=count):
+            cashflow = synthetic.make_statement(synthetic.CASHFLOW_ITEMS, 4, seed=1)
+            balance = synthetic.make_statement(synthetic.BALANCE_ITEMS, 4, seed=2)
+            scenarios = synthetic.make_dcf_scenarios(count)
+            return lambda: utils.calculate_dcf_scenarios(cashflow, balance, 1.5e10, 180.0, scenarios=scenarios)
+        cases.append(('calculate_dcf_scenarios', f'{count}_scenarios', dcf_setup))
+
+    for count in universe_sizes:
+        def ratios_setup(count=count):
+            long_df = synthetic.make_fundamentals(count, seed=count)
+            return lambda: ratios.compute_ratios(long_df, 'quarterly')
+        cases.append(('compute_ratios_universe', f'{count}_symbols', ratios_setup))
+
+    for count in compare_sizes:
+        def compare_setup(count=count):
+            histories = {f'SYM{i:02d}': synthetic.make_ohlcv(years=5, seed=i) for i in range(count)}
+            return lambda: compare.build_comparison(compare.align_closes(histories), period='5Y')
+        cases.append(('compare_align_and_build', f'{count}_symbols_5y', compare_setup))
+
+    for count in correlation_sizes:
+        def correlation_setup(count=count):
+            close = synthetic.make_price_matrix(count, seed=count)
+            return lambda: correlation.cluster_labels(correlation.correlation_matrix(close))
+        cases.append(('correlation_clusters', f'{count}_symbols', correlation_setup))
+
+    for count in risk_sizes:
+        def risk_setup(count=count):
+            close = synthetic.make_price_matrix(count, seed=count)
+            close[risk.BENCHMARK] = close.mean(axis=1)
+            return lambda: risk.compute_risk(close)
+        cases.append(('compute_risk_universe', f'{count}_symbols', risk_setup))
+
+        def horizon_setup(count=count):
+            close = synthetic.make_price_matrix(count, seed=count)
+            return lambda: performance.horizon_returns(close, close * 0 + 1e6)
+        cases.append(('horizon_returns_universe', f'{count}_symbols', horizon_setup))
+
+    for count in screener_sizes:
+        def screen_setup(count=count):
+            snapshot = screener.Snapshot(screener.to_snapshot_rows(synthetic.make_screener_infos(count, seed=count)))
+            return lambda: screener.screen("pe < 25 and roe > 15%, market_cap > 2B, sector != 'Utilities'",
+                                           'market_cap', snapshot=snapshot)
+        cases.append(('screen_multi_criteria', f'{count}_symbols', screen_setup))
+
+    for rows in insider_rows:
+        def windows_setup(rows=rows):
+            df = synthetic.make_insider(rows=rows, seed=rows)
+            return lambda: insider_analytics.activity_windows(
+                insider_analytics.prepare_insider_transactions(df), now='2026-10-01')
+        cases.append(('insider_prepare_activity_windows', f'{rows}_rows', windows_setup))
+
+    return cases
+
+
+def measure(call, repeat=5, min_time=0.2):
+    """
+    call을 한 번 워밍업한 뒤 repeat회(단, 합계가 min_time초가 될 때까지는 더) 실행해 시간을 재고,
+    별도 1회 실행에서 tracemalloc peak를 잽니다.
+    """
+    call()
+    times = []
+    start = time.perf_counter()
+    while len(times) < repeat or (time.perf_counter() - start < min_time and len(times) < 1000):
+        t0 = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'median_s': statistics.median(times),
+        'min_s': min(times),
+        'runs': len(times),
+        'peak_kb': peak / 1024,
+    }
+
+
+def run(pattern=None, quick=False, repeat=5):
+    results = []
+    for name, size, setup in _cases(quick):
+        if pattern and pattern not in name:
+            continue
+        stats = measure(setup(), repeat=repeat)
+        results.append({'name': name, 'size': size, **stats})
+        print(f"{name:<36} {size:<14} {stats['median_s'] * 1000:>10.2f}ms {stats['peak_kb']:>12.0f}KB", flush=True)
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    baseline과 같은 (name, size) 케이스의 중앙값을 비교합니다.
+    반환: 회귀 목록 [{'name', 'size', 'baseline_s', 'current_s', 'ratio'}]
+    """
+    base = {(r['name'], r['size']): r for r in baseline['results']}
+    regressions = []
+    print(f"\n{'case':<52} {'baseline':>10} {'current':>10} {'change':>8}")
+    for r in current['results']:
+        b = base.get((r['name'], r['size']))
+        if b is None:
+            continue
+        ratio = r['median_s'] / b['median_s'] if b['median_s'] else float('inf')
+        flag = ''
+        if ratio > 1 + threshold and r['median_s'] - b['median_s'] > NOISE_FLOOR_S:
+            flag = '  REGRESSION'
+            regressions.append({'name': r['name'], 'size': r['size'], 'baseline_s': b['median_s'],
+                                'current_s': r['median_s'], 'ratio': ratio})
+        print(f"{r['name'] + ' ' + r['size']:<52} {b['median_s'] * 1000:>8.2f}ms {r['median_s'] * 1000:>8.2f}ms "
+              f"{(ratio - 1) * 100:>+7.1f}%{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='utils/데이터 가공 핫패스 벤치마크')
+    parser.add_argument('-k', dest='pattern', help='이름에 이 문자열이 들어간 케이스만 실행')
+    parser.add_argument('--quick', action='store_true', help='작은 입력 크기만 실행')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=DEFAULT_RESULTS, help='결과 JSON 경로')
+    parser.add_argument('--baseline', help='비교할 기준값 JSON 경로')
+    parser.add_argument('--save-baseline', action='store_true', help=f'결과를 {DEFAULT_BASELINE}에 저장')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='회귀로 볼 느려짐 비율 (기본 0.25)')
+    args = parser.parse_args(argv)
+
+    current = run(args.pattern, args.quick, args.repeat)
+
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, 'w') as f:
+            json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+동시 세션 부하 테스트.
+
+실제 app.py를 Streamlit AppTest로 N개 세션에서 동시에 실행합니다. 데이터는 replay.py의 재생 모드로
+녹화된 픽스처만 사용하므로 네트워크 없이 재현 가능합니다 (먼저 `python replay.py record AAPL MSFT ...`).
+
+    python -m benchmarks.load_test --sessions 8 --iterations 5 --symbols AAPL MSFT
+    python -m benchmarks.load_test --sessions 16 --latency-ms 150 --error-rate 0.02 --scenario search
+
+시나리오
+- landing   : 첫 화면(지수/공포탐욕/맵) 로드
+- map_click : 첫 화면 → 맵에서 종목 클릭 (클릭 핸들러와 같이 session_state.ticker_symbol 설정 후 rerun)
+- search    : 첫 화면 → 검색창에 티커 입력 → 데이터 간격(Weekly/Monthly), 보고서 기준(Quarterly) 토글
+- mixed     : 위 세 가지를 세션마다 번갈아 실행
+
+rerun 지연 p50/p95/p99, 프로세스 CPU·RSS(세션당 환산), shared_cache hit 비율을 출력합니다.
+모든 세션이 한 프로세스에서 돌기 때문에 CPU/RSS는 프로세스 전체 값을 세션 수로 나눈 근사치입니다.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+import replay
+from cache import cache_stats
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+SCENARIO_NAMES = ('landing', 'map_click', 'search')
+
+
+def _rss_mb():
+    # Linux: /proc/self/status의 VmRSS (현재값). 그 외 OS에서는 최대 RSS로 대체
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return _peak_rss_mb()
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 bytes, Linux는 KB
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+class Recorder:
+    """스레드 안전한 rerun 지연 기록기."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)  # step -> [seconds]
+        self.errors = defaultdict(int)    # step -> 화면에 예외가 난 rerun 수
+
+    def run(self, step, at):
+        t0 = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - t0
+        failed = len(at.exception) > 0
+        with self._lock:
+            self.samples[step].append(elapsed)
+            if failed:
+                self.errors[step] += 1
+        return at
+
+
+def _new_app(timeout):
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+
+def scenario_landing(rec, symbol, timeout):
+    rec.run('landing', _new_app(timeout))
+
+
+def scenario_map_click(rec, symbol, timeout):
+    at = rec.run('landing', _new_app(timeout))
+    # AppTest는 Plotly 선택 이벤트를 만들 수 없으므로 클릭 핸들러가 하는 일을 그대로 재현합니다.
+    at.session_state.ticker_symbol = symbol
+    rec.run('analysis', at)
+
+
+def scenario_search(rec, symbol, timeout):
+    at = rec.run('landing', _new_app(timeout))
+    at.text_input[0].input(symbol)
+    rec.run('analysis', at)
+
+    for label_prefix, value, step in (("데이터", "Weekly", 'toggle_weekly'),
+                                      ("데이터", "Monthly", 'toggle_monthly'),
+                                      ("보고서", "분기별 (Quarterly)", 'toggle_quarterly')):
+        radio = next((r for r in at.radio if r.label.startswith(label_prefix)), None)
+        if radio is None:
+            continue
+        radio.set_value(value)
+        rec.run(step, at)
+
+
+SCENARIOS = {
+    'landing': scenario_landing,
+    'map_click': scenario_map_click,
+    'search': scenario_search,
+}
+
+
+def _session(session_id, rec, scenario, symbols, iterations, timeout, seed):
+    rng = random.Random(seed + session_id)
+    for i in range(iterations):
+        name = SCENARIO_NAMES[(session_id + i) % len(SCENARIO_NAMES)] if scenario == 'mixed' else scenario
+        SCENARIOS[name](rec, rng.choice(symbols), timeout)
+
+
+def _percentiles(samples):
+    arr = np.asarray(samples) * 1000
+    return {
+        'count': len(arr),
+        'p50_ms': float(np.percentile(arr, 50)),
+        'p95_ms': float(np.percentile(arr, 95)),
+        'p99_ms': float(np.percentile(arr, 99)),
+        'max_ms': float(arr.max()),
+    }
+
+
+def run(sessions=4, iterations=3, scenario='mixed', symbols=('AAPL',), timeout=120, seed=0):
+    rec = Recorder()
+    rss_start = _rss_mb()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+
+    threads = [threading.Thread(target=_session, name=f'session-{i}',
+                                args=(i, rec, scenario, list(symbols), iterations, timeout, seed))
+               for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    rss_end = _rss_mb()
+
+    all_samples = [s for samples in rec.samples.values() for s in samples]
+    stores = cache_stats()
+    hits = sum(s['hits'] for s in stores.values())
+    misses = sum(s['misses'] for s in stores.values())
+
+    return {
+        'config': {'sessions': sessions, 'iterations': iterations, 'scenario': scenario,
+                   'symbols': list(symbols), 'replay': replay.settings()},
+        'wall_s': wall,
+        'reruns': len(all_samples),
+        'reruns_per_s': len(all_samples) / wall if wall else 0.0,
+        'latency': {'all': _percentiles(all_samples) if all_samples else {},
+                    **{step: _percentiles(samples) for step, samples in rec.samples.items()}},
+        'errors': dict(rec.errors),
+        'cpu': {'process_s': cpu,
+                'per_session_s': cpu / sessions,
+                'per_rerun_ms': cpu / len(all_samples) * 1000 if all_samples else 0.0},
+        'rss_mb': {'start': rss_start, 'end': rss_end, 'peak': _peak_rss_mb(),
+                   'per_session': (rss_end - rss_start) / sessions},
+        'cache': {'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                  'stores': {name: {'hit_rate': s['hit_rate'], 'hits': s['hits'], 'misses': s['misses'],
+                                    'bytes': s['bytes'], 'evictions': s['evictions']}
+                             for name, s in stores.items()}},
+    }
+
+
+def print_report(report):
+    c = report['config']
+    print(f"\n{c['sessions']} sessions x {c['iterations']} iterations ({c['scenario']}), "
+          f"{report['reruns']} reruns in {report['wall_s']:.1f}s ({report['reruns_per_s']:.2f}/s)")
+
+    print(f"\n{'step':<18} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'errors':>7}")
+    for step, p in report['latency'].items():
+        if p:
+            print(f"{step:<18} {p['count']:>6} {p['p50_ms']:>7.0f}ms {p['p95_ms']:>7.0f}ms "
+                  f"{p['p99_ms']:>7.0f}ms {p['max_ms']:>7.0f}ms {report['errors'].get(step, 0):>7}")
+
+    cpu, rss = report['cpu'], report['rss_mb']
+    print(f"\nCPU  {cpu['process_s']:.1f}s total, {cpu['per_session_s']:.2f}s/session, {cpu['per_rerun_ms']:.0f}ms/rerun")
+    print(f"RSS  {rss['start']:.0f}MB -> {rss['end']:.0f}MB (peak {rss['peak']:.0f}MB), "
+          f"{rss['per_session']:+.1f}MB/session")
+
+    print(f"\nshared_cache hit rate {report['cache']['hit_rate']:.1%}")
+    for name, s in sorted(report['cache']['stores'].items()):
+        if s['hits'] or s['misses']:
+            print(f"  {name:<28} {s['hit_rate']:>6.1%}  ({s['hits']} hits / {s['misses']} misses, "
+                  f"{s['bytes'] / 1024 / 1024:.1f}MB, {s['evictions']} evictions)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='app.py 동시 세션 부하 테스트 (replay 데이터 사용)')
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--iterations', type=int, default=3, help='세션당 시나리오 반복 횟수')
+    parser.add_argument('--scenario', choices=SCENARIO_NAMES + ('mixed',), default='mixed')
+    parser.add_argument('--symbols', nargs='+', default=['AAPL'], help='녹화해 둔 티커들')
+    parser.add_argument('--fixtures', help='픽스처 디렉터리 (기본: BENJAMIN_REPLAY_DIR 또는 fixtures/)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='재생 호출마다 주입할 지연')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='재생 호출 실패 확률')
+    parser.add_argument('--timeout', type=float, default=120, help='rerun 하나의 제한 시간 (초)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='결과 JSON 경로')
+    args = parser.parse_args(argv)
+
+    replay.configure(mode='replay', fixture_dir=args.fixtures, latency_ms=args.latency_ms,
+                     error_rate=args.error_rate, seed=args.seed)
+
+    report = run(args.sessions, args.iterations, args.scenario,
+                 [s.upper() for s in args.symbols], args.timeout, args.seed)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
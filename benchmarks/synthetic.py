@@ -0,0 +1,172 @@
+"""
+벤치마크용 합성 데이터 생성기.
+
+yfinance가 돌려주는 것과 같은 모양(컬럼명, 인덱스 타입, tz)의 데이터를 seed로 재현 가능하게 만듭니다.
+"""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252
+# 정규장 09:30~16:00
+INTRADAY_BARS_PER_DAY = {'1m': 390, '5m': 78, '15m': 26, '1h': 7}
+
+INCOME_ITEMS = ['Total Revenue', 'Cost Of Revenue', 'Gross Profit', 'Operating Income', 'Pretax Income',
+                'Tax Provision', 'Net Income', 'Diluted EPS', 'Basic EPS', 'EBITDA']
+BALANCE_ITEMS = ['Total Assets', 'Current Assets', 'Current Liabilities', 'Total Liabilities Net Minority Interest',
+                 'Stockholders Equity', 'Total Debt', 'Cash And Cash Equivalents']
+CASHFLOW_ITEMS = ['Operating Cash Flow', 'Investing Cash Flow', 'Financing Cash Flow',
+                  'Capital Expenditure', 'Free Cash Flow']
+
+
+def make_ohlcv(years=1, interval='1d', seed=0, end='2026-10-16'):
+    """
+    기하 랜덤워크로 OHLCV + Dividends/Stock Splits 컬럼을 만듭니다 (yf.Ticker.history와 같은 모양).
+    interval: '1d' 또는 '1m'/'5m'/'15m'/'1h' (장중 봉)
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(end=end, periods=int(years * TRADING_DAYS_PER_YEAR))
+
+    if interval == '1d':
+        index = days.tz_localize('America/New_York')
+    else:
+        bars = INTRADAY_BARS_PER_DAY[interval]
+        step = np.timedelta64(390 // bars, 'm')
+        offsets = np.timedelta64(570, 'm') + step * np.arange(bars)  # 09:30부터
+        stamps = (days.values[:, None] + offsets[None, :]).ravel()
+        index = pd.DatetimeIndex(stamps).tz_localize('America/New_York')
+
+    n = len(index)
+    vol = 0.02 if interval == '1d' else 0.02 / np.sqrt(INTRADAY_BARS_PER_DAY[interval])
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, vol, n)))
+    open_ = close * np.exp(rng.normal(0, vol / 2, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, vol / 2, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol / 2, n)))
+    return pd.DataFrame({
+        'Open': open_, 'High': high, 'Low': low, 'Close': close,
+        'Volume': rng.integers(1_000_000, 50_000_000, n).astype(float),
+        'Dividends': 0.0, 'Stock Splits': 0.0,
+    }, index=index)
+
+
+def make_statement(items, periods, quarterly=False, seed=0, end='2026-06-30'):
+    """
+    재무제표 모양(행=항목, 열=결산일, 최신이 왼쪽)의 DataFrame을 만듭니다.
+    """
+    rng = np.random.default_rng(seed)
+    freq = 'QE' if quarterly else 'YE'
+    dates = pd.date_range(end=end, periods=periods, freq=freq)[::-1]
+    base = rng.uniform(1e9, 5e10, (len(items), 1))
+    growth = np.cumprod(1 + rng.normal(0.02, 0.05, (len(items), periods)), axis=1)[:, ::-1]
+    values = base / growth
+    df = pd.DataFrame(values, index=items, columns=dates)
+    for eps_row in ('Diluted EPS', 'Basic EPS'):
+        if eps_row in df.index:
+            df.loc[eps_row] = rng.uniform(0.5, 3.0, periods)
+    if 'Capital Expenditure' in df.index:
+        df.loc['Capital Expenditure'] *= -0.2
+    return df
+
+
+def make_splits(count=2, years=30, seed=0, end='2026-10-16'):
+    """분할 이력 Series (Date -> 비율, tz-aware)."""
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(end=end, periods=int(years * TRADING_DAYS_PER_YEAR), tz='America/New_York')
+    dates = sorted(rng.choice(days, size=count, replace=False))
+    return pd.Series(rng.choice([2.0, 3.0, 4.0], size=count), index=pd.DatetimeIndex(dates), name='Stock Splits')
+
+
+def make_insider(rows=100, years=2, seed=0, end='2026-10-01'):
+    """yf.Ticker.insider_transactions 모양의 내부자 거래 테이블."""
+    rng = np.random.default_rng(seed)
+    texts = np.array(['Sale at price 182.50 per share.', 'Purchase at price 150.00 per share.',
+                      'Stock Award(Grant) at price 0.00 per share.', 'Stock Gift', 'Conversion of Exercise of derivative security'])
+    end_ts = pd.Timestamp(end)
+    start_dates = end_ts - pd.to_timedelta(rng.integers(0, int(years * 365), rows), unit='D')
+    shares = rng.integers(100, 200_000, rows).astype(float)
+    return pd.DataFrame({
+        'Shares': shares,
+        'Value': shares * rng.uniform(50, 300, rows),
+        'URL': '',
+        'Text': rng.choice(texts, rows, p=[0.55, 0.1, 0.2, 0.1, 0.05]),
+        'Insider': rng.choice(['COOK TIMOTHY D', 'MAESTRI LUCA', 'WILLIAMS JEFFREY E', 'ADAMS KATHERINE L', 'O BRIEN DEIRDRE'], rows),
+        'Position': rng.choice(['Chief Executive Officer', 'Chief Financial Officer', 'Director', 'General Counsel'], rows),
+        'Transaction': '',
+        'Start Date': start_dates.sort_values(ascending=False),
+        'Ownership': rng.choice(['D', 'I'], rows, p=[0.9, 0.1]),
+    })
+
+
+def make_dcf_scenarios(count, seed=0):
+    """DCF 시나리오 그리드 (utils.DCF_SCENARIOS와 같은 모양)."""
+    rng = np.random.default_rng(seed)
+    return {
+        f'scenario_{i}': {
+            'wacc': float(rng.uniform(0.06, 0.12)),
+            'growth': float(rng.uniform(0.0, 0.25)),
+            'terminal': float(rng.uniform(0.01, 0.035)),
+            'color': '#f0f2f6',
+        }
+        for i in range(count)
+    }
+
+
+def make_fundamentals(symbols, periods=8, quarterly=True, seed=0):
+    """
+    warehouse.py long format (symbol, statement, frequency, line_item, period_end, value)의 여러 종목 데이터.
+    """
+    import warehouse
+    frequency = 'quarterly' if quarterly else 'annual'
+    frames = []
+    for i in range(symbols):
+        statements = {
+            (statement, frequency): make_statement(items, periods, quarterly=quarterly, seed=seed + i * 3 + k)
+            for k, (statement, items) in enumerate((('income', INCOME_ITEMS), ('balance', BALANCE_ITEMS),
+                                                    ('cashflow', CASHFLOW_ITEMS)))
+        }
+        frames.append(warehouse.to_long(f'SYM{i:04d}', statements))
+    return pd.concat(frames, ignore_index=True)
+
+
+# ticker.info['sector']는 Yahoo 분류 이름입니다 (스냅샷에서 GICS 이름으로 바뀜, screener.gics_sector).
+SECTORS = ('Technology', 'Healthcare', 'Financial Services', 'Consumer Cyclical', 'Industrials',
+           'Energy', 'Utilities', 'Basic Materials', 'Real Estate', 'Communication Services', 'Consumer Defensive')
+
+
+def make_screener_infos(symbols, seed=0):
+    """screener.py 스냅샷용 {symbol: ticker.info} (일부 값은 None)."""
+    rng = np.random.default_rng(seed)
+
+    def value(x, missing=0.05):
+        return None if rng.random() < missing else float(x)
+
+    return {
+        f'SYM{i:05d}': {
+            'shortName': f'Company {i}', 'sector': SECTORS[i % len(SECTORS)], 'industry': f'Industry {i % 60}',
+            'marketCap': value(rng.lognormal(22.5, 1.8), 0), 'currentPrice': value(rng.lognormal(3.8, 0.9), 0),
+            'trailingPE': value(rng.lognormal(3.0, 0.6), 0.15), 'forwardPE': value(rng.lognormal(2.9, 0.5), 0.1),
+            'trailingPegRatio': value(rng.lognormal(0.5, 0.6), 0.3), 'priceToSalesTrailing12Months': value(rng.lognormal(1, 1)),
+            'priceToBook': value(rng.lognormal(1.2, 0.9)), 'returnOnEquity': value(rng.normal(0.14, 0.15)),
+            'returnOnAssets': value(rng.normal(0.06, 0.06)), 'grossMargins': value(rng.uniform(0.1, 0.8)),
+            'operatingMargins': value(rng.normal(0.15, 0.12)), 'profitMargins': value(rng.normal(0.1, 0.1)),
+            'dividendYield': value(abs(rng.normal(1.5, 1.5)), 0.3), 'payoutRatio': value(rng.uniform(0, 1), 0.3),
+            'debtToEquity': value(rng.lognormal(4, 1)), 'currentRatio': value(rng.lognormal(0.3, 0.4)),
+            'heldPercentInsiders': value(rng.beta(1, 20)), 'heldPercentInstitutions': value(rng.uniform(0.3, 1)),
+            'beta': value(rng.normal(1, 0.35)), 'recommendationMean': value(rng.uniform(1, 4), 0.2),
+        }
+        for i in range(symbols)
+    }
+
+
+def make_price_matrix(symbols, days=504, factors=10, seed=0, end='2026-10-16'):
+    """
+    price_store 종가 행렬 모양 (날짜 × 종목 float32). 종목마다 공통 요인 하나에 묶여 있어
+    상관관계 클러스터가 생기고, 일부 종목은 중간에 상장한 것처럼 앞부분이 NaN입니다.
+    """
+    rng = np.random.default_rng(seed)
+    member = rng.integers(0, factors, symbols)
+    returns = rng.normal(0.0003, 0.01, (days, factors))[:, member] + rng.normal(0, 0.012, (days, symbols))
+    close = 100 * np.exp(np.cumsum(returns, axis=0))
+    listed = rng.random(symbols) < 0.03
+    close[:days // 2, listed] = np.nan
+    index = pd.bdate_range(end=end, periods=days)
+    return pd.DataFrame(close, index=index, columns=[f'SYM{i:04d}' for i in range(symbols)]).astype('float32')
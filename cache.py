@@ -0,0 +1,197 @@
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from tracing import trace
+
+# pandas 3.0부터는 Copy-on-Write가 항상 켜져 있고, 그 이전 버전에서는 옵션으로 켜야 합니다.
+# 공유 캐시가 돌려주는 얕은 복사본(view)이 원본을 오염시키지 않으려면 CoW가 필요합니다.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
+def _view(obj):
+    """
+    캐시된 객체의 '뷰'를 만듭니다.
+    DataFrame/Series는 데이터 버퍼를 공유하는 얕은 복사본을 돌려주므로 복사 비용이 없고,
+    호출자가 컬럼을 추가하거나 값을 바꾸면 CoW에 의해 그 부분만 복사됩니다.
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return obj.copy(deep=False)
+    if isinstance(obj, tuple):
+        return tuple(_view(o) for o in obj)
+    if isinstance(obj, list):
+        return [_view(o) for o in obj]
+    if isinstance(obj, dict):
+        return {k: _view(v) for k, v in obj.items()}
+    return obj
+
+
+def deep_sizeof(obj):
+    """
+    캐시 항목의 실제 메모리 크기(bytes)를 추정합니다.
+    DataFrame은 object 컬럼의 문자열까지 포함하도록 memory_usage(deep=True)를 사용합니다.
+    """
+    if obj is None:
+        return 0
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_sizeof(k) + deep_sizeof(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(deep_sizeof(o) for o in obj)
+    return sys.getsizeof(obj)
+
+
+def _make_key(args, kwargs):
+    # list 인자(예: load_market_data의 티커 리스트)도 키로 쓸 수 있도록 tuple로 변환
+    def freeze(v):
+        if isinstance(v, (list, tuple)):
+            return tuple(freeze(x) for x in v)
+        if isinstance(v, dict):
+            return tuple(sorted((k, freeze(x)) for k, x in v.items()))
+        return v
+    return freeze(args), freeze(kwargs)
+
+
+class BoundedStore:
+    """
+    바이트 예산이 있는 LRU/LFU 캐시 저장소.
+
+    항목마다 deep_sizeof로 잰 크기를 기록하고, 보유 바이트가 max_bytes를 넘으면
+    policy에 따라 항목을 내보냅니다.
+    - 'lru': 가장 오래 사용되지 않은 항목부터
+    - 'lfu': hit 수가 가장 적은 항목부터 (동률이면 오래된 것부터) → 자주 보는 티커가 남습니다.
+    """
+
+    def __init__(self, name, max_bytes=None, ttl=None, policy='lru'):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.policy = policy
+        self._entries = OrderedDict()  # key -> [value, nbytes, created_at, hits]
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """(hit 여부, 값)을 반환합니다."""
+        hit, value, _ = self.lookup(key)
+        return hit, value
+
+    def lookup(self, key):
+        """(hit 여부, 값, 항목 크기)를 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.time() - entry[2] > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None, 0
+            entry[3] += 1
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0], entry[1]
+
+    def put(self, key, value):
+        """값을 저장하고 그 크기(bytes)를 반환합니다."""
+        nbytes = deep_sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            # 예산보다 큰 단일 항목은 캐시하지 않음 (다른 항목을 모두 밀어내는 것을 방지)
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                return nbytes
+            self._entries[key] = [value, nbytes, time.time(), 0]
+            self.bytes += nbytes
+            while self.max_bytes is not None and self.bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(self._victim(exclude=key))
+                self.evictions += 1
+        return nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def _victim(self, exclude):
+        if self.policy == 'lfu':
+            # OrderedDict는 오래된 순서이므로 min()은 동률일 때 가장 오래된 항목을 고릅니다
+            candidates = ((k, e[3]) for k, e in self._entries.items() if k != exclude)
+            return min(candidates, key=lambda kv: kv[1])[0]
+        return next(k for k in self._entries if k != exclude)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry[1]
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / total) if total else 0.0,
+                'evictions': self.evictions,
+            }
+
+
+_stores = {}
+
+
+def cache_stats():
+    """
+    shared_cache로 감싼 로더별 캐시 통계를 반환합니다.
+    Key: '<모듈>.<로더 이름>', Value: entries/bytes/hits/misses/hit_rate/evictions
+    """
+    return {name: store.stats() for name, store in _stores.items()}
+
+
+def shared_cache(func=None, *, ttl=None, max_bytes=None, policy='lru', cache_if=None):
+    """
+    읽기 전용 DataFrame을 위한 프로세스 공유 캐시 데코레이터.
+
+    st.cache_data는 hit마다 반환값을 pickle/unpickle 하므로 큰 DataFrame 튜플을 매 rerun마다
+    역직렬화합니다. 이 데코레이터는 BoundedStore에 원본 객체 하나만 보관하고,
+    호출자에게는 _view()로 만든 얕은 복사본을 돌려줍니다.
+    max_bytes를 주면 그 예산 안에서 policy('lru'/'lfu')에 따라 오래된 항목을 내보냅니다.
+    cache_if(결과)가 False이면 그 결과는 저장하지 않습니다 (예: 실패 튜플을 영구 캐시하지 않기).
+    호출마다 '<모듈>.<함수>' 이름으로 trace 구간을 남기며 hit/miss와 항목 크기를 함께 기록합니다.
+    """
+    def decorator(f):
+        # 모듈마다 같은 이름(_load 등)이 있을 수 있으므로 '<모듈>.<함수>'로 등록합니다 (trace 구간 이름과 같음).
+        span_name = f'{f.__module__}.{f.__qualname__}'
+        store = BoundedStore(span_name, max_bytes=max_bytes, ttl=ttl, policy=policy)
+        _stores[span_name] = store
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            with trace(span_name) as span:
+                hit, value, span.nbytes = store.lookup(key)
+                span.hit = hit
+                if not hit:
+                    value = f(*args, **kwargs)
+                    if cache_if is None or cache_if(value):
+                        span.nbytes = store.put(key, value)
+                return _view(value)
+
+        wrapper.clear = store.clear
+        wrapper.store = store
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
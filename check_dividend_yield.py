@@ -0,0 +1,25 @@
+import math
+
+import screener
+
+# yfinance 1.x의 dividendYield는 % 값 (0.52 = 0.52%).
+# 스크리너 스냅샷과 한 종목 조회(info_values) 모두 비율(0.0052)로 저장해야 dividend_yield >= 2% 같은 조건이 맞게 동작함.
+
+infos = {
+    'LOW': {'dividendYield': 0.52},
+    'HIGH': {'dividendYield': 3.1},
+    'NONE': {},
+}
+
+rows = screener.to_snapshot_rows(infos)
+values = {symbol: screener.info_values(info)['dividend_yield'] for symbol, info in infos.items()}
+print(rows['dividend_yield'])
+print(values)
+
+assert math.isclose(rows.loc['LOW', 'dividend_yield'], 0.0052, rel_tol=1e-6)
+assert math.isclose(values['LOW'], 0.0052, rel_tol=1e-9)
+assert math.isclose(rows.loc['HIGH', 'dividend_yield'], 0.031, rel_tol=1e-6)
+assert math.isclose(values['HIGH'], 0.031, rel_tol=1e-9)
+assert math.isnan(rows.loc['NONE', 'dividend_yield']) and math.isnan(values['NONE'])
+assert list(screener.screen("dividend_yield >= 2%", snapshot=screener.Snapshot(rows)).index) == ['HIGH']
+print("OK")
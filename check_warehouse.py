@@ -0,0 +1,33 @@
+import os
+import tempfile
+
+import pandas as pd
+
+os.environ['BENJAMIN_DATA_DIR'] = tempfile.mkdtemp()  # store.DATA_DIR는 import할 때 읽음
+
+import data
+import warehouse
+
+# 재무제표가 빈 종목(상장폐지/ETF/일시적 실패)이 채워진 종목 옆에 있어도 저장소 전체를 읽을 수 있어야 함.
+
+good = pd.DataFrame({'2023-12-31': [100.0, 20.0], '2024-12-31': [120.0, 30.0]},
+                    index=['Total Revenue', 'Operating Income'])
+empty = warehouse.to_long('AAA', {('income', 'annual'): pd.DataFrame()})
+
+# 예전 코드가 남긴 빈 파일 (null 타입 컬럼)이 정렬상 먼저 와도 읽혀야 함
+empty.to_parquet(warehouse._symbol_path('AAA'), index=False)
+warehouse.write_symbol('ZZZ', warehouse.to_long('ZZZ', {('income', 'annual'): good}))
+df = warehouse.load_fundamentals()
+print(df)
+assert set(df['symbol'].astype(str)) == {'ZZZ'} and len(df) == 4
+assert warehouse.margin_series('Operating Income').loc['2024-12-31', 'ZZZ'] == 0.25
+
+# 빈 결과는 실패로 세고, 이전에 받은 파일을 덮어쓰거나 새로 받은 것으로 표시하지 않음
+before = warehouse.stored_symbols()['ZZZ']
+data.fetch_financial_statements = lambda symbol: {('income', 'annual'): good if symbol == 'BBB' else pd.DataFrame()}
+stats = warehouse.refresh_symbols(['ZZZ', 'BBB'], max_workers=2, min_age_days=0)
+print(stats)
+assert stats['fetched'] == 1 and stats['failed'] == 1 and 'ZZZ' in stats['errors']
+assert warehouse.stored_symbols()['ZZZ'] == before
+assert set(warehouse.load_fundamentals()['symbol'].astype(str)) == {'ZZZ', 'BBB'}
+print("OK")
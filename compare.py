@@ -0,0 +1,207 @@
+"""
+여러 종목 비교 (N개 티커의 주가를 하나의 날짜 × 종목 행렬로 맞춰 계산).
+
+종목별 일봉은 load_price_history 캐시를 그대로 쓰고(없는 것만 동시에 받음), 종가를 outer join으로 합친 뒤
+앞 값으로 채웁니다(ffill). 거래소 휴일이 달라도 같은 날짜 축에서 비교할 수 있고, 이후 계산은 모두 행렬 연산입니다.
+
+- 누적 수익률 (구간 시작 = 0%)
+- 기준 종목 대비 상대 강도 (구간 시작 = 1.0)
+- 기준 종목과의 이동 상관계수
+- 요약: 수익률, 연환산 변동성, 최대 낙폭, 기준 대비 상관계수/베타
+"""
+import numpy as np
+import pandas as pd
+
+import store
+from cache import shared_cache
+from data import load_price_history
+from tracing import traced
+
+MAX_SYMBOLS = 50
+DEFAULT_MAX_WORKERS = 8
+TRADING_DAYS = 252
+
+# 구간 라벨 -> 시작일 (마지막 날짜 기준 DateOffset, None이면 연초)
+PERIODS = {
+    '1M': pd.DateOffset(months=1),
+    '3M': pd.DateOffset(months=3),
+    '6M': pd.DateOffset(months=6),
+    'YTD': None,
+    '1Y': pd.DateOffset(years=1),
+    '3Y': pd.DateOffset(years=3),
+    '5Y': pd.DateOffset(years=5),
+}
+
+
+def load_histories(symbols, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    종목별 일봉을 동시에 가져옵니다 (load_price_history 캐시 사용).
+    반환: ({symbol: history}, [실패한 symbol]) — 입력 순서 유지
+    """
+    histories, failed = {}, []
+    for symbol, history, error in store.fetch_all(load_price_history, symbols, max_workers):
+        if error is not None or history is None or history.empty:
+            failed.append(symbol)
+        else:
+            histories[symbol] = history
+    ordered = {symbol: histories[symbol] for symbol in symbols if symbol in histories}
+    return ordered, [symbol for symbol in symbols if symbol in failed]
+
+
+def align_closes(histories, column='Close'):
+    """
+    {symbol: OHLCV} -> 날짜 × 종목 종가 행렬 (outer join 후 ffill).
+    시간대가 다른 인덱스도 날짜 기준으로 맞춥니다. 상장 전 구간은 NaN으로 남습니다.
+    """
+    columns = {}
+    for symbol, history in histories.items():
+        index = history.index
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)
+        series = pd.Series(history[column].to_numpy(dtype='float64'), index=index.normalize())
+        columns[symbol] = series[~series.index.duplicated(keep='last')]
+    if not columns:
+        return pd.DataFrame(dtype='float64')
+
+    # 날짜 합집합 위에 한 번에 2차원 배열로 채움 (종목마다 블록이 생기는 concat보다 이후 연산이 빠름)
+    dates = columns[next(iter(columns))].index
+    for series in list(columns.values())[1:]:
+        dates = dates.union(series.index)
+    values = np.full((len(dates), len(columns)), np.nan)
+    for j, series in enumerate(columns.values()):
+        values[dates.get_indexer(series.index), j] = series.to_numpy()
+    return pd.DataFrame(values, index=dates, columns=list(columns)).ffill()
+
+
+# 일부 종목이 잠깐 실패한 결과는 캐시하지 않습니다 (종목별 이력은 load_price_history 캐시가 있으므로 다시 맞추는 비용만 듦).
+@shared_cache(ttl=3600, max_bytes=64 * 1024 * 1024, cache_if=lambda result: not result[1])
+def load_close_matrix(symbols):
+    """비교할 종목 튜플 -> (종가 행렬, 실패한 종목 목록). 모두 받았으면 같은 조합은 다시 맞추지 않습니다."""
+    histories, failed = load_histories(list(symbols))
+    return align_closes(histories), failed
+
+
+def slice_period(matrix, period):
+    """PERIODS 라벨 구간만 남깁니다 (마지막 날짜 기준)."""
+    if matrix.empty or period not in PERIODS:
+        return matrix
+    end = matrix.index[-1]
+    offset = PERIODS[period]
+    start = pd.Timestamp(year=end.year, month=1, day=1) if offset is None else end - offset
+    return matrix.loc[start:]
+
+
+def normalized_returns(matrix):
+    """구간 첫 가격 대비 누적 수익률(%). 구간 중간에 상장한 종목은 첫 거래일을 기준으로 합니다."""
+    base = matrix.bfill().iloc[0]
+    return (matrix / base - 1) * 100
+
+
+def daily_returns(matrix):
+    """일간 수익률 행렬 (첫 행 제외)."""
+    values = matrix.to_numpy()
+    returns = values[1:] / values[:-1] - 1
+    return pd.DataFrame(returns, index=matrix.index[1:], columns=matrix.columns)
+
+
+def relative_strength(matrix, benchmark):
+    """기준 종목 대비 상대 강도 (가격 비율, 구간 시작 = 1.0). 1보다 크면 기준보다 강함."""
+    ratio = matrix.div(matrix[benchmark], axis=0)
+    return ratio / ratio.bfill().iloc[0]
+
+
+def window_sums(values, window):
+    """열마다 길이 window 구간 합 (누적합 차이). 첫 window-1행은 NaN."""
+    cumsum = np.cumsum(values, axis=0)
+    sums = np.full(values.shape, np.nan)
+    sums[window - 1] = cumsum[window - 1]
+    sums[window:] = cumsum[window:] - cumsum[:-window]
+    return sums
+
+
+def rolling_correlation(returns, benchmark, window=60):
+    """
+    기준 종목 일간 수익률과의 이동 상관계수 (window 거래일). 기준 종목 컬럼은 제외합니다.
+    구간 합을 누적합으로 구해 모든 종목을 한 번에 계산하며, 구간 안에 결측이 있으면 NaN입니다.
+    """
+    others = returns.drop(columns=[benchmark])
+    if len(returns) < window:
+        return pd.DataFrame(np.nan, index=returns.index, columns=others.columns)
+    x = others.to_numpy(dtype='float64')
+    y = np.broadcast_to(returns[benchmark].to_numpy(dtype='float64')[:, None], x.shape)
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+
+    n = window_sums(valid.astype('float64'), window)
+    sx, sy = window_sums(x, window), window_sums(y, window)
+    sxy, sxx, syy = window_sums(x * y, window), window_sums(x * x, window), window_sums(y * y, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * sxy - sx * sy
+        correlation = cov / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+    correlation[n < window] = np.nan
+    return pd.DataFrame(np.clip(correlation, -1, 1), index=returns.index, columns=others.columns)
+
+
+def max_drawdown(matrix):
+    """종목별 최대 낙폭(%, 음수)."""
+    values = matrix.to_numpy()
+    peaks = np.fmax.accumulate(values, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdowns = values / peaks - 1
+    return pd.Series(np.nanmin(drawdowns, axis=0) * 100, index=matrix.columns)
+
+
+def beta_correlation(values, bench):
+    """
+    수익률 배열 (T × n)과 기준 수익률 (T,) -> (베타, 상관계수, 관측치 수) 배열.
+    기준 종목과 같이 거래된 날만으로 공분산/상관계수를 구합니다 (결측 쌍 제외).
+    """
+    valid = ~np.isnan(values) & ~np.isnan(bench)[:, None]
+    count = valid.sum(axis=0)
+    x = np.where(valid, values, 0.0)
+    y = np.where(valid, bench[:, None], 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = x.sum(axis=0) / count
+        mean_y = y.sum(axis=0) / count
+        cov = ((x - mean_x) * (y - mean_y) * valid).sum(axis=0) / (count - 1)
+        var_x = (((x - mean_x) ** 2) * valid).sum(axis=0) / (count - 1)
+        var_y = (((y - mean_y) ** 2) * valid).sum(axis=0) / (count - 1)
+        return cov / var_y, cov / np.sqrt(var_x * var_y), count
+
+
+def summarize(matrix, returns, normalized, benchmark):
+    """종목별 요약 표 (index=symbol)."""
+    beta, correlation, _ = beta_correlation(returns.to_numpy(), returns[benchmark].to_numpy())
+
+    return pd.DataFrame({
+        'Return %': normalized.ffill().iloc[-1],
+        'Volatility %': returns.std() * np.sqrt(TRADING_DAYS) * 100,
+        'Max Drawdown %': max_drawdown(matrix),
+        'Correlation': correlation,
+        'Beta': beta,
+        'Last': matrix.ffill().iloc[-1],
+    }, index=matrix.columns)
+
+
+@traced()
+def build_comparison(matrix, benchmark=None, period='1Y', window=60):
+    """
+    종가 행렬에서 비교 화면에 필요한 값을 한 번에 계산합니다.
+    반환: {'matrix', 'normalized', 'relative', 'rolling_corr', 'correlation', 'summary', 'benchmark'}
+    """
+    matrix = slice_period(matrix, period).dropna(axis=1, how='all')
+    if matrix.empty or matrix.shape[0] < 2:
+        return None
+    benchmark = benchmark if benchmark in matrix.columns else matrix.columns[0]
+    returns = daily_returns(matrix)
+    normalized = normalized_returns(matrix)
+    return {
+        'matrix': matrix,
+        'normalized': normalized,
+        'relative': relative_strength(matrix, benchmark),
+        'rolling_corr': rolling_correlation(returns, benchmark, window) if matrix.shape[1] > 1 else None,
+        'correlation': returns.corr(),
+        'summary': summarize(matrix, returns, normalized, benchmark),
+        'benchmark': benchmark,
+    }
@@ -0,0 +1,154 @@
+"""
+유니버스 수익률 상관관계와 계층적 클러스터링 (퍼포먼스 맵의 '상관관계 클러스터' 그룹).
+
+price_store의 종가 행렬에서 최근 LOOKBACK_DAYS 거래일의 로그 수익률을 표준화한 뒤(float32)
+상관계수 행렬을 BLOCK_SIZE 열씩 나눠 계산합니다. 중간 배열은 블록 크기로 제한되고 결과만 n × n입니다.
+그다음 거리 sqrt((1 - ρ) / 2)로 평균 연결(average linkage) 계층적 클러스터링을 해서 원하는 개수로 자릅니다.
+
+결과는 (마지막 거래일, 종목 목록)마다 한 번만 계산해 메모리에 캐시합니다. 같은 날에는 페이지를 다시 열어도 재계산하지 않습니다.
+"""
+import numpy as np
+import pandas as pd
+
+import price_store
+from cache import shared_cache
+from tracing import traced
+
+LOOKBACK_DAYS = 252
+# 이 비율 이상의 날에 수익률이 있는 종목만 포함합니다 (신규 상장 등 제외).
+MIN_COVERAGE = 0.8
+BLOCK_SIZE = 256
+DEFAULT_CLUSTERS = 12
+
+
+def standardized_returns(close, lookback=LOOKBACK_DAYS):
+    """
+    종가 행렬 -> (표준화된 일간 로그 수익률 float32 배열 T × n, 포함된 종목 Index).
+    결측일은 표준화 후 0(평균)으로 채웁니다 (상관계수가 약간 0쪽으로 줄어드는 근사).
+    """
+    window = close.iloc[-(lookback + 1):].to_numpy(dtype='float32')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = np.log(window[1:] / window[:-1])
+    returns[~np.isfinite(returns)] = np.nan
+    valid = ~np.isnan(returns)
+    coverage = valid.mean(axis=0) if len(returns) else np.zeros(returns.shape[1])
+    with np.errstate(invalid='ignore'):
+        std = np.nanstd(returns, axis=0, ddof=1) if len(returns) > 1 else np.zeros(returns.shape[1])
+    keep = (coverage >= MIN_COVERAGE) & (std > 0)
+
+    returns = returns[:, keep]
+    z = (returns - np.nanmean(returns, axis=0)) / std[keep]
+    z[np.isnan(z)] = 0.0
+    return z.astype('float32'), close.columns[keep]
+
+
+def blocked_correlation(z, block_size=BLOCK_SIZE):
+    """표준화된 수익률 (T × n) -> 상관계수 행렬 (n × n, float32). 블록마다 z_blockᵀ · z."""
+    t, n = z.shape
+    corr = np.empty((n, n), dtype='float32')
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        np.matmul(z[:, start:end].T, z, out=corr[start:end])
+    corr /= max(t - 1, 1)
+    np.clip(corr, -1, 1, out=corr)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+@traced()
+def correlation_matrix(close, lookback=LOOKBACK_DAYS, block_size=BLOCK_SIZE):
+    """종가 행렬 -> 종목 × 종목 상관계수 DataFrame (float32). 이력이 부족한 종목은 빠집니다."""
+    z, symbols = standardized_returns(close, lookback)
+    return pd.DataFrame(blocked_correlation(z, block_size), index=symbols, columns=symbols)
+
+
+def average_linkage(distance, n_clusters):
+    """
+    거리 행렬에 평균 연결 계층적 클러스터링을 적용해 n_clusters개가 될 때까지 합칩니다.
+    Lance-Williams 갱신으로 합칠 때마다 한 행만 다시 계산하고, 행마다 가장 가까운 이웃을 기억해
+    매번 n × n 전체를 훑지 않습니다. 반환: 0부터 시작하는 클러스터 번호 배열 (큰 클러스터가 0)
+    """
+    n = len(distance)
+    n_clusters = max(1, min(n_clusters, n))
+    d = np.array(distance, dtype='float64')
+    np.fill_diagonal(d, np.inf)
+    sizes = np.ones(n)
+    parent = np.arange(n)
+    nearest = d.argmin(axis=1)
+    nearest_distance = d[np.arange(n), nearest]
+
+    for _ in range(n - n_clusters):
+        i = int(np.argmin(nearest_distance))
+        j = int(nearest[i])
+        if i > j:
+            i, j = j, i
+        # 합친 클러스터 i와 나머지의 거리 = 크기 가중 평균
+        merged = (sizes[i] * d[i] + sizes[j] * d[j]) / (sizes[i] + sizes[j])
+        d[i], d[:, i] = merged, merged
+        d[i, i] = np.inf
+        d[j], d[:, j] = np.inf, np.inf
+        sizes[i] += sizes[j]
+        parent[j] = i
+        nearest_distance[j] = np.inf
+
+        # 가장 가까운 이웃이 i나 j였던 행과 i 행만 다시 찾음
+        stale = np.flatnonzero(((nearest == i) | (nearest == j)) & np.isfinite(nearest_distance))
+        stale = np.union1d(stale, [i])
+        nearest[stale] = d[stale].argmin(axis=1)
+        nearest_distance[stale] = d[stale, nearest[stale]]
+        closer = merged < nearest_distance
+        nearest[closer], nearest_distance[closer] = i, merged[closer]
+
+    # 합쳐진 순서를 따라 대표 번호를 찾고, 큰 클러스터부터 0, 1, 2 ... 로 번호를 다시 매김
+    roots = parent.copy()
+    while True:
+        next_roots = parent[roots]
+        if np.array_equal(next_roots, roots):
+            break
+        roots = next_roots
+    unique, inverse, counts = np.unique(roots, return_inverse=True, return_counts=True)
+    rank = np.empty(len(unique), dtype=int)
+    rank[np.argsort(-counts, kind='stable')] = np.arange(len(unique))
+    return rank[inverse]
+
+
+def cluster_labels(corr, n_clusters=DEFAULT_CLUSTERS):
+    """상관계수 DataFrame -> 종목별 클러스터 번호 Series."""
+    if corr.empty:
+        return pd.Series(dtype=int)
+    distance = np.sqrt(np.clip((1 - corr.to_numpy(dtype='float64')) / 2, 0, 1))
+    return pd.Series(average_linkage(distance, n_clusters), index=corr.index, name='cluster')
+
+
+@shared_cache(max_bytes=128 * 1024 * 1024)
+def _clusters(trading_day, symbols, n_clusters, lookback):
+    close, _ = price_store.load_matrices()
+    columns = [s for s in symbols if s in close.columns]
+    corr = correlation_matrix(close[columns], lookback)
+    return cluster_labels(corr, n_clusters), corr
+
+
+def load_clusters(symbols, n_clusters=DEFAULT_CLUSTERS, lookback=LOOKBACK_DAYS):
+    """
+    price_store 행렬의 마지막 거래일 기준 (클러스터 번호 Series, 상관계수 DataFrame).
+    같은 거래일·종목 목록이면 캐시된 결과를 씁니다. 행렬이 없으면 (None, None).
+    """
+    close, _ = price_store.load_matrices()
+    if close is None or close.empty:
+        return None, None
+    symbols = tuple(sorted(str(s).replace('.', '-') for s in symbols))
+    return _clusters(close.index[-1], symbols, n_clusters, lookback)
+
+
+def name_clusters(labels, sectors):
+    """
+    클러스터 번호 -> 표시 이름 ('C1 · Energy 80%'). 가장 많은 섹터와 그 비율을 붙입니다.
+    sectors: 종목 -> 섹터 Series
+    """
+    frame = pd.DataFrame({'cluster': labels, 'sector': sectors.reindex(labels.index).fillna('Other')})
+    names = {}
+    for cluster, group in frame.groupby('cluster'):
+        counts = group['sector'].value_counts()
+        share = counts.iloc[0] / len(group) * 100
+        names[cluster] = f"C{cluster + 1} · {counts.index[0]} {share:.0f}%"
+    return labels.map(names)
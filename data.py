@@ -1,10 +1,27 @@
+import os
+
 import streamlit as st
-import yfinance as yf
 import pandas as pd
-import requests
 from io import StringIO
 
-@st.cache_data
+import replay
+from cache import shared_cache, BoundedStore
+from insider_analytics import prepare_insider_transactions
+from tracing import traced
+
+# 티커별 캐시의 메모리 예산 (레플리카당). CACHE_BUDGET_MB 환경 변수로 조정합니다.
+# 재무제표 튜플이 가장 크므로 예산의 대부분을 load_stock_data에 배정합니다.
+# 아래 비율의 합이 1.0이 되도록 유지합니다 (캐시를 추가하면 기존 몫에서 떼어 줍니다).
+CACHE_BUDGET_MB = int(os.environ.get("CACHE_BUDGET_MB", "1024"))
+STOCK_CACHE_BYTES = int(CACHE_BUDGET_MB * 0.45) * 1024 * 1024
+PRICE_HISTORY_CACHE_BYTES = int(CACHE_BUDGET_MB * 0.15) * 1024 * 1024  # load_price_history
+STATEMENT_VIEW_CACHE_BYTES = int(CACHE_BUDGET_MB * 0.05) * 1024 * 1024  # statements.load_statement_view
+RATIO_HISTORY_CACHE_BYTES = int(CACHE_BUDGET_MB * 0.03) * 1024 * 1024  # ratios.load_ratio_history
+UNIVERSE_RATIOS_CACHE_BYTES = int(CACHE_BUDGET_MB * 0.02) * 1024 * 1024  # ratios.universe_ratios
+INSIDER_CACHE_BYTES = int(CACHE_BUDGET_MB * 0.15) * 1024 * 1024
+OWNERSHIP_CACHE_BYTES = int(CACHE_BUDGET_MB * 0.15) * 1024 * 1024
+
+@shared_cache
 def load_dow_tickers():
     """
     Wikipedia에서 Dow Jones Industrial Average (DJIA) 종목 리스트를 가져옵니다.
@@ -15,7 +32,7 @@ def load_dow_tickers():
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
         # Use simple requests to avoid some blocking, passed to read_html or direct
-        response = requests.get(url, headers=headers)
+        response = replay.http_get(url, headers=headers)
         response.raise_for_status()
         
         tables = pd.read_html(StringIO(response.text))
@@ -32,7 +49,7 @@ def load_dow_tickers():
     except Exception as e:
         return None, str(e)
 
-@st.cache_data
+@shared_cache
 def load_nasdaq_tickers():
     """
     Wikipedia에서 NASDAQ-100 종목 리스트를 가져옵니다.
@@ -42,7 +59,7 @@ def load_nasdaq_tickers():
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
-        response = requests.get(url, headers=headers)
+        response = replay.http_get(url, headers=headers)
         response.raise_for_status()
         
         tables = pd.read_html(StringIO(response.text))
@@ -59,7 +76,7 @@ def load_nasdaq_tickers():
     except Exception as e:
         return None, str(e)
 
-@st.cache_data
+@shared_cache
 def load_sp500_tickers():
     """
     Wikipedia에서 S&P 500 종목 리스트를 가져옵니다.
@@ -69,7 +86,7 @@ def load_sp500_tickers():
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
-        response = requests.get(url, headers=headers)
+        response = replay.http_get(url, headers=headers)
         response.raise_for_status()
         
         tables = pd.read_html(StringIO(response.text))
@@ -78,14 +95,70 @@ def load_sp500_tickers():
     except Exception as e:
         return None, str(e)
 
-@st.cache_data
-def load_stock_data(symbol, period, interval):
+# 업스트림에서 존재하지 않는 것으로 확인된 심볼 (짧은 TTL의 negative cache)
+# 오타/부분 입력이 매번 전체 조회 시퀀스를 타지 않도록 10분간 기억합니다.
+_invalid_symbols = BoundedStore("invalid_symbols", ttl=600)
+
+@shared_cache(ttl=3600, cache_if=bool)
+def probe_symbol(symbol):
+    """
+    재무제표 전체 조회 전에 심볼이 실제로 존재하는지 가볍게 확인합니다 (history 5일 1회 호출).
+    반환: True(존재), False(빈 이력 = 없는 심볼), None(네트워크 오류/요청 제한 등으로 알 수 없음).
+    True만 캐시합니다.
+    """
+    try:
+        return not replay.ticker(symbol).history(period="5d").empty
+    except Exception:
+        return None
+
+def is_valid_symbol(symbol, universe=None):
+    """
+    심볼 검증: 유니버스 인덱스 → negative cache → 존재 여부 probe 순서로 확인합니다.
+    universe를 주지 않으면 지수 구성 종목 집합(load_universe_symbols)에서 찾습니다.
+    반환: True/False, probe가 실패해 알 수 없으면 None (negative cache에 넣지 않고 전체 조회에서 오류를 보여줌)
     """
-    yfinance를 사용하여 주식 데이터와 정보를 가져옵니다.
+    if not symbol:
+        return False
+    if universe is None:
+        universe = load_universe_symbols()
+    if symbol in universe:
+        return True
+    invalid, _ = _invalid_symbols.get(symbol)
+    if invalid:
+        return False
+    exists = probe_symbol(symbol)
+    if exists is False:
+        _invalid_symbols.put(symbol, True)
+    return exists
+
+# 일봉 이력은 종목당 한 번만 길게 받아두고 Weekly/Monthly 봉은 utils.resample_ohlcv로 만듭니다.
+PRICE_HISTORY_PERIOD = "5y"
+
+@shared_cache(max_bytes=PRICE_HISTORY_CACHE_BYTES, policy='lfu', cache_if=lambda h: h is not None and not h.empty)
+def load_price_history(symbol):
+    """
+    종목의 장기 일봉(OHLCV) 이력을 가져옵니다.
+    응답으로 빈 이력을 받았을 때만 존재하지 않는 심볼로 보고 negative cache에 기록합니다 (예외는 기록하지 않음).
+    """
+    try:
+        history = replay.ticker(symbol).history(period=PRICE_HISTORY_PERIOD, interval="1d")
+        if history is None:
+            return None
+        if history.empty:
+            _invalid_symbols.put(symbol, True)
+            return None
+        return history
+    except Exception as e:
+        return None
+
+@shared_cache(max_bytes=STOCK_CACHE_BYTES, policy='lfu', cache_if=lambda result: result[0] is not None)
+def load_stock_data(symbol):
+    """
+    yfinance를 사용하여 주식 정보와 재무제표를 가져옵니다.
+    주가 이력은 load_price_history에서 따로 가져옵니다 (심볼 검증 후 호출). 실패 결과는 캐시하지 않습니다.
     """
     try:
-        ticker = yf.Ticker(symbol)
-        history = ticker.history(period=period, interval=interval)
+        ticker = replay.ticker(symbol)
         info = ticker.info
         financials = ticker.financials
         quarterly_financials = ticker.quarterly_financials
@@ -94,20 +167,43 @@ def load_stock_data(symbol, period, interval):
         cashflow = ticker.cashflow
         quarterly_cashflow = ticker.quarterly_cashflow
         splits = ticker.splits
-        return history, info, financials, quarterly_financials, balance_sheet, quarterly_balance_sheet, cashflow, quarterly_cashflow, splits
+        return info, financials, quarterly_financials, balance_sheet, quarterly_balance_sheet, cashflow, quarterly_cashflow, splits
     except Exception as e:
-        return None, None, None, None, None, None, None, None, None
+        return None, None, None, None, None, None, None, None
 
 
+# (재무제표, 주기) -> yf.Ticker 속성
+STATEMENT_ATTRS = {
+    ('income', 'annual'): 'financials',
+    ('income', 'quarterly'): 'quarterly_financials',
+    ('balance', 'annual'): 'balance_sheet',
+    ('balance', 'quarterly'): 'quarterly_balance_sheet',
+    ('cashflow', 'annual'): 'cashflow',
+    ('cashflow', 'quarterly'): 'quarterly_cashflow',
+}
 
-@st.cache_data
+def fetch_info(symbol):
+    """
+    캐시 없이 ticker.info만 가져옵니다 (스크리너 일괄 수집용). 네트워크 오류는 호출자에게 전달됩니다.
+    """
+    return replay.ticker(symbol).info
+
+def fetch_financial_statements(symbol):
+    """
+    캐시 없이 재무제표 6종만 가져옵니다 (info/주가 제외). {(statement, frequency): DataFrame}
+    네트워크 오류는 호출자에게 전달됩니다 (일괄 수집에서 실패 집계용).
+    """
+    ticker = replay.ticker(symbol)
+    return {key: getattr(ticker, attr) for key, attr in STATEMENT_ATTRS.items()}
+
+@shared_cache
 def load_market_data(tickers):
     """
     S&P 500 종목들의 현재가 정보를 일괄 다운로드하여 등락률과 거래량을 계산합니다.
     """
     try:
         # 500개 이상이므로 배치 처리는 생략하고 한 번에 시도
-        data = yf.download(tickers, period="5d", interval="1d", group_by='ticker', progress=False)
+        data = replay.download(tickers, period="5d", interval="1d", group_by='ticker', progress=False)
         
         market_data = []
         for ticker in tickers:
@@ -135,6 +231,7 @@ def load_market_data(tickers):
     except Exception as e:
         return None
 
+@traced()
 @st.cache_data(ttl=3600) # Cache for 1 hour
 def load_indices_data():
     """
@@ -152,7 +249,7 @@ def load_indices_data():
     try:
         # Batch download attempt (5d to ensure we have previous close)
         tickers = list(indices.values())
-        data = yf.download(tickers, period="5d", interval="1d", group_by='ticker', progress=False)
+        data = replay.download(tickers, period="5d", interval="1d", group_by='ticker', progress=False)
         
         for name, symbol in indices.items():
             try:
@@ -184,8 +281,7 @@ def load_indices_data():
     except Exception as e:
         return {}
 
-import requests
-
+@traced()
 def fetch_fear_and_greed_index():
     """
     Fetches the Fear and Greed Index from CNN (or alternative).
@@ -197,7 +293,7 @@ def fetch_fear_and_greed_index():
     }
     
     try:
-        response = requests.get(url, headers=headers, timeout=5)
+        response = replay.http_get(url, headers=headers, timeout=5)
         response.raise_for_status()
         data = response.json()
         
@@ -225,6 +321,41 @@ def fetch_fear_and_greed_index():
     except Exception as e:
         return None
 
+# 지수 이름 -> 구성 종목 로더
+INDEX_TICKER_LOADERS = {
+    'sp500': load_sp500_tickers,
+    'dow': load_dow_tickers,
+    'nasdaq': load_nasdaq_tickers,
+}
+
+def load_index_symbols(index='sp500'):
+    """
+    지수 구성 종목의 Yahoo 심볼 리스트를 반환합니다 (BRK.B -> BRK-B). 실패하면 빈 리스트.
+    index='all'이면 세 지수의 합집합.
+    """
+    names = list(INDEX_TICKER_LOADERS) if index == 'all' else [index]
+    symbols = []
+    for name in names:
+        df, _ = INDEX_TICKER_LOADERS[name]()
+        if df is not None and 'Symbol' in df.columns:
+            symbols += [str(s).replace('.', '-') for s in df['Symbol']]
+    return list(dict.fromkeys(symbols))
+
+def load_sector_map():
+    """
+    Yahoo 심볼 -> GICS 섹터. S&P 500 / Nasdaq-100 표의 'GICS Sector' 컬럼을 사용합니다 (S&P 500 우선).
+    """
+    sectors = {}
+    for name in ('nasdaq', 'sp500'):
+        df, _ = INDEX_TICKER_LOADERS[name]()
+        if df is None or 'Symbol' not in df.columns or 'GICS Sector' not in df.columns:
+            continue
+        for symbol, sector in zip(df['Symbol'], df['GICS Sector']):
+            if pd.notnull(sector):
+                sectors[str(symbol).replace('.', '-')] = str(sector)
+    return sectors
+
+@traced()
 @st.cache_data
 def get_all_tickers_dict():
     """
@@ -258,21 +389,36 @@ def get_all_tickers_dict():
     
     return tickers_map
 
-@st.cache_data(ttl=3600) # Cache for 1 hr
+@shared_cache(cache_if=bool)
+def load_universe_symbols():
+    """
+    get_all_tickers_dict의 심볼 집합 (is_valid_symbol의 존재 확인용, 조회가 O(1)).
+    지수 구성 표를 하나도 받지 못해 비어 있으면 캐시하지 않습니다.
+    """
+    return frozenset(get_all_tickers_dict().values())
+
+def fetch_insider_transactions(symbol):
+    """
+    캐시 없이 yfinance에서 내부자 거래를 가져와 정리합니다 (prepare_insider_transactions).
+    데이터가 없으면 None. 네트워크 오류는 호출자에게 전달됩니다 (일괄 수집에서 실패 집계용).
+    """
+    insider = replay.ticker(symbol).insider_transactions
+    if insider is not None and not insider.empty:
+        return prepare_insider_transactions(insider)
+    return None
+
+@shared_cache(ttl=3600, max_bytes=INSIDER_CACHE_BYTES) # Cache for 1 hr
 def load_insider_trading(symbol):
     """
     Fetch insider trading data using yfinance.
+    날짜/금액 파싱과 매수·매도 분류(Side 컬럼), 최신순 정렬을 여기서 한 번만 해서 캐시합니다.
     """
     try:
-        ticker = yf.Ticker(symbol)
-        insider = ticker.insider_transactions
-        if insider is not None and not insider.empty:
-            # Sort by Date usually comes sorted but just in case
-            return insider
-        return None
+        return fetch_insider_transactions(symbol)
     except Exception as e:
         return None
 
+@traced()
 @st.cache_data(ttl=300) # Cache for 5 mins
 @st.cache_data(ttl=300) # Cache for 5 mins
 def load_market_ticker_data():
@@ -300,7 +446,7 @@ def load_market_ticker_data():
     
     try:
         # Batch download
-        data = yf.download(symbols, period="2d", progress=False)
+        data = replay.download(symbols, period="2d", progress=False)
         
         if data is None or data.empty:
             return []
@@ -378,24 +524,31 @@ def load_market_ticker_data():
     except Exception as e:
         return []
 
-@st.cache_data(ttl=3600)
+def fetch_ownership_data(symbol):
+    """
+    캐시 없이 Major Holders / Institutional Holders를 가져옵니다.
+    네트워크 오류는 호출자에게 전달됩니다 (일괄 수집에서 실패 집계용).
+    """
+    ticker = replay.ticker(symbol)
+
+    # 1. Major Holders (Breakdown)
+    # Returns DataFrame with 0 (Percent), 1 (Description) usually
+    major = ticker.major_holders
+
+    # 2. Institutional Holders (Top Holders)
+    inst = ticker.institutional_holders
+
+    return {
+        'major': major,
+        'institutional': inst
+    }
+
+@shared_cache(ttl=3600, max_bytes=OWNERSHIP_CACHE_BYTES)
 def load_ownership_data(symbol):
     """
     Fetch ownership data: Major Holders and Institutional Holders.
     """
     try:
-        ticker = yf.Ticker(symbol)
-        
-        # 1. Major Holders (Breakdown)
-        # Returns DataFrame with 0 (Percent), 1 (Description) usually
-        major = ticker.major_holders
-        
-        # 2. Institutional Holders (Top Holders)
-        inst = ticker.institutional_holders
-        
-        return {
-            'major': major,
-            'institutional': inst
-        }
+        return fetch_ownership_data(symbol)
     except Exception as e:
         return None
@@ -0,0 +1,123 @@
+"""
+내부자 거래 분류/집계 (벡터화).
+
+load_insider_trading이 받아온 원본 테이블을 prepare_insider_transactions로 한 번 정리해 두면
+(날짜/금액 파싱, 매수·매도·보상·증여 분류, 최신순 정렬) 화면에서는 행 단위 반복 없이
+activity_windows로 1/3/6/12개월 집계를 한 번에 얻을 수 있습니다.
+"""
+import numpy as np
+import pandas as pd
+
+from tracing import traced
+
+SIDE_BUY = 'buy'
+SIDE_SELL = 'sell'
+SIDE_AWARD = 'award'
+SIDE_GIFT = 'gift'
+SIDE_OTHER = 'other'
+
+# 위에서부터 먼저 맞는 규칙을 적용합니다 (기존 화면 로직과 같이 매수 > 매도 순서).
+_SIDE_RULES = (
+    (SIDE_BUY, r'purchase|buy'),
+    (SIDE_SELL, r'sale|sell'),
+    (SIDE_AWARD, r'award|grant'),
+    (SIDE_GIFT, r'gift'),
+)
+SIDES = tuple(side for side, _ in _SIDE_RULES) + (SIDE_OTHER,)
+
+# 집계 기간 (개월)
+ACTIVITY_WINDOWS_MONTHS = (1, 3, 6, 12)
+
+
+def classify_transactions(df):
+    """
+    Text/Transaction 컬럼의 문구로 거래를 buy/sell/award/gift/other로 분류합니다.
+    반환: df와 같은 인덱스의 Categorical Series
+    """
+    text = pd.Series('', index=df.index)
+    for col in ('Text', 'Transaction'):
+        if col in df.columns:
+            text = text + df[col].fillna('').astype(str)
+    text = text.str.lower()
+
+    conditions = [text.str.contains(pattern, regex=True).to_numpy() for _, pattern in _SIDE_RULES]
+    sides = np.select(conditions, [side for side, _ in _SIDE_RULES], default=SIDE_OTHER)
+    return pd.Series(pd.Categorical(sides, categories=SIDES), index=df.index, name='Side')
+
+
+@traced()
+def prepare_insider_transactions(df):
+    """
+    yfinance insider_transactions를 화면/집계용으로 한 번 정리합니다.
+    - DatetimeIndex면 컬럼으로 꺼내고, 'Start Date'는 datetime으로 변환 (실패 값은 NaT)
+    - 'Value'/'Shares'는 숫자로 변환 (실패 값은 NaN)
+    - 'Side' 컬럼 추가 (classify_transactions)
+    - 최신순 정렬, RangeIndex
+    """
+    out = df.reset_index() if isinstance(df.index, pd.DatetimeIndex) else df.copy()
+    if 'Start Date' in out.columns:
+        out['Start Date'] = pd.to_datetime(out['Start Date'], errors='coerce')
+    for col in ('Value', 'Shares'):
+        if col in out.columns:
+            out[col] = pd.to_numeric(out[col], errors='coerce')
+    out['Side'] = classify_transactions(out)
+
+    if 'Start Date' in out.columns:
+        out = out.sort_values('Start Date', ascending=False, na_position='last', kind='stable')
+    return out.reset_index(drop=True)
+
+
+@traced()
+def activity_windows(prepared, now=None, windows=ACTIVITY_WINDOWS_MONTHS):
+    """
+    최근 N개월 매수/매도 건수·금액과 순매수 비율을 기간별로 계산합니다.
+    prepared는 prepare_insider_transactions의 결과(최신순 정렬)여야 합니다.
+    날짜 정렬을 이용해 누적합 한 번과 searchsorted로 모든 기간을 구합니다.
+
+    반환: index=['1M', '3M', ...], columns=[buy_count, sell_count, buy_value, sell_value, net_buy_ratio]
+          net_buy_ratio = (매수 금액 - 매도 금액) / (매수 금액 + 매도 금액), 거래가 없으면 NaN
+    """
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    labels = [f'{m}M' for m in windows]
+    columns = ['buy_count', 'sell_count', 'buy_value', 'sell_value']
+    if prepared is None or prepared.empty or 'Start Date' not in prepared.columns:
+        empty = pd.DataFrame(0, index=labels, columns=columns[:4])
+        empty['net_buy_ratio'] = np.nan
+        return empty
+
+    dates = prepared['Start Date']
+    valid = int(dates.notna().sum())  # NaT는 정렬상 맨 뒤
+    if dates.dt.tz is not None:
+        # searchsorted를 위해 UTC naive로 맞춤
+        now = now.tz_localize(dates.dt.tz) if now.tzinfo is None else now
+        now = now.tz_convert('UTC').tz_localize(None)
+        dates = dates.dt.tz_convert('UTC').dt.tz_localize(None)
+
+    side = prepared['Side'].to_numpy()[:valid]
+    values = (prepared['Value'].fillna(0).to_numpy(dtype=float)[:valid]
+              if 'Value' in prepared.columns else np.zeros(valid))
+    is_buy = side == SIDE_BUY
+    is_sell = side == SIDE_SELL
+
+    # 최신순 누적합: 앞에서 k개 행 = 최근 k건
+    cum = np.zeros((4, valid + 1))
+    cum[0, 1:] = np.cumsum(is_buy)
+    cum[1, 1:] = np.cumsum(is_sell)
+    cum[2, 1:] = np.cumsum(np.where(is_buy, values, 0.0))
+    cum[3, 1:] = np.cumsum(np.where(is_sell, values, 0.0))
+
+    # 오름차순으로 뒤집어 cutoff 이후(>=) 행 수를 searchsorted로 구함
+    ascending = dates.to_numpy()[:valid][::-1]
+    cutoffs = np.array([(now - pd.DateOffset(months=m)).to_datetime64() for m in windows],
+                       dtype=ascending.dtype)
+    counts = valid - np.searchsorted(ascending, cutoffs, side='left')
+
+    result = pd.DataFrame({
+        'buy_count': cum[0, counts].astype(int),
+        'sell_count': cum[1, counts].astype(int),
+        'buy_value': cum[2, counts],
+        'sell_value': cum[3, counts],
+    }, index=labels)
+    total = result['buy_value'] + result['sell_value']
+    result['net_buy_ratio'] = (result['buy_value'] - result['sell_value']) / total.where(total > 0)
+    return result
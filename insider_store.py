@@ -0,0 +1,237 @@
+"""
+지수 전체 내부자 거래 수집/조회.
+
+load_insider_trading은 화면에서 한 종목씩만 가져옵니다. 여기서는 지수 구성 종목 전체의 내부자 거래를
+동시 실행 수를 제한한 스레드 풀로 받아 store.py의 SQLite 테이블에 쌓아 두고,
+'최근 30일 동안 내부자 3명 이상이 매수한 종목' 같은 질의를 인덱스로 바로 답합니다.
+
+    python insider_store.py refresh sp500          # S&P 500 전체 수집 (12시간 안에 받은 종목은 건너뜀)
+    python insider_store.py refresh all --force    # 세 지수 전체를 다시 수집
+    python insider_store.py clusters --days 30 --min 3
+
+같은 (종목, 거래일, 내부자, 구분, 주식 수) 행은 한 번만 저장되므로 다시 수집해도 새 행만 추가됩니다.
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+import store
+from insider_analytics import SIDE_BUY
+from tracing import traced
+
+DB_NAME = 'insider.sqlite'
+
+# 한 번에 yfinance에 보내는 요청 수 (너무 크면 Yahoo가 요청을 막습니다)
+DEFAULT_MAX_WORKERS = 8
+# 이 시간 안에 수집한 종목은 다시 받지 않습니다
+DEFAULT_MIN_AGE_HOURS = 12
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS insider_transactions (
+    symbol      TEXT NOT NULL,
+    filing_date TEXT NOT NULL,  -- 'Start Date' (YYYY-MM-DD)
+    insider     TEXT NOT NULL,
+    side        TEXT NOT NULL,  -- insider_analytics.SIDES
+    shares      REAL NOT NULL,
+    value       REAL,
+    position    TEXT,
+    text        TEXT,
+    ownership   TEXT,
+    PRIMARY KEY (symbol, filing_date, insider, side, shares)
+);
+CREATE INDEX IF NOT EXISTS idx_insider_side_date
+    ON insider_transactions (side, filing_date, symbol, insider);
+CREATE TABLE IF NOT EXISTS refresh_log (
+    symbol       TEXT PRIMARY KEY,
+    refreshed_at REAL NOT NULL,  -- unix time
+    rows         INTEGER NOT NULL
+);
+"""
+
+_COLUMNS = ('symbol', 'filing_date', 'insider', 'side', 'shares', 'value', 'position', 'text', 'ownership')
+
+
+def init_db():
+    with store.connect(DB_NAME) as conn:
+        conn.executescript(_SCHEMA)
+
+
+def to_rows(symbol, prepared):
+    """
+    prepare_insider_transactions 결과를 테이블 행(tuple) 리스트로 바꿉니다.
+    거래일이 없는 행은 키를 만들 수 없으므로 버립니다.
+    """
+    if prepared is None or prepared.empty or 'Start Date' not in prepared.columns:
+        return []
+    df = prepared[prepared['Start Date'].notna()]
+
+    def text_col(name):
+        return df[name].fillna('').astype(str) if name in df.columns else pd.Series('', index=df.index)
+
+    def num_col(name):
+        return df[name] if name in df.columns else pd.Series(float('nan'), index=df.index)
+
+    out = pd.DataFrame({
+        'symbol': symbol,
+        'filing_date': df['Start Date'].dt.strftime('%Y-%m-%d'),
+        'insider': text_col('Insider').str.strip().str.upper(),
+        'side': df['Side'].astype(str),
+        'shares': num_col('Shares').fillna(0.0),  # 키 컬럼이라 NULL 대신 0
+        'value': num_col('Value'),
+        'position': text_col('Position'),
+        'text': text_col('Text'),
+        'ownership': text_col('Ownership'),
+    }, columns=_COLUMNS)
+    out = out.astype(object).where(out.notna(), None)
+    return list(out.itertuples(index=False, name=None))
+
+
+def stale_symbols(symbols, min_age_hours=DEFAULT_MIN_AGE_HOURS):
+    """refresh_log 기준으로 min_age_hours보다 오래됐거나 한 번도 수집하지 않은 종목."""
+    cutoff = time.time() - min_age_hours * 3600
+    with store.connect(DB_NAME) as conn:
+        fresh = {s for (s,) in conn.execute('SELECT symbol FROM refresh_log WHERE refreshed_at >= ?', (cutoff,))}
+    return [s for s in symbols if s not in fresh]
+
+
+def refresh_symbols(symbols, max_workers=DEFAULT_MAX_WORKERS, min_age_hours=DEFAULT_MIN_AGE_HOURS,
+                    progress=None):
+    """
+    symbols의 내부자 거래를 동시에 max_workers개씩 받아 테이블에 추가합니다.
+    네트워크 호출만 스레드에서 하고, 쓰기는 호출한 스레드 한 곳에서만 합니다 (SQLite 단일 writer).
+    min_age_hours=0이면 최근 수집 여부와 관계없이 모두 받습니다.
+
+    반환: {'requested', 'fetched', 'skipped', 'failed', 'new_rows', 'seconds', 'errors': {symbol: message}}
+    """
+    from data import fetch_insider_transactions  # streamlit import는 실제 수집할 때만
+
+    init_db()
+    start = time.perf_counter()
+    symbols = list(dict.fromkeys(symbols))
+    targets = stale_symbols(symbols, min_age_hours) if min_age_hours > 0 else symbols
+    stats = {'requested': len(symbols), 'fetched': 0, 'skipped': len(symbols) - len(targets),
+             'failed': 0, 'new_rows': 0, 'errors': {}}
+
+    insert = f"INSERT OR IGNORE INTO insider_transactions ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+    fetched = store.fetch_all(fetch_insider_transactions, targets, max_workers)
+    for done, (symbol, prepared, error) in enumerate(fetched, 1):
+        if progress:
+            progress(done, len(targets), symbol)
+        if error is None:
+            try:
+                rows = to_rows(symbol, prepared)
+            except Exception as e:
+                error = e
+        if error is not None:
+            stats['failed'] += 1
+            stats['errors'][symbol] = f'{type(error).__name__}: {error}'
+            continue
+        with store.connect(DB_NAME) as conn:
+            before = conn.total_changes
+            conn.executemany(insert, rows)
+            added = conn.total_changes - before
+            conn.execute('INSERT OR REPLACE INTO refresh_log (symbol, refreshed_at, rows) VALUES (?, ?, ?)',
+                         (symbol, time.time(), len(rows)))
+        stats['fetched'] += 1
+        stats['new_rows'] += added
+
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def refresh_index(index='sp500', **kwargs):
+    """지수 구성 종목 전체를 refresh_symbols로 수집합니다 (index: sp500/dow/nasdaq/all)."""
+    from data import load_index_symbols
+    return refresh_symbols(load_index_symbols(index), **kwargs)
+
+
+@traced()
+def cluster_buys(days=30, min_insiders=3, as_of=None):
+    """
+    최근 days일 동안 서로 다른 내부자 min_insiders명 이상이 매수한 종목.
+    (side, filing_date) 인덱스 범위 검색 후 종목별로 집계하므로 전체 테이블을 읽지 않습니다.
+
+    반환: DataFrame [symbol, insiders, trades, shares, value, first_date, last_date, names]
+          (내부자 수, 매수 금액 순). 저장소가 없으면 빈 DataFrame
+    """
+    columns = ['symbol', 'insiders', 'trades', 'shares', 'value', 'first_date', 'last_date', 'names']
+    if not store.exists(DB_NAME):
+        return pd.DataFrame(columns=columns)
+
+    as_of = pd.Timestamp.now().normalize() if as_of is None else pd.Timestamp(as_of)
+    since = (as_of - pd.Timedelta(days=days)).strftime('%Y-%m-%d')
+    query = """
+        SELECT symbol,
+               COUNT(DISTINCT insider) AS insiders,
+               COUNT(*) AS trades,
+               SUM(shares) AS shares,
+               SUM(value) AS value,
+               MIN(filing_date) AS first_date,
+               MAX(filing_date) AS last_date,
+               GROUP_CONCAT(DISTINCT insider) AS names
+        FROM insider_transactions
+        WHERE side = ? AND filing_date >= ? AND filing_date <= ?
+        GROUP BY symbol
+        HAVING COUNT(DISTINCT insider) >= ?
+        ORDER BY insiders DESC, value DESC
+    """
+    with store.connect(DB_NAME) as conn:
+        return pd.read_sql_query(query, conn,
+                                 params=(SIDE_BUY, since, as_of.strftime('%Y-%m-%d'), min_insiders))
+
+
+def store_summary():
+    """저장된 종목 수/행 수/마지막 수집 시각 (화면·CLI 표시용). 저장소가 없으면 None."""
+    if not store.exists(DB_NAME):
+        return None
+    with store.connect(DB_NAME) as conn:
+        symbols, last = conn.execute('SELECT COUNT(*), MAX(refreshed_at) FROM refresh_log').fetchone()
+        (rows,) = conn.execute('SELECT COUNT(*) FROM insider_transactions').fetchone()
+    return {'symbols': symbols, 'rows': rows,
+            'refreshed_at': pd.Timestamp(last, unit='s') if last else None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='지수 전체 내부자 거래 수집/조회')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_refresh = sub.add_parser('refresh', help='지수 구성 종목의 내부자 거래 수집')
+    p_refresh.add_argument('index', nargs='?', default='sp500', choices=('sp500', 'dow', 'nasdaq', 'all'))
+    p_refresh.add_argument('--symbols', nargs='+', help='지수 대신 이 종목들만 수집')
+    p_refresh.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS)
+    p_refresh.add_argument('--force', action='store_true', help='최근에 수집한 종목도 다시 수집')
+
+    p_clusters = sub.add_parser('clusters', help='내부자 여러 명이 매수한 종목')
+    p_clusters.add_argument('--days', type=int, default=30)
+    p_clusters.add_argument('--min', dest='min_insiders', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == 'refresh':
+        def progress(done, total, symbol):
+            print(f'\r{done}/{total} {symbol:<8}', end='', flush=True)
+
+        kwargs = {'max_workers': args.workers, 'min_age_hours': 0 if args.force else DEFAULT_MIN_AGE_HOURS,
+                  'progress': progress}
+        if args.symbols:
+            stats = refresh_symbols([s.upper() for s in args.symbols], **kwargs)
+        else:
+            stats = refresh_index(args.index, **kwargs)
+        print(f"\n{stats['fetched']} fetched, {stats['skipped']} skipped, {stats['failed']} failed, "
+              f"{stats['new_rows']} new rows in {stats['seconds']:.1f}s")
+        for symbol, message in sorted(stats['errors'].items()):
+            print(f'  {symbol:<8} {message}')
+        return 0
+
+    start = time.perf_counter()
+    clusters = cluster_buys(args.days, args.min_insiders)
+    elapsed = (time.perf_counter() - start) * 1000
+    with pd.option_context('display.max_colwidth', 60, 'display.width', 160):
+        print(clusters.to_string(index=False) if not clusters.empty else 'no clusters')
+    print(f'{len(clusters)} symbols in {elapsed:.1f}ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""
+지수 전체 기관 보유 현황 수집/조회.
+
+load_ownership_data는 화면에서 한 종목의 major_holders / institutional_holders를 받아 보여주고 끝납니다.
+여기서는 지수 구성 종목 전체의 보유 기관을 store.py의 SQLite에 모아 두고, 기관 → 보유 종목
+역색인(holdings.holder_key 인덱스)으로 다음 같은 질의를 바로 답합니다.
+- 'Vanguard가 지분율을 늘린 S&P 500 종목'  : holder_positions('vanguard', increased=True, symbols=...)
+- '기관 보유 비중이 가장 높은 20종목'       : most_crowded(20)
+
+    python ownership_store.py refresh sp500        # 새 13F 보고가 나왔을 종목만 수집
+    python ownership_store.py refresh all --force  # 전부 다시 수집
+    python ownership_store.py holder vanguard --increased
+    python ownership_store.py crowded --limit 20
+
+기관 보유는 분기 말 기준 13F 보고(분기 종료 후 45일 안에 제출)로만 바뀌므로, 저장된 최근 보고일의
+다음 분기 제출 기한이 지나지 않은 종목은 다시 받지 않습니다.
+"""
+import argparse
+import re
+import sys
+import time
+
+import pandas as pd
+
+import store
+from tracing import traced
+
+DB_NAME = 'ownership.sqlite'
+
+DEFAULT_MAX_WORKERS = 8
+# 같은 종목을 다시 받기 전 최소 간격 (제출 기한이 지났는데 아직 새 보고가 없을 때 매번 받지 않도록)
+DEFAULT_MIN_AGE_HOURS = 24
+# 13F 제출 기한: 분기 종료 후 45일
+FILING_LAG_DAYS = 45
+# 기관 데이터가 아예 없는 종목을 다시 확인하는 간격
+EMPTY_RETRY_DAYS = 7
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS holdings (
+    symbol        TEXT NOT NULL,
+    holder_key    TEXT NOT NULL,  -- holder_key(Holder)
+    date_reported TEXT NOT NULL,  -- YYYY-MM-DD
+    holder        TEXT NOT NULL,
+    pct_held      REAL,
+    shares        REAL,
+    value         REAL,
+    pct_change    REAL,
+    PRIMARY KEY (symbol, holder_key, date_reported)
+);
+-- 역색인: 기관 → 보유 종목
+CREATE INDEX IF NOT EXISTS idx_holdings_holder
+    ON holdings (holder_key, date_reported, symbol);
+CREATE TABLE IF NOT EXISTS ownership_snapshot (
+    symbol                 TEXT PRIMARY KEY,
+    latest_report          TEXT,  -- 기관 보유의 최근 보고일
+    institutions_pct       REAL,
+    institutions_float_pct REAL,
+    insiders_pct           REAL,
+    institutions_count     REAL,
+    top_holders_pct        REAL,  -- 최근 보고 상위 기관 지분율 합
+    refreshed_at           REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshot_institutions
+    ON ownership_snapshot (institutions_pct);
+"""
+
+_HOLDING_COLUMNS = ('symbol', 'holder_key', 'date_reported', 'holder', 'pct_held', 'shares', 'value', 'pct_change')
+_SNAPSHOT_COLUMNS = ('symbol', 'latest_report', 'institutions_pct', 'institutions_float_pct', 'insiders_pct',
+                     'institutions_count', 'top_holders_pct', 'refreshed_at')
+
+# 기관명 끝의 법인 형태 표기 (같은 기관이 'Inc' / 'Inc.' / 없이 섞여 나옵니다)
+_HOLDER_SUFFIXES = {'INC', 'CORP', 'CORPORATION', 'CO', 'COMPANY', 'LLC', 'LTD', 'LP', 'PLC', 'THE', 'NA', 'SA', 'AG'}
+
+
+def holder_key(name):
+    """
+    기관명 정규화: 대문자, 영숫자만, 끝의 법인 형태 제거.
+    'Vanguard Group Inc' -> 'VANGUARD GROUP', 'Blackrock Inc.' -> 'BLACKROCK'
+    """
+    words = re.sub(r'[^A-Z0-9&]+', ' ', str(name).upper()).split()
+    while len(words) > 1 and words[-1] in _HOLDER_SUFFIXES:
+        words.pop()
+    if words and words[0] == 'THE' and len(words) > 1:
+        words.pop(0)
+    return ' '.join(words)
+
+
+def init_db():
+    with store.connect(DB_NAME) as conn:
+        conn.executescript(_SCHEMA)
+
+
+def _major_value(major, key):
+    """major_holders(Breakdown index, 'Value' 컬럼)에서 값 하나. 형식이 다르면 None."""
+    try:
+        if major is None or major.empty or 'Value' not in major.columns or key not in major.index:
+            return None
+        value = float(major.loc[key, 'Value'])
+        return value if pd.notnull(value) else None
+    except Exception:
+        return None
+
+
+def to_records(symbol, ownership, now=None):
+    """
+    fetch_ownership_data 결과를 (holdings 행 리스트, snapshot 행)으로 바꿉니다.
+    """
+    ownership = ownership or {}
+    inst = ownership.get('institutional')
+    major = ownership.get('major')
+
+    rows = []
+    latest = None
+    top_pct = None
+    if inst is not None and not inst.empty and {'Holder', 'Date Reported'}.issubset(inst.columns):
+        df = inst.copy()
+        df['Date Reported'] = pd.to_datetime(df['Date Reported'], errors='coerce')
+        df = df[df['Date Reported'].notna() & df['Holder'].notna()]
+        if not df.empty:
+            def num_col(name):
+                return pd.to_numeric(df[name], errors='coerce') if name in df.columns else pd.Series(float('nan'), index=df.index)
+
+            out = pd.DataFrame({
+                'symbol': symbol,
+                'holder_key': df['Holder'].map(holder_key),
+                'date_reported': df['Date Reported'].dt.strftime('%Y-%m-%d'),
+                'holder': df['Holder'].astype(str),
+                'pct_held': num_col('pctHeld'),
+                'shares': num_col('Shares'),
+                'value': num_col('Value'),
+                'pct_change': num_col('pctChange'),
+            }, columns=_HOLDING_COLUMNS)
+            latest = out['date_reported'].max()
+            top_pct = float(out.loc[out['date_reported'] == latest, 'pct_held'].sum(min_count=1))
+            out = out.astype(object).where(out.notna(), None)
+            rows = list(out.itertuples(index=False, name=None))
+
+    snapshot = (
+        symbol,
+        latest,
+        _major_value(major, 'institutionsPercentHeld'),
+        _major_value(major, 'institutionsFloatPercentHeld'),
+        _major_value(major, 'insidersPercentHeld'),
+        _major_value(major, 'institutionsCount'),
+        top_pct if top_pct is not None and pd.notnull(top_pct) else None,
+        time.time() if now is None else now,
+    )
+    return rows, snapshot
+
+
+def next_filing_due(latest_report):
+    """최근 보고일(분기 말) 다음 분기의 13F 제출 기한."""
+    return pd.Timestamp(latest_report) + pd.offsets.QuarterEnd(1) + pd.Timedelta(days=FILING_LAG_DAYS)
+
+
+def due_symbols(symbols, now=None, min_age_hours=DEFAULT_MIN_AGE_HOURS):
+    """
+    다시 받아야 하는 종목: 한 번도 받지 않았거나, 다음 분기 제출 기한이 지났거나
+    (기관 데이터가 없던 종목은 EMPTY_RETRY_DAYS마다). 어느 경우든 min_age_hours 안에 받은 종목은 제외.
+    """
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    with store.connect(DB_NAME) as conn:
+        known = {symbol: (latest, refreshed_at) for symbol, latest, refreshed_at in
+                 conn.execute('SELECT symbol, latest_report, refreshed_at FROM ownership_snapshot')}
+
+    due = []
+    for symbol in symbols:
+        if symbol not in known:
+            due.append(symbol)
+            continue
+        latest, refreshed_at = known[symbol]
+        refreshed = pd.Timestamp(refreshed_at, unit='s')
+        if now - refreshed < pd.Timedelta(hours=min_age_hours):
+            continue
+        if latest is None:
+            if now - refreshed >= pd.Timedelta(days=EMPTY_RETRY_DAYS):
+                due.append(symbol)
+        elif now >= next_filing_due(latest):
+            due.append(symbol)
+    return due
+
+
+def refresh_symbols(symbols, max_workers=DEFAULT_MAX_WORKERS, force=False, progress=None):
+    """
+    보고일이 바뀌었을 종목(due_symbols)만 동시에 max_workers개씩 받아 저장합니다. force=True면 전부.
+    holdings는 (종목, 기관, 보고일) 단위로 쌓이므로 이전 분기 기록도 남습니다.
+
+    반환: {'requested', 'fetched', 'skipped', 'failed', 'new_rows', 'moved', 'seconds', 'errors': {symbol: message}}
+          moved = 최근 보고일이 실제로 바뀐 종목 수
+    """
+    from data import fetch_ownership_data  # streamlit import는 실제 수집할 때만
+
+    init_db()
+    start = time.perf_counter()
+    symbols = list(dict.fromkeys(symbols))
+    targets = symbols if force else due_symbols(symbols)
+    stats = {'requested': len(symbols), 'fetched': 0, 'skipped': len(symbols) - len(targets),
+             'failed': 0, 'new_rows': 0, 'moved': 0, 'errors': {}}
+
+    insert = (f"INSERT OR IGNORE INTO holdings ({', '.join(_HOLDING_COLUMNS)}) "
+              f"VALUES ({', '.join('?' * len(_HOLDING_COLUMNS))})")
+    upsert = (f"INSERT OR REPLACE INTO ownership_snapshot ({', '.join(_SNAPSHOT_COLUMNS)}) "
+              f"VALUES ({', '.join('?' * len(_SNAPSHOT_COLUMNS))})")
+    fetched = store.fetch_all(fetch_ownership_data, targets, max_workers)
+    for done, (symbol, ownership, error) in enumerate(fetched, 1):
+        if progress:
+            progress(done, len(targets), symbol)
+        if error is None:
+            try:
+                rows, snapshot = to_records(symbol, ownership)
+            except Exception as e:
+                error = e
+        if error is not None:
+            stats['failed'] += 1
+            stats['errors'][symbol] = f'{type(error).__name__}: {error}'
+            continue
+        with store.connect(DB_NAME) as conn:
+            previous = conn.execute('SELECT latest_report FROM ownership_snapshot WHERE symbol = ?', (symbol,)).fetchone()
+            before = conn.total_changes
+            conn.executemany(insert, rows)
+            added = conn.total_changes - before
+            conn.execute(upsert, snapshot)
+        stats['fetched'] += 1
+        stats['new_rows'] += added
+        if previous is None or previous[0] != snapshot[1]:
+            stats['moved'] += 1
+
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def refresh_index(index='sp500', **kwargs):
+    """지수 구성 종목 전체를 refresh_symbols로 수집합니다 (index: sp500/dow/nasdaq/all)."""
+    from data import load_index_symbols
+    return refresh_symbols(load_index_symbols(index), **kwargs)
+
+
+def _prefix_range(prefix):
+    # holder_key >= prefix AND holder_key < upper : 인덱스 범위 검색으로 접두사 일치
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+@traced()
+def holder_positions(holder, increased=None, symbols=None):
+    """
+    기관명(접두사, 대소문자/법인 표기 무시)이 일치하는 기관의 종목별 최근 보고 보유 내역.
+    increased=True면 지분율이 늘어난(pctChange > 0) 종목만, False면 줄어든 종목만.
+    symbols를 주면 그 종목들(예: load_index_symbols('sp500'))로 제한합니다.
+
+    반환: DataFrame [symbol, holder, date_reported, pct_held, shares, value, pct_change] (평가 가치 순)
+    """
+    columns = ['symbol', 'holder', 'date_reported', 'pct_held', 'shares', 'value', 'pct_change']
+    key = holder_key(holder)
+    if not key or not store.exists(DB_NAME):
+        return pd.DataFrame(columns=columns)
+
+    low, high = _prefix_range(key)
+    query = f"""
+        SELECT {', '.join('h.' + c for c in columns)}
+        FROM holdings h
+        WHERE h.holder_key >= ? AND h.holder_key < ?
+          AND h.date_reported = (SELECT MAX(date_reported) FROM holdings l
+                                 WHERE l.symbol = h.symbol AND l.holder_key = h.holder_key)
+    """
+    params = [low, high]
+    if increased is not None:
+        query += ' AND h.pct_change > 0' if increased else ' AND h.pct_change < 0'
+    query += ' ORDER BY h.value DESC'
+
+    with store.connect(DB_NAME) as conn:
+        df = pd.read_sql_query(query, conn, params=params)
+    if symbols is not None:
+        df = df[df['symbol'].isin(set(symbols))].reset_index(drop=True)
+    return df
+
+
+@traced()
+def most_crowded(limit=20, by='institutions_pct', symbols=None):
+    """
+    기관 보유가 몰린 종목 상위 limit개.
+    by: institutions_pct(기관 보유 비중, 기본) / institutions_float_pct / top_holders_pct / institutions_count
+
+    반환: DataFrame [symbol, institutions_pct, institutions_float_pct, insiders_pct, institutions_count,
+                     top_holders_pct, latest_report]
+    """
+    columns = ['symbol', 'institutions_pct', 'institutions_float_pct', 'insiders_pct',
+               'institutions_count', 'top_holders_pct', 'latest_report']
+    if by not in columns[1:6]:
+        raise ValueError(f'unknown ranking column: {by}')
+    if not store.exists(DB_NAME):
+        return pd.DataFrame(columns=columns)
+
+    query = f"SELECT {', '.join(columns)} FROM ownership_snapshot WHERE {by} IS NOT NULL ORDER BY {by} DESC"
+    if symbols is None:
+        query += f' LIMIT {int(limit)}'
+    with store.connect(DB_NAME) as conn:
+        df = pd.read_sql_query(query, conn)
+    if symbols is not None:
+        df = df[df['symbol'].isin(set(symbols))].head(limit).reset_index(drop=True)
+    return df
+
+
+def store_summary():
+    """저장된 종목 수/보유 행 수/기관 수/마지막 수집 시각. 저장소가 없으면 None."""
+    if not store.exists(DB_NAME):
+        return None
+    with store.connect(DB_NAME) as conn:
+        symbols, last = conn.execute('SELECT COUNT(*), MAX(refreshed_at) FROM ownership_snapshot').fetchone()
+        rows, holders = conn.execute('SELECT COUNT(*), COUNT(DISTINCT holder_key) FROM holdings').fetchone()
+    return {'symbols': symbols, 'rows': rows, 'holders': holders,
+            'refreshed_at': pd.Timestamp(last, unit='s') if last else None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='지수 전체 기관 보유 현황 수집/조회')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_refresh = sub.add_parser('refresh', help='지수 구성 종목의 기관 보유 수집')
+    p_refresh.add_argument('index', nargs='?', default='sp500', choices=('sp500', 'dow', 'nasdaq', 'all'))
+    p_refresh.add_argument('--symbols', nargs='+', help='지수 대신 이 종목들만 수집')
+    p_refresh.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS)
+    p_refresh.add_argument('--force', action='store_true', help='보고일과 관계없이 모두 다시 수집')
+
+    p_holder = sub.add_parser('holder', help='기관의 종목별 보유 내역')
+    p_holder.add_argument('name')
+    p_holder.add_argument('--increased', action='store_true', help='지분율을 늘린 종목만')
+    p_holder.add_argument('--decreased', action='store_true', help='지분율을 줄인 종목만')
+    p_holder.add_argument('--index', choices=('sp500', 'dow', 'nasdaq', 'all'), help='이 지수 종목으로 제한')
+
+    p_crowded = sub.add_parser('crowded', help='기관 보유가 몰린 종목')
+    p_crowded.add_argument('--limit', type=int, default=20)
+    p_crowded.add_argument('--by', default='institutions_pct',
+                           choices=('institutions_pct', 'institutions_float_pct', 'top_holders_pct', 'institutions_count'))
+    args = parser.parse_args(argv)
+
+    if args.command == 'refresh':
+        def progress(done, total, symbol):
+            print(f'\r{done}/{total} {symbol:<8}', end='', flush=True)
+
+        kwargs = {'max_workers': args.workers, 'force': args.force, 'progress': progress}
+        if args.symbols:
+            stats = refresh_symbols([s.upper() for s in args.symbols], **kwargs)
+        else:
+            stats = refresh_index(args.index, **kwargs)
+        print(f"\n{stats['fetched']} fetched ({stats['moved']} with new reports), {stats['skipped']} skipped, "
+              f"{stats['failed']} failed, {stats['new_rows']} new rows in {stats['seconds']:.1f}s")
+        for symbol, message in sorted(stats['errors'].items()):
+            print(f'  {symbol:<8} {message}')
+        return 0
+
+    start = time.perf_counter()
+    if args.command == 'holder':
+        increased = True if args.increased else (False if args.decreased else None)
+        symbols = None
+        if args.index:
+            from data import load_index_symbols
+            symbols = load_index_symbols(args.index)
+            start = time.perf_counter()
+        result = holder_positions(args.name, increased=increased, symbols=symbols)
+    else:
+        result = most_crowded(args.limit, by=args.by)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    with pd.option_context('display.width', 160, 'display.max_rows', 200):
+        print(result.to_string(index=False) if not result.empty else 'no results')
+    print(f'{len(result)} rows in {elapsed:.1f}ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+퍼포먼스 맵의 기간별 수익률 (1D/1W/1M/3M/YTD/1Y).
+
+price_store 종가 행렬에서 마지막 거래일과 각 기간 시작 거래일의 행만 골라 한 번에 나눕니다.
+기간별 표 전체를 행렬 버전(파일 수정 시각)마다 한 번만 계산해 캐시하므로, 화면에서 기간을 바꿔도
+다운로드나 재계산 없이 컬럼만 고릅니다. 행렬은 price_store가 증분으로 갱신합니다.
+"""
+import numpy as np
+import pandas as pd
+
+import price_store
+from cache import shared_cache
+from tracing import traced
+
+# 기간 라벨 -> (시작일 오프셋, 맵 색 범위 ±%). 시작일은 마지막 거래일 - 오프셋 당일 또는 그 이전 마지막 거래일,
+# 오프셋이 None이면 전년 마지막 거래일(YTD)입니다.
+HORIZONS = {
+    '1D': (pd.DateOffset(days=1), 3),
+    '1W': (pd.DateOffset(weeks=1), 6),
+    '1M': (pd.DateOffset(months=1), 10),
+    '3M': (pd.DateOffset(months=3), 20),
+    'YTD': (None, 30),
+    '1Y': (pd.DateOffset(years=1), 40),
+}
+
+
+def base_positions(index, horizons=HORIZONS):
+    """기간별 시작 거래일의 행 위치 {label: position}. 이력이 모자라면 -1."""
+    end = index[-1]
+    positions = {}
+    for label, (offset, _) in horizons.items():
+        target = pd.Timestamp(year=end.year - 1, month=12, day=31) if offset is None else end - offset
+        positions[label] = int(index.searchsorted(target, side='right')) - 1
+    return positions
+
+
+@traced()
+def horizon_returns(close, volume=None, horizons=HORIZONS):
+    """
+    종가(+거래량) 행렬 -> (종목별 표, {label: 시작일}).
+    표 컬럼: Price, Volume, TradedValue(마지막 종가 × 거래량), 기간 라벨마다 수익률(%).
+    시작일에 아직 상장 전이던 종목은 해당 기간이 NaN입니다.
+    """
+    filled = close.ffill().to_numpy(dtype='float64')
+    positions = base_positions(close.index, horizons)
+    labels = list(positions)
+    rows = np.array([max(positions[label], 0) for label in labels])
+    last = filled[-1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = (last / filled[rows] - 1) * 100
+    returns[[positions[label] < 0 for label in labels]] = np.nan
+
+    table = pd.DataFrame(returns.T, index=close.columns, columns=labels)
+    table.insert(0, 'Price', last)
+    last_volume = volume.reindex(columns=close.columns).iloc[-1].to_numpy(dtype='float64') if volume is not None else np.nan
+    table.insert(1, 'Volume', last_volume)
+    table.insert(2, 'TradedValue', last * last_volume)
+    dates = {label: close.index[positions[label]] if positions[label] >= 0 else None for label in labels}
+    return table, dates
+
+
+@shared_cache(max_bytes=32 * 1024 * 1024)
+def _performance(version_key):
+    close, volume = price_store.load_matrices()
+    return horizon_returns(close, volume)
+
+
+def load_performance(symbols):
+    """
+    symbols의 기간별 수익률 표와 기간 시작일. 행렬에 없는 종목은 백그라운드에서 받기 시작하고
+    (price_store.ensure_updated), 다 받을 때까지는 (None, None)을 돌려줍니다. 행렬이 없어도 (None, None).
+    """
+    symbols = [str(s).replace('.', '-') for s in symbols]
+    close, _ = price_store.ensure_updated(symbols)
+    key = price_store.version()
+    if close is None or close.empty or key is None or price_store.pending(symbols):
+        return None, None
+    table, dates = _performance(key)
+    return table.reindex(symbols).dropna(subset=['Price']), dates
@@ -0,0 +1,289 @@
+"""
+유니버스 일봉 가격 행렬 저장소 (날짜 × 종목, float32 Parquet).
+
+퍼포먼스 맵/상관관계/리스크 계산은 모두 지수 구성 종목 전체의 일간 종가가 필요합니다.
+종목별 history를 따로 받는 대신 yf.download로 한 번에 받아 BENJAMIN_DATA_DIR/prices/에
+close.parquet, volume.parquet 두 행렬로 저장하고, 이후에는 마지막 날짜 며칠 전부터만 받아 이어 붙입니다.
+
+- 처음 보는 종목은 HISTORY_PERIOD만큼 전체 이력을 받습니다.
+- 겹치는 구간의 수정 종가가 달라졌으면(배당/분할 재조정) 그 종목만 전체 이력을 다시 받습니다.
+- 화면에서는 load_matrices()로 읽기만 하며, 파일이 바뀌지 않는 한 메모리 캐시를 씁니다.
+  수집은 ensure_updated()가 백그라운드 스레드로 시작하므로 화면은 기다리지 않습니다.
+
+    python price_store.py update sp500
+    python price_store.py summary
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import replay
+import store
+from cache import shared_cache
+from tracing import traced
+
+PRICE_DIR = 'prices'
+FIELDS = ('Close', 'Volume')
+HISTORY_PERIOD = '2y'
+# 증분 수집 시 마지막 저장 날짜보다 이만큼 앞에서부터 다시 받아 겹치는 구간을 비교합니다.
+OVERLAP_DAYS = 7
+# 겹치는 구간의 종가가 이 비율 이상 다르면 재조정된 것으로 보고 전체 이력을 다시 받습니다.
+ADJUSTMENT_TOLERANCE = 1e-3
+BATCH_SIZE = 100
+DEFAULT_MAX_AGE_MINUTES = 60
+# 수집이 실패해 행렬 파일이 없을 때 다시 시도하는 간격
+RETRY_MINUTES = 10
+# 베타 등 기준 수익률 계산용으로 항상 함께 저장하는 종목
+BENCHMARK_SYMBOLS = ('^GSPC',)
+
+_update_lock = threading.Lock()
+_start_lock = threading.Lock()
+_background = None
+_last_attempt = 0.0
+# 이 프로세스에서 이미 요청한 종목 (받지 못한 종목 때문에 매번 수집하지 않도록)
+_attempted = set()
+
+
+def _path(field):
+    return store.data_path(os.path.join(PRICE_DIR, f'{field.lower()}.parquet'))
+
+
+def _download(symbols, **kwargs):
+    """yf.download 결과 -> {field: 날짜 × 종목 DataFrame}. 받지 못한 종목은 컬럼이 없습니다."""
+    frames = {field: [] for field in FIELDS}
+    for start in range(0, len(symbols), BATCH_SIZE):
+        batch = symbols[start:start + BATCH_SIZE]
+        data = replay.download(batch, interval='1d', group_by='ticker', auto_adjust=True,
+                               progress=False, threads=True, **kwargs)
+        if data is None or data.empty:
+            continue
+        for field in FIELDS:
+            if isinstance(data.columns, pd.MultiIndex):
+                frame = data.xs(field, axis=1, level=1)
+            else:
+                frame = data[[field]].set_axis(batch[:1], axis=1)
+            frames[field].append(frame.dropna(axis=1, how='all'))
+
+    result = {}
+    for field, parts in frames.items():
+        frame = pd.concat(parts, axis=1) if parts else pd.DataFrame()
+        if not frame.empty:
+            index = frame.index
+            if getattr(index, 'tz', None) is not None:
+                index = index.tz_localize(None)
+            frame.index = index.normalize()
+            frame = frame[~frame.index.duplicated(keep='last')]
+        frame.columns = frame.columns.astype(str)
+        result[field] = frame.astype('float32')
+    return result
+
+
+def _merge(old, new):
+    """new 값을 우선으로 두 행렬을 합칩니다 (날짜/종목 합집합)."""
+    if old is None or old.empty:
+        return new
+    if new.empty:
+        return old
+    return new.combine_first(old).astype('float32')
+
+
+def _adjusted_symbols(old_close, new_close):
+    """
+    겹치는 날짜의 종가가 달라진(배당/분할로 재조정된) 종목.
+    마지막 저장 날짜는 장중에 받은 미완성 봉일 수 있으므로 비교에서 뺍니다.
+    """
+    common_dates = old_close.index[old_close.index < old_close.index.max()].intersection(new_close.index)
+    common_symbols = old_close.columns.intersection(new_close.columns)
+    if common_dates.empty or common_symbols.empty:
+        return []
+    old = old_close.loc[common_dates, common_symbols].to_numpy(dtype='float64')
+    new = new_close.loc[common_dates, common_symbols].to_numpy(dtype='float64')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        diff = np.abs(new / old - 1)
+    changed = np.nanmax(np.where(np.isnan(diff), 0, diff), axis=0) > ADJUSTMENT_TOLERANCE
+    return list(common_symbols[changed])
+
+
+def _read(field):
+    path = _path(field)
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+
+def _write(field, frame):
+    path = _path(field)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    frame.sort_index().sort_index(axis=1).to_parquet(tmp)
+    os.replace(tmp, path)
+
+
+@traced()
+def update(symbols):
+    """
+    symbols의 일봉 행렬을 갱신합니다 (새 종목은 전체 이력, 기존 종목은 증분). BENCHMARK_SYMBOLS는 항상 포함합니다.
+    반환: {'new', 'incremental', 'readjusted', 'missing', 'rows', 'symbols', 'seconds'}
+    """
+    start = time.perf_counter()
+    symbols = list(dict.fromkeys([str(s).replace('.', '-') for s in symbols] + list(BENCHMARK_SYMBOLS)))
+    stored = {field: _read(field) for field in FIELDS}
+    close = stored['Close']
+    known = set(close.columns) if close is not None else set()
+    new_symbols = [s for s in symbols if s not in known]
+    existing = [s for s in symbols if s in known]
+
+    merged = dict(stored)
+    readjusted = []
+    if existing:
+        since = (close.index.max() - pd.Timedelta(days=OVERLAP_DAYS)).strftime('%Y-%m-%d')
+        recent = _download(existing, start=since)
+        readjusted = _adjusted_symbols(close, recent['Close'])
+        for field in FIELDS:
+            merged[field] = _merge(merged[field], recent[field].drop(columns=readjusted, errors='ignore'))
+    full_symbols = new_symbols + readjusted
+    if full_symbols:
+        full = _download(full_symbols, period=HISTORY_PERIOD)
+        for field in FIELDS:
+            base = merged[field]
+            if base is not None and readjusted:
+                base = base.drop(columns=[s for s in readjusted if s in full[field].columns])
+            merged[field] = _merge(base, full[field])
+
+    for field in FIELDS:
+        if merged[field] is not None and not merged[field].empty:
+            _write(field, merged[field])
+
+    final = merged['Close'] if merged['Close'] is not None else pd.DataFrame()
+    return {
+        'new': len(new_symbols),
+        'incremental': len(existing) - len(readjusted),
+        'readjusted': len(readjusted),
+        'missing': [s for s in symbols if s not in final.columns],
+        'rows': len(final),
+        'symbols': final.shape[1],
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def update_index(index='sp500'):
+    """지수 구성 종목으로 행렬을 갱신합니다 (index: sp500/dow/nasdaq/all)."""
+    from data import load_index_symbols
+    return update(load_index_symbols(index))
+
+
+def version():
+    """저장된 행렬의 버전 키 (종가 파일 수정 시각). 없으면 None."""
+    path = _path('Close')
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+@shared_cache(max_bytes=256 * 1024 * 1024)
+def _load(version_key):
+    return tuple(_read(field) for field in FIELDS)
+
+
+def load_matrices():
+    """(종가, 거래량) 날짜 × 종목 float32 행렬. 저장소가 없으면 (None, None)."""
+    key = version()
+    if key is None:
+        return None, None
+    return _load(key)
+
+
+def _update_quietly(symbols):
+    with _update_lock:
+        try:
+            update(symbols)
+        except Exception:
+            pass
+        finally:
+            _attempted.update(symbols)
+
+
+def _start_background(symbols):
+    """증분 갱신 스레드를 시작합니다 (이미 돌고 있으면 아무것도 하지 않음)."""
+    global _background, _last_attempt
+    with _start_lock:
+        if is_updating():
+            return
+        _last_attempt = time.time()
+        _background = threading.Thread(target=_update_quietly, args=(symbols,), name='price-update', daemon=True)
+        _background.start()
+
+
+def is_updating():
+    """백그라운드 갱신이 진행 중인지."""
+    return _update_lock.locked() or (_background is not None and _background.is_alive())
+
+
+def pending(symbols):
+    """행렬에 없고 이 프로세스에서 아직 받아 보지 않은 종목 (받는 중이거나 받을 예정)."""
+    close, _ = load_matrices()
+    known = set(close.columns) if close is not None else set()
+    return [s for s in (str(s).replace('.', '-') for s in symbols) if s not in known and s not in _attempted]
+
+
+def ensure_updated(symbols, max_age_minutes=DEFAULT_MAX_AGE_MINUTES):
+    """
+    화면을 기다리게 하지 않고 현재 행렬을 돌려줍니다. 필요한 갱신은 모두 백그라운드 스레드에서 합니다.
+    - 행렬에 없는 종목이 있으면 받기 시작합니다 (처음에는 전체 이력이라 몇 분 걸릴 수 있음, 그동안은 pending()에 남음).
+    - 행렬 파일이 없으면(이전 수집 실패) RETRY_MINUTES마다 다시 시도합니다.
+    - 마지막 갱신이 max_age_minutes보다 오래됐으면 증분 갱신합니다.
+    한 번 요청했는데도 받지 못한 종목(상장폐지 등)은 다시 받지 않습니다. 행렬이 없으면 (None, None).
+    """
+    symbols = [str(s).replace('.', '-') for s in symbols]
+    key = version()
+    if pending(symbols):
+        _start_background(symbols)
+    elif key is None:
+        if (time.time() - _last_attempt) / 60 > RETRY_MINUTES:
+            _start_background(symbols)
+    elif (time.time() - key) / 60 > max_age_minutes:
+        _start_background(symbols)
+    return load_matrices()
+
+
+def store_summary():
+    """저장소 요약 {'symbols', 'rows', 'first_date', 'last_date', 'bytes'}. 없으면 None."""
+    close, _ = load_matrices()
+    if close is None:
+        return None
+    return {
+        'symbols': close.shape[1],
+        'rows': close.shape[0],
+        'first_date': close.index.min(),
+        'last_date': close.index.max(),
+        'bytes': sum(os.path.getsize(_path(field)) for field in FIELDS if os.path.exists(_path(field))),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='유니버스 일봉 가격 행렬 저장소')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_update = sub.add_parser('update', help='지수 구성 종목 일봉 갱신 (처음에는 전체 이력)')
+    p_update.add_argument('index', nargs='?', default='sp500', choices=('sp500', 'dow', 'nasdaq', 'all'))
+    sub.add_parser('summary', help='저장소 요약')
+    args = parser.parse_args(argv)
+
+    if args.command == 'update':
+        stats = update_index(args.index)
+        print(f"{stats['new']} new, {stats['incremental']} incremental, {stats['readjusted']} readjusted, "
+              f"{len(stats['missing'])} missing -> {stats['rows']} days x {stats['symbols']} symbols "
+              f"in {stats['seconds']:.1f}s")
+        return 0
+
+    summary = store_summary()
+    if summary is None:
+        print('no price matrix (run: python price_store.py update)')
+        return 1
+    print(f"{summary['symbols']} symbols x {summary['rows']} days, "
+          f"{summary['first_date']:%Y-%m-%d} ~ {summary['last_date']:%Y-%m-%d}, {summary['bytes'] / 1e6:.1f}MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+성능 진단 도구.
+
+콜드 스타트 시 모듈별 import 시간 측정:
+    python profiling.py imports            # 앱이 시작할 때 불러오는 모듈 기준 (app.py의 최상위 import)
+    python profiling.py imports textblob   # 특정 모듈만
+
+스크립트 실행(rerun) 프로파일링:
+    앱 주소에 ?profile=1 을 붙이거나 PROFILE_RERUNS=1 환경 변수로 실행하면 해당 rerun 전체가
+    cProfile로 기록됩니다. 상위 함수는 페이지 하단 expander에 표시되고 PROFILE_DIR(기본 profiles/)에
+    .prof 파일로 저장됩니다.
+    python profiling.py stats profiles/xxx.prof   # 저장된 결과 다시 보기 (snakeviz 등으로도 열림)
+"""
+import ast
+import cProfile
+import os
+import pstats
+import re
+import subprocess
+import sys
+import time
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+
+def startup_modules(app_path=APP_PATH):
+    """
+    app.py가 시작할 때 불러오는 모듈 (최상위 import 문, 순서대로). 페이지 안에서 늦게 불러오는 모듈은 빠집니다.
+    `from views import header`처럼 패키지에서 모듈을 가져오면 'views.header'로 기록합니다.
+    """
+    root = os.path.dirname(app_path)
+    with open(app_path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), app_path)
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            package_dir = os.path.join(root, *node.module.split('.'))
+            submodules = [f'{node.module}.{alias.name}' for alias in node.names
+                          if os.path.exists(os.path.join(package_dir, f'{alias.name}.py'))]
+            modules += submodules or [node.module]
+    return list(dict.fromkeys(modules))
+
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def profile_imports(modules=None, cwd=None):
+    """
+    새 인터프리터에서 `python -X importtime`으로 modules를 차례로 import 하여
+    모듈별 import 시간을 측정합니다. 앞 모듈이 이미 불러온 의존성은 다시 계산되지 않으므로
+    실제 앱의 콜드 스타트 순서와 같은 결과가 나옵니다.
+
+    반환: [{'module', 'self_ms', 'cumulative_ms', 'depth'}] (import된 순서)
+    """
+    modules = modules or startup_modules()
+    code = '; '.join(f'import {m}' for m in modules)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, cwd=cwd or os.path.dirname(APP_PATH))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else 'import failed')
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            self_us, cum_us, indent, name = m.groups()
+            rows.append({
+                'module': name,
+                'self_ms': int(self_us) / 1000,
+                'cumulative_ms': int(cum_us) / 1000,
+                'depth': len(indent) // 2,
+            })
+    return rows
+
+
+def print_import_report(rows, top=25):
+    """
+    최상위(depth 0) 모듈별 누적 시간과, 자체 시간이 가장 큰 모듈 top개를 출력합니다.
+    """
+    top_level = [r for r in rows if r['depth'] == 0]
+    total = sum(r['cumulative_ms'] for r in top_level)
+
+    print(f"{'module':<40} {'cumulative':>12}")
+    for r in sorted(top_level, key=lambda r: r['cumulative_ms'], reverse=True)[:top]:
+        print(f"{r['module']:<40} {r['cumulative_ms']:>10.1f}ms")
+    print(f"{'TOTAL':<40} {total:>10.1f}ms")
+
+    print(f"\n{'slowest modules (self time)':<40} {'self':>12}")
+    for r in sorted(rows, key=lambda r: r['self_ms'], reverse=True)[:top]:
+        print(f"{r['module']:<40} {r['self_ms']:>10.1f}ms")
+
+
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+
+
+def start_rerun_profile():
+    """
+    현재 스레드의 실행을 cProfile로 기록하기 시작합니다.
+    다른 세션이 이미 프로파일 중이면(인터프리터당 하나만 가능) None을 반환합니다.
+    """
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None
+    return profiler
+
+
+def top_functions(stats, sort='cumulative', limit=30):
+    """
+    pstats.Stats에서 상위 limit개 함수를 반환합니다.
+    반환: [{'function', 'ncalls', 'tottime_ms', 'cumtime_ms'}]
+    """
+    rows = []
+    for (filename, lineno, funcname), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({
+            'function': f'{funcname} ({os.path.basename(filename)}:{lineno})',
+            'ncalls': nc,
+            'tottime_ms': tt * 1000,
+            'cumtime_ms': ct * 1000,
+        })
+    key = 'cumtime_ms' if sort == 'cumulative' else 'tottime_ms'
+    rows.sort(key=lambda r: r[key], reverse=True)
+    return rows[:limit]
+
+
+def finish_rerun_profile(profiler, label='rerun'):
+    """
+    프로파일을 멈추고 PROFILE_DIR/<시각>_<label>.prof 로 저장합니다.
+    반환: (저장 경로 또는 None, 상위 함수 목록)
+    """
+    profiler.disable()
+    stats = pstats.Stats(profiler)
+
+    path = None
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        safe_label = re.sub(r'[^A-Za-z0-9_.-]', '_', label or 'rerun')
+        path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}_{safe_label}.prof")
+        stats.dump_stats(path)
+    except OSError:
+        path = None
+    return path, top_functions(stats)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 2 and sys.argv[1] == 'imports':
+        print_import_report(profile_imports(sys.argv[2:] or None))
+    elif len(sys.argv) == 3 and sys.argv[1] == 'stats':
+        pstats.Stats(sys.argv[2]).sort_stats('cumulative').print_stats(30)
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,141 @@
+"""
+재무비율 이력 (재무제표에서 기간별로 계산).
+
+핵심 지표 대시보드는 ticker.info의 현재 시점 비율(trailingPE, returnOnEquity, grossMargins ...)만 보여줍니다.
+여기서는 재무제표의 모든 보고 기간에 대해 ROE, ROA, 마진, FCF 마진, 부채비율, 유동비율을 계산합니다.
+입력은 warehouse.py와 같은 long format (symbol, statement, frequency, line_item, period_end, value)이라
+한 종목(load_stock_data)이든 저장소 전체(warehouse)든 같은 코드로 (종목, 기간) 단위로 한 번에 계산합니다.
+"""
+import numpy as np
+import pandas as pd
+
+from cache import shared_cache
+from data import load_stock_data, RATIO_HISTORY_CACHE_BYTES, UNIVERSE_RATIOS_CACHE_BYTES
+from statements import STATEMENT_POSITIONS
+from tracing import traced
+import warehouse
+
+# 비율 이름 -> (분자, 분모, 분기 데이터일 때 연환산 여부)
+RATIO_DEFINITIONS = {
+    'roe': ('net_income', 'equity', True),
+    'roa': ('net_income', 'total_assets', True),
+    'gross_margin': ('gross_profit', 'revenue', False),
+    'operating_margin': ('operating_income', 'revenue', False),
+    'net_margin': ('net_income', 'revenue', False),
+    'fcf_margin': ('free_cash_flow', 'revenue', False),
+    'debt_to_equity': ('total_debt', 'equity', False),
+    'current_ratio': ('current_assets', 'current_liabilities', False),
+}
+
+RATIO_LABELS = {
+    'roe': 'ROE',
+    'roa': 'ROA',
+    'gross_margin': '매출총이익률',
+    'operating_margin': '영업이익률',
+    'net_margin': '순이익률',
+    'fcf_margin': 'FCF 마진',
+    'debt_to_equity': '부채비율 (Debt/Equity)',
+    'current_ratio': '유동비율',
+}
+
+# 계산에 쓰는 값 -> 재무제표 항목 (앞에서부터 있는 값을 사용)
+_ITEMS = {
+    'revenue': ('Total Revenue', 'Operating Revenue'),
+    'gross_profit': ('Gross Profit',),
+    'operating_income': ('Operating Income',),
+    'net_income': ('Net Income', 'Net Income Common Stockholders', 'Net Income From Continuing Operations'),
+    'equity': ('Stockholders Equity', 'Common Stock Equity', 'Total Equity Gross Minority Interest'),
+    'total_assets': ('Total Assets',),
+    'total_debt': ('Total Debt',),
+    'current_assets': ('Current Assets',),
+    'current_liabilities': ('Current Liabilities',),
+    'free_cash_flow': ('Free Cash Flow',),
+    'operating_cash_flow': ('Operating Cash Flow',),
+    'capital_expenditure': ('Capital Expenditure',),
+}
+
+# 분모가 0 이하이면 비율이 의미가 없는 값
+_POSITIVE_DENOMINATORS = {'revenue', 'equity', 'total_assets', 'current_liabilities'}
+
+
+@traced()
+def compute_ratios(long_df, frequency='annual'):
+    """
+    long format 재무제표에서 (symbol, period_end)별 비율을 계산합니다.
+    long_df는 한 가지 frequency의 행만 포함해야 합니다. 분기 데이터의 ROE/ROA는 4를 곱해 연환산합니다.
+
+    반환: index=(symbol, period_end), columns=RATIO_DEFINITIONS 순서. 계산할 수 없는 칸은 NaN
+    """
+    if long_df is None or long_df.empty:
+        return pd.DataFrame(columns=list(RATIO_DEFINITIONS),
+                            index=pd.MultiIndex.from_arrays([[], []], names=['symbol', 'period_end']))
+
+    needed = {name for names in _ITEMS.values() for name in names}
+    rows = long_df[long_df['line_item'].isin(needed)]
+    # (종목, 기간) × 항목 표 하나로 펼친 뒤 모든 비율을 컬럼 연산으로 계산
+    wide = (rows.drop_duplicates(['symbol', 'period_end', 'line_item'])
+            .set_index(['symbol', 'period_end', 'line_item'])['value']
+            .unstack('line_item'))
+    wide.columns = wide.columns.astype(str)
+    wide.index = wide.index.set_levels(wide.index.levels[0].astype(str), level=0)
+
+    values = {}
+    for key, names in _ITEMS.items():
+        series = pd.Series(np.nan, index=wide.index)
+        for name in reversed(names):
+            if name in wide.columns:
+                series = wide[name].combine_first(series)
+        values[key] = series
+    values['free_cash_flow'] = values['free_cash_flow'].combine_first(
+        values['operating_cash_flow'] + values['capital_expenditure'])  # CapEx는 음수로 보고됨
+
+    out = {}
+    for ratio, (numerator, denominator, annualize) in RATIO_DEFINITIONS.items():
+        den = values[denominator]
+        if denominator in _POSITIVE_DENOMINATORS:
+            den = den.where(den > 0)
+        ratio_values = values[numerator] / den
+        if annualize and frequency == 'quarterly':
+            ratio_values = ratio_values * 4
+        out[ratio] = ratio_values
+    result = pd.DataFrame(out).replace([np.inf, -np.inf], np.nan)
+    return result.sort_index()
+
+
+# 조회 실패로 빈 결과가 나오면 캐시하지 않습니다 (다음 rerun에서 다시 시도).
+@shared_cache(ttl=3600, max_bytes=RATIO_HISTORY_CACHE_BYTES, cache_if=lambda r: not r.empty)
+def load_ratio_history(symbol, quarterly=False):
+    """
+    한 종목의 기간별 비율 (index=period_end 오름차순). load_stock_data 캐시를 그대로 사용합니다.
+    데이터가 없으면 빈 DataFrame.
+    """
+    result = load_stock_data(symbol)
+    frequency = 'quarterly' if quarterly else 'annual'
+    frames = {(statement, frequency): result[STATEMENT_POSITIONS[(statement, quarterly)]]
+              for statement in ('income', 'balance', 'cashflow')}
+    ratios = compute_ratios(warehouse.to_long(symbol, frames), frequency)
+    if ratios.empty:
+        return ratios.reset_index(level='symbol', drop=True)
+    return ratios.loc[symbol]
+
+
+@shared_cache(max_bytes=UNIVERSE_RATIOS_CACHE_BYTES)
+def _universe_ratios(version_key, frequency):
+    return compute_ratios(warehouse.select(frequency=frequency), frequency)
+
+
+def universe_ratios(frequency='annual'):
+    """
+    fundamentals 저장소 전체 종목의 기간별 비율 (index=(symbol, period_end)).
+    저장소가 바뀌지 않는 한 메모리 캐시를 씁니다.
+    """
+    return _universe_ratios(warehouse.version(), frequency)
+
+
+def latest_ratios(frequency='annual'):
+    """종목별 가장 최근 기간의 비율 (index=symbol, period_end 컬럼 포함). 스크리닝용."""
+    ratios = universe_ratios(frequency)
+    if ratios.empty:
+        return pd.DataFrame(columns=['period_end'] + list(RATIO_DEFINITIONS))
+    latest = ratios.reset_index().groupby('symbol', sort=True).tail(1)
+    return latest.set_index('symbol')
@@ -0,0 +1,303 @@
+"""
+네트워크 응답 녹화/재생 (record/replay).
+
+data.py의 모든 외부 호출(yf.Ticker, yf.download, Wikipedia/CNN requests.get)은 이 모듈을 거칩니다.
+BENJAMIN_REPLAY 환경 변수로 동작을 정합니다.
+- (없음)   : 그대로 네트워크 호출 (기본값, 추가 비용 없음)
+- record  : 네트워크 호출 결과를 BENJAMIN_REPLAY_DIR(기본 fixtures/)에 저장
+- replay  : 네트워크 없이 저장된 결과만 사용. 없는 응답은 ReplayMissError
+
+재생 시 부하 테스트/벤치마크용으로 지연과 오류를 주입할 수 있습니다.
+- BENJAMIN_REPLAY_LATENCY_MS : 호출마다 추가할 지연 (ms)
+- BENJAMIN_REPLAY_ERROR_RATE : 호출이 ReplayInjectedError로 실패할 확률 (0.0 ~ 1.0)
+- BENJAMIN_REPLAY_SEED       : 오류 주입 난수 시드 (재현 가능한 실행용)
+
+픽스처는 호출 하나당 gzip pickle 파일 하나입니다. 직접 녹화한 파일만 사용하세요
+(pickle은 신뢰할 수 없는 파일을 열면 안 됩니다).
+
+    python replay.py record AAPL MSFT   # 랜딩 페이지 + 지정 종목 분석 화면에 필요한 응답 녹화
+    python replay.py record AAPL --index sp500   # + 스크리너/재무제표 저장소 일괄 수집 응답
+    python replay.py ls                 # 저장된 픽스처 목록
+"""
+import gzip
+import hashlib
+import os
+import pickle
+import random
+import re
+import sys
+import threading
+import time
+
+import requests
+import yfinance as yf
+
+_config = {
+    'mode': os.environ.get('BENJAMIN_REPLAY', '').lower(),
+    'dir': os.environ.get('BENJAMIN_REPLAY_DIR', 'fixtures'),
+    'latency_ms': float(os.environ.get('BENJAMIN_REPLAY_LATENCY_MS', '0') or 0),
+    'error_rate': float(os.environ.get('BENJAMIN_REPLAY_ERROR_RATE', '0') or 0),
+}
+_rng = random.Random(os.environ.get('BENJAMIN_REPLAY_SEED'))
+_rng_lock = threading.Lock()
+
+
+class ReplayMissError(LookupError):
+    """replay 모드에서 녹화되지 않은 요청을 받았을 때."""
+
+
+class ReplayInjectedError(ConnectionError):
+    """BENJAMIN_REPLAY_ERROR_RATE로 주입된 가짜 네트워크 오류."""
+
+
+def configure(mode=None, fixture_dir=None, latency_ms=None, error_rate=None, seed=None):
+    """
+    환경 변수 대신 코드에서 설정을 바꿉니다 (벤치마크/부하 테스트용).
+    None인 항목은 그대로 둡니다.
+    """
+    if mode is not None:
+        _config['mode'] = mode
+    if fixture_dir is not None:
+        _config['dir'] = fixture_dir
+    if latency_ms is not None:
+        _config['latency_ms'] = float(latency_ms)
+    if error_rate is not None:
+        _config['error_rate'] = float(error_rate)
+    if seed is not None:
+        with _rng_lock:
+            _rng.seed(seed)
+
+
+def mode():
+    return _config['mode']
+
+
+def settings():
+    """현재 설정(mode/dir/latency_ms/error_rate)의 복사본."""
+    return dict(_config)
+
+
+# -------------------------------------------------------------
+# 픽스처 저장소
+# -------------------------------------------------------------
+def _fixture_path(kind, label, key):
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+    slug = re.sub(r'[^A-Za-z0-9_.-]', '_', str(label))[:40]
+    return os.path.join(_config['dir'], kind, f'{slug}_{digest}.pkl.gz')
+
+
+def _save(kind, label, key, value):
+    path = _fixture_path(kind, label, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with gzip.open(tmp, 'wb', compresslevel=6) as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _load(kind, label, key):
+    _inject_faults()
+    path = _fixture_path(kind, label, key)
+    try:
+        with gzip.open(path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        raise ReplayMissError(f'no fixture for {kind} {key!r} ({path})') from None
+
+
+def _inject_faults():
+    if _config['latency_ms'] > 0:
+        time.sleep(_config['latency_ms'] / 1000)
+    if _config['error_rate'] > 0:
+        with _rng_lock:
+            fail = _rng.random() < _config['error_rate']
+        if fail:
+            raise ReplayInjectedError('injected upstream failure')
+
+
+# -------------------------------------------------------------
+# HTTP (Wikipedia, CNN)
+# -------------------------------------------------------------
+class ReplayResponse:
+    """녹화된 HTTP 응답. data.py가 쓰는 requests.Response의 일부만 흉내 냅니다."""
+
+    def __init__(self, url, status_code, content, headers, encoding):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.encoding = encoding or 'utf-8'
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        import json
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} for url: {self.url}', response=self)
+
+
+def http_get(url, **kwargs):
+    """requests.get 대체. 헤더/타임아웃은 녹화 키에 포함하지 않습니다 (URL만 사용)."""
+    key = ('GET', url)
+    label = url.split('//')[-1].split('/')[0]
+    if _config['mode'] == 'replay':
+        return ReplayResponse(**_load('http', label, key))
+
+    response = requests.get(url, **kwargs)
+    if _config['mode'] == 'record':
+        _save('http', label, key, {
+            'url': url,
+            'status_code': response.status_code,
+            'content': response.content,
+            'headers': dict(response.headers),
+            'encoding': response.encoding,
+        })
+    return response
+
+
+# -------------------------------------------------------------
+# yfinance
+# -------------------------------------------------------------
+def _call_key(name, args, kwargs):
+    return (name, tuple(args), tuple(sorted(kwargs.items())))
+
+
+def download(tickers, **kwargs):
+    """yf.download 대체."""
+    tickers_key = tuple(tickers) if isinstance(tickers, (list, tuple)) else tickers
+    key = _call_key('download', (tickers_key,), kwargs)
+    label = f'{len(tickers_key)}_tickers' if isinstance(tickers_key, tuple) else tickers_key
+    if _config['mode'] == 'replay':
+        return _load('download', label, key)
+
+    data = yf.download(tickers, **kwargs)
+    if _config['mode'] == 'record':
+        _save('download', label, key, data)
+    return data
+
+
+def _is_method(name):
+    # yf.Ticker의 info/financials 등은 property, history 등은 메서드입니다.
+    return callable(getattr(yf.Ticker, name, None))
+
+
+class _RecordingTicker:
+    def __init__(self, symbol):
+        self._symbol = symbol
+        self._ticker = yf.Ticker(symbol)
+
+    def __getattr__(self, name):
+        if _is_method(name):
+            method = getattr(self._ticker, name)
+
+            def call(*args, **kwargs):
+                result = method(*args, **kwargs)
+                _save('ticker', self._symbol, (self._symbol, _call_key(name, args, kwargs)), result)
+                return result
+            return call
+
+        value = getattr(self._ticker, name)
+        _save('ticker', self._symbol, (self._symbol, name), value)
+        return value
+
+
+class _ReplayTicker:
+    def __init__(self, symbol):
+        self._symbol = symbol
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if _is_method(name):
+            def call(*args, **kwargs):
+                return _load('ticker', self._symbol, (self._symbol, _call_key(name, args, kwargs)))
+            return call
+        return _load('ticker', self._symbol, (self._symbol, name))
+
+
+def ticker(symbol):
+    """yf.Ticker 대체. 기본 모드에서는 yf.Ticker를 그대로 반환합니다."""
+    if _config['mode'] == 'replay':
+        return _ReplayTicker(symbol)
+    if _config['mode'] == 'record':
+        return _RecordingTicker(symbol)
+    return yf.Ticker(symbol)
+
+
+# -------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------
+def record_app_fixtures(symbols, index=None):
+    """
+    랜딩 페이지와 symbols 각각의 분석 화면이 호출하는 로더를 record 모드로 한 번씩 실행합니다.
+    리스크 섹션의 기준 지수(^GSPC) 일봉도 함께 녹화합니다. 재무비율 이력(ratios)과 섹터 지도는
+    이미 녹화하는 load_stock_data / 지수 구성 표만 쓰므로 따로 녹화할 것이 없습니다.
+
+    index(sp500/dow/nasdaq/all)를 주면 그 구성 종목 전체의 ticker.info(스크리너 스냅샷 갱신, SCREENER_INDEX와
+    같게)와 재무제표 6종(warehouse.py refresh)도 녹화합니다. 종목 수만큼 요청하므로 기본값은 녹화하지 않음입니다.
+
+    녹화하지 않는 것: price_store의 yf.download. 요청 키(배치 구성, start 날짜)가 저장된 행렬의 상태에 따라 달라져
+    재생할 수 없습니다. 재생 모드에서는 백그라운드 갱신이 ReplayMissError로 조용히 실패하고, 퍼포먼스 맵은 1D 등락률
+    (load_market_data)로, 리스크 순위/상관관계 클러스터는 BENJAMIN_DATA_DIR에 이미 있는 행렬(prices/)로만 표시합니다.
+    """
+    configure(mode='record')
+    import data
+    import risk
+    import store
+
+    for loader in (data.load_dow_tickers, data.load_nasdaq_tickers, data.load_sp500_tickers):
+        df, _ = loader()
+        if df is not None and 'Symbol' in df.columns:
+            # views/market_map.py와 같은 Yahoo 심볼 변환 (BRK.B -> BRK-B)
+            data.load_market_data([str(t).replace('.', '-') for t in df['Symbol'].tolist()])
+    data.load_indices_data()
+    data.fetch_fear_and_greed_index()
+    data.get_all_tickers_dict()
+    data.load_market_ticker_data()
+    data.load_price_history(risk.BENCHMARK)
+
+    for symbol in symbols:
+        data.probe_symbol(symbol)
+        data.load_price_history(symbol)
+        data.load_stock_data(symbol)
+        data.load_insider_trading(symbol)
+        data.load_ownership_data(symbol)
+
+    if index is not None:
+        universe = data.load_index_symbols(index)
+        for fetch in (data.fetch_info, data.fetch_financial_statements):
+            for _ in store.fetch_all(fetch, universe):
+                pass
+
+
+def list_fixtures():
+    rows = []
+    for root, _, files in os.walk(_config['dir']):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            rows.append((os.path.relpath(path, _config['dir']), os.path.getsize(path)))
+    return rows
+
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 2 and sys.argv[1] == 'record':
+        args = sys.argv[2:]
+        index = None
+        if '--index' in args:
+            at = args.index('--index')
+            index = args[at + 1] if at + 1 < len(args) else 'sp500'
+            del args[at:at + 2]
+        record_app_fixtures([s.upper() for s in args], index=index)
+    elif len(sys.argv) == 2 and sys.argv[1] == 'ls':
+        rows = list_fixtures()
+        for name, size in rows:
+            print(f'{name:<70} {size / 1024:>8.1f}KB')
+        print(f'{len(rows)} fixtures, {sum(s for _, s in rows) / 1024 / 1024:.1f}MB')
+    else:
+        print(__doc__)
+        sys.exit(1)
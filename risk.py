@@ -0,0 +1,163 @@
+"""
+리스크 지표를 직접 계산 (베타, 변동성, 최대 낙폭, 하방 편차).
+
+핵심 지표의 Beta는 Yahoo info['beta'] 값이라 계산 기간/기준이 보이지 않습니다.
+여기서는 종가 행렬(날짜 × 종목) 하나에서 모든 종목의 지표를 한 번의 행렬 연산으로 계산합니다.
+
+- 베타/상관계수: S&P 500(^GSPC) 일간 수익률 대비, 최근 WINDOW 거래일 (두 값이 모두 있는 날만 사용)
+- 변동성: 일간 수익률 표준편차 × √252 (1년, 3개월)
+- 하방 편차: 0보다 작은 수익률만의 제곱 평균 제곱근 × √252
+- 최대 낙폭 / 현재 낙폭: 최근 WINDOW 거래일 고점 대비
+
+종목 화면은 종목별 일봉 캐시(load_price_history)로, 지수 전체 정렬은 price_store 행렬로 계산합니다.
+price_store는 매일 증분으로 갱신되고, 전체 표는 행렬이 바뀔 때만 다시 계산해 메모리에 캐시합니다.
+
+    python risk.py top --by volatility
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+import price_store
+from cache import shared_cache
+from compare import beta_correlation, window_sums
+from tracing import traced
+
+BENCHMARK = '^GSPC'
+TRADING_DAYS = 252
+WINDOW = 252
+SHORT_WINDOW = 63
+# 이보다 관측치가 적으면 지표를 계산하지 않습니다.
+MIN_OBSERVATIONS = 60
+
+RISK_LABELS = {
+    'beta': 'Beta (1Y)',
+    'correlation': 'Corr. S&P 500',
+    'volatility': 'Volatility 1Y %',
+    'volatility_3m': 'Volatility 3M %',
+    'downside_deviation': 'Downside Dev. %',
+    'max_drawdown': 'Max Drawdown 1Y %',
+    'current_drawdown': 'From 1Y High %',
+    'return_1y': 'Return 1Y %',
+}
+
+
+def _returns(values):
+    """종가 배열 (T × n) -> 일간 수익률 배열 (T-1 × n). 상장 전/결측은 NaN."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return values[1:] / values[:-1] - 1
+
+
+@traced()
+def compute_risk(close, benchmark=BENCHMARK, window=WINDOW):
+    """
+    종가 행렬 -> 종목별 리스크 표 (index=symbol, columns=RISK_LABELS 순서, %는 % 단위).
+    benchmark 컬럼이 없으면 베타/상관계수는 NaN. 관측치가 MIN_OBSERVATIONS보다 적은 종목은 전부 NaN.
+    """
+    columns = [c for c in close.columns if c != benchmark]
+    prices = close[columns].iloc[-(window + 1):].to_numpy(dtype='float64')
+    returns = _returns(prices)
+    if benchmark in close.columns:
+        bench = _returns(close[benchmark].iloc[-(window + 1):].to_numpy(dtype='float64'))
+        beta, correlation, _ = beta_correlation(returns, bench)
+    else:
+        beta = correlation = np.full(len(columns), np.nan)
+
+    observations = (~np.isnan(returns)).sum(axis=0)
+    short = returns[-SHORT_WINDOW:]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        volatility = np.nanstd(returns, axis=0, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+        volatility_3m = np.nanstd(short, axis=0, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+        downside = np.sqrt(np.nanmean(np.minimum(returns, 0) ** 2, axis=0)) * np.sqrt(TRADING_DAYS) * 100
+
+        peaks = np.fmax.accumulate(prices, axis=0)
+        drawdowns = prices / peaks - 1
+        max_drawdown = np.nanmin(drawdowns, axis=0) * 100
+        filled = pd.DataFrame(prices).ffill().to_numpy()
+        first = pd.DataFrame(prices).bfill().to_numpy()[0]
+        current_drawdown = (filled[-1] / np.nanmax(prices, axis=0) - 1) * 100
+        return_1y = (filled[-1] / first - 1) * 100
+
+    table = pd.DataFrame({
+        'beta': beta,
+        'correlation': correlation,
+        'volatility': volatility,
+        'volatility_3m': volatility_3m,
+        'downside_deviation': downside,
+        'max_drawdown': max_drawdown,
+        'current_drawdown': current_drawdown,
+        'return_1y': return_1y,
+    }, index=pd.Index(columns, name='symbol'))
+    table.loc[observations < MIN_OBSERVATIONS] = np.nan
+    return table
+
+
+def rolling_beta(close, symbol, benchmark=BENCHMARK, window=SHORT_WINDOW):
+    """한 종목의 이동 베타 Series (window 거래일, 구간 안에 결측이 있으면 NaN)."""
+    x = _returns(close[symbol].to_numpy(dtype='float64'))
+    y = _returns(close[benchmark].to_numpy(dtype='float64'))
+    index = close.index[1:]
+    if len(x) < window:
+        return pd.Series(np.nan, index=index)
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+    n = window_sums(valid.astype('float64'), window)
+    sx, sy, sxy, syy = (window_sums(v, window) for v in (x, y, x * y, y * y))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        beta = (n * sxy - sx * sy) / (n * syy - sy * sy)
+    beta[n < window] = np.nan
+    return pd.Series(beta, index=index)
+
+
+@shared_cache(max_bytes=32 * 1024 * 1024)
+def _universe_risk(version_key):
+    close, _ = price_store.load_matrices()
+    return compute_risk(close)
+
+
+def universe_risk():
+    """
+    price_store 행렬 전체 종목의 리스크 표 (행렬이 바뀔 때만 다시 계산). 행렬이 없으면 None.
+    """
+    key = price_store.version()
+    if key is None:
+        return None
+    return _universe_risk(key)
+
+
+def percentile_in_universe(metric, value):
+    """지수 전체 리스크 표에서 value의 백분위 (0~100). 표가 없거나 값이 없으면 None."""
+    table = universe_risk()
+    if table is None or value is None or np.isnan(value):
+        return None
+    values = np.sort(table[metric].dropna().to_numpy())
+    if len(values) == 0:
+        return None
+    low = np.searchsorted(values, value, side='left')
+    high = np.searchsorted(values, value, side='right')
+    return (low + high) / 2 / len(values) * 100
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='리스크 지표 (price_store 행렬 기준)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_top = sub.add_parser('top', help='지표 기준 상위 종목')
+    p_top.add_argument('--by', default='volatility', choices=list(RISK_LABELS))
+    p_top.add_argument('--ascending', action='store_true')
+    p_top.add_argument('--limit', type=int, default=25)
+    args = parser.parse_args(argv)
+
+    table = universe_risk()
+    if table is None:
+        print('no price matrix (run: python price_store.py update)')
+        return 1
+    ranked = table.sort_values(args.by, ascending=args.ascending, na_position='last').head(args.limit)
+    with pd.option_context('display.width', 200, 'display.float_format', '{:.2f}'.format):
+        print(ranked.rename(columns=RISK_LABELS))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
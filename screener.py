@@ -0,0 +1,494 @@
+"""
+Finviz 스타일 종목 스크리너.
+
+핵심 지표 대시보드가 한 종목의 ticker.info에서 보여주는 필드(P/E, Forward P/E, PEG, P/S, P/B, ROE, 마진,
+내부자/기관 보유, 베타 ...)를 유니버스 전체에 대해 컬럼형 스냅샷(BENJAMIN_DATA_DIR/screener.parquet,
+float32 + category)으로 저장해 두고, 필터 식을 벡터 마스크로 컴파일해 바로 걸러냅니다.
+
+    pe < 20 and roe > 15% and sector == 'Information Technology'
+    market_cap > 10B, dividend_yield >= 2%, beta < 1
+    sector in ['Energy', 'Utilities'] and fwd_pe < pe
+
+- 조건은 'and' 또는 ','로 연결합니다. 연산자: < <= > >= == != in
+- 값: 숫자, 백분율(15% = 0.15), 단위(10B, 500M), 따옴표 문자열, 리스트, 또는 다른 필드 이름
+- 자주 쓰는 컬럼(INDEXED_FIELDS)은 정렬 인덱스를 미리 만들어 범위 조건과 정렬에 사용합니다.
+
+    python screener.py refresh sp500
+    python screener.py run "pe < 15 and roe > 20%" --sort market_cap
+
+앱에서는 SCREENER_REFRESH_HOURS 환경 변수가 있으면 백그라운드 스레드가 스냅샷을 주기적으로 갱신합니다.
+"""
+import argparse
+import ast
+import functools
+import os
+import re
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import store
+from cache import shared_cache
+from tracing import traced
+
+SNAPSHOT_FILE = 'screener.parquet'
+DEFAULT_MAX_WORKERS = 8
+
+# 필드 이름 -> (info 키 후보, 화면 라벨, 종류)  종류: num / pct(비율, 0.15 = 15%) / cat
+FIELDS = {
+    'name': (('shortName', 'longName'), 'Company', 'str'),
+    'sector': (('sector',), 'Sector', 'cat'),  # GICS 섹터 (gics_sector)
+    'industry': (('industry',), 'Industry', 'cat'),
+    'market_cap': (('marketCap',), 'Market Cap', 'num'),
+    'price': (('currentPrice', 'regularMarketPrice', 'previousClose'), 'Price', 'num'),
+    'pe': (('trailingPE',), 'P/E', 'num'),
+    'fwd_pe': (('forwardPE',), 'Forward P/E', 'num'),
+    'peg': (('pegRatio', 'trailingPegRatio'), 'PEG', 'num'),
+    'ps': (('priceToSalesTrailing12Months',), 'P/S', 'num'),
+    'pb': (('priceToBook',), 'P/B', 'num'),
+    'roe': (('returnOnEquity',), 'ROE', 'pct'),
+    'roa': (('returnOnAssets',), 'ROA', 'pct'),
+    'gross_margin': (('grossMargins',), 'Gross Margin', 'pct'),
+    'op_margin': (('operatingMargins',), 'Oper. Margin', 'pct'),
+    'profit_margin': (('profitMargins',), 'Profit Margin', 'pct'),
+    'dividend_yield': (('dividendYield',), 'Dividend', 'pct'),
+    'payout': (('payoutRatio',), 'Payout', 'pct'),
+    'debt_eq': (('debtToEquity',), 'Debt/Eq', 'num'),
+    'current_ratio': (('currentRatio',), 'Current Ratio', 'num'),
+    'insider_own': (('heldPercentInsiders',), 'Insider Own', 'pct'),
+    'inst_own': (('heldPercentInstitutions',), 'Inst Own', 'pct'),
+    'beta': (('beta',), 'Beta', 'num'),
+    'recom': (('recommendationMean',), 'Recom', 'num'),
+}
+NUMERIC_FIELDS = [name for name, (_, _, kind) in FIELDS.items() if kind in ('num', 'pct')]
+
+# 정렬 인덱스를 미리 만들어 두는 컬럼 (범위 조건/정렬에 자주 쓰이는 것)
+INDEXED_FIELDS = ('market_cap', 'pe', 'fwd_pe', 'peg', 'ps', 'pb', 'roe', 'dividend_yield', 'beta')
+
+# yfinance(requirements의 1.x)는 dividendYield를 % 값으로 줍니다 (0.52 = 0.52%). 다른 pct 필드처럼 비율로 맞추기 위해 항상 100으로 나눕니다.
+_PERCENT_POINT_FIELDS = {'dividend_yield'}
+
+_UNITS = {'%': 0.01, 'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+_CLAUSE = re.compile(r'^\s*([A-Za-z_]+)\s*(<=|>=|==|!=|<|>|=|\bin\b)\s*(.+?)\s*$', re.IGNORECASE)
+_NUMBER = re.compile(r'^([-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?)\s*([%KMBT]?)$', re.IGNORECASE)
+
+
+# -------------------------------------------------------------
+# 스냅샷 수집
+# -------------------------------------------------------------
+def _info_value(info, keys):
+    for key in keys:
+        value = info.get(key)
+        if value is not None and value != 'Infinity':
+            return value
+    return None
+
+
+# Yahoo info['sector'] 이름 -> GICS 섹터 이름 (나머지 5개는 이름이 같음).
+# 지수 구성 표(data.load_sector_map)에 없는 종목에만 쓰는 근사입니다.
+YAHOO_TO_GICS = {
+    'Technology': 'Information Technology',
+    'Healthcare': 'Health Care',
+    'Financial Services': 'Financials',
+    'Consumer Cyclical': 'Consumer Discretionary',
+    'Consumer Defensive': 'Consumer Staples',
+    'Basic Materials': 'Materials',
+}
+
+
+def gics_sector(symbol, info, sector_map=None):
+    """GICS 섹터 이름. 지수 구성 표의 'GICS Sector'가 우선이고, 없으면 Yahoo 섹터를 GICS 이름으로 바꿉니다."""
+    sector = (sector_map or {}).get(str(symbol).replace('.', '-'))
+    if sector:
+        return sector
+    sector = (info or {}).get('sector')
+    return YAHOO_TO_GICS.get(sector, sector) if sector else None
+
+
+def to_snapshot_rows(infos, sector_map=None):
+    """
+    {symbol: info dict} -> 스냅샷 DataFrame (index=symbol, 숫자는 float32, 섹터/산업은 category).
+    sector_map: 심볼 -> GICS 섹터 (data.load_sector_map). 섹터는 항상 GICS 이름으로 저장합니다.
+    """
+    records = {name: [] for name in FIELDS}
+    symbols = []
+    for symbol, info in infos.items():
+        info = info or {}
+        symbols.append(symbol)
+        for name, (keys, _, _) in FIELDS.items():
+            if name == 'sector':
+                records[name].append(gics_sector(symbol, info, sector_map))
+            else:
+                records[name].append(_info_value(info, keys))
+
+    df = pd.DataFrame(records, index=pd.Index(symbols, name='symbol'))
+    for name in NUMERIC_FIELDS:
+        df[name] = pd.to_numeric(df[name], errors='coerce')
+    for name in _PERCENT_POINT_FIELDS:
+        df[name] = df[name] / 100
+    return compact(df)
+
+
+def info_values(info):
+    """info 하나의 숫자 필드 {field: float (없으면 NaN)}. to_snapshot_rows와 같은 정규화 (한 종목 조회용)."""
+    values = {}
+    for name in NUMERIC_FIELDS:
+        try:
+            value = float(_info_value(info or {}, FIELDS[name][0]))
+        except (TypeError, ValueError):
+            value = np.nan
+        if name in _PERCENT_POINT_FIELDS:
+            value /= 100
+        values[name] = value
+    return values
+
+
+def compact(df):
+    """숫자 컬럼 float32, 문자열 컬럼 category (이름 제외)."""
+    df = df.copy()
+    for name, (_, _, kind) in FIELDS.items():
+        if name not in df.columns:
+            continue
+        if kind in ('num', 'pct'):
+            df[name] = df[name].astype('float32')
+        elif kind == 'cat':
+            df[name] = df[name].astype('category')
+        else:
+            df[name] = df[name].astype(object)
+    return df
+
+
+def _snapshot_path():
+    return store.data_path(SNAPSHOT_FILE)
+
+
+def snapshot_age_hours():
+    """스냅샷을 마지막으로 저장한 뒤 지난 시간. 스냅샷이 없으면 None."""
+    if not store.exists(SNAPSHOT_FILE):
+        return None
+    return (time.time() - os.path.getmtime(_snapshot_path())) / 3600
+
+
+def refresh_snapshot(symbols, max_workers=DEFAULT_MAX_WORKERS, progress=None):
+    """
+    symbols의 ticker.info를 동시에 max_workers개씩 받아 스냅샷을 새로 씁니다.
+    받지 못한 종목은 이전 스냅샷의 행을 그대로 둡니다.
+
+    반환: {'requested', 'fetched', 'failed', 'rows', 'seconds', 'errors': {symbol: message}}
+    """
+    from data import fetch_info, load_sector_map  # streamlit import는 실제 수집할 때만
+
+    start = time.perf_counter()
+    symbols = list(dict.fromkeys(symbols))
+    infos = {}
+    stats = {'requested': len(symbols), 'fetched': 0, 'failed': 0, 'errors': {}}
+    for done, (symbol, info, error) in enumerate(store.fetch_all(fetch_info, symbols, max_workers), 1):
+        if progress:
+            progress(done, len(symbols), symbol)
+        if error is not None or not info:
+            stats['failed'] += 1
+            stats['errors'][symbol] = f'{type(error).__name__}: {error}' if error else 'empty info'
+            continue
+        infos[symbol] = info
+        stats['fetched'] += 1
+
+    try:
+        sector_map = load_sector_map()
+    except Exception:
+        sector_map = {}
+    fresh = to_snapshot_rows(infos, sector_map)
+    previous = load_snapshot()
+    if previous is not None:
+        kept = previous.df.loc[previous.df.index.difference(fresh.index)]
+        fresh = compact(pd.concat([fresh.astype(object), kept.astype(object)]))
+
+    path = _snapshot_path()
+    tmp = f'{path}.{os.getpid()}.tmp'
+    fresh.to_parquet(tmp)
+    os.replace(tmp, path)
+
+    # 핵심 지표의 섹터 내 백분위 표도 같은 스냅샷으로 다시 만듭니다 (sector_stats가 이 모듈을 import)
+    import sector_stats
+    sector_stats.rebuild(Snapshot(fresh))
+
+    stats['rows'] = len(fresh)
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def refresh_index(index='sp500', **kwargs):
+    """지수 구성 종목 전체로 스냅샷을 갱신합니다 (index: sp500/dow/nasdaq/all)."""
+    from data import load_index_symbols
+    return refresh_snapshot(load_index_symbols(index), **kwargs)
+
+
+# 백그라운드 갱신 상태 (디버그 화면용)
+_refresh_lock = threading.Lock()
+_refresh_thread = None
+refresh_status = {'running': False, 'last_started': None, 'last_finished': None, 'last_stats': None, 'last_error': None}
+
+
+def _refresh_loop(index, hours, poll_seconds):
+    while True:
+        age = snapshot_age_hours()
+        if age is None or age >= hours:
+            refresh_status.update(running=True, last_started=time.time())
+            try:
+                stats = refresh_index(index)
+                refresh_status.update(last_stats={k: v for k, v in stats.items() if k != 'errors'}, last_error=None)
+            except Exception as e:
+                refresh_status['last_error'] = f'{type(e).__name__}: {e}'
+            finally:
+                refresh_status.update(running=False, last_finished=time.time())
+        time.sleep(poll_seconds)
+
+
+def start_background_refresh(hours=None, index=None, poll_seconds=600):
+    """
+    스냅샷이 hours보다 오래되면 다시 수집하는 데몬 스레드를 띄웁니다 (프로세스당 한 번).
+    hours가 없으면 SCREENER_REFRESH_HOURS 환경 변수를 쓰고, 둘 다 없으면 아무것도 하지 않습니다.
+    index 기본값은 SCREENER_INDEX 환경 변수 또는 'sp500'.
+    """
+    global _refresh_thread
+    hours = hours or os.environ.get('SCREENER_REFRESH_HOURS')
+    if not hours:
+        return None
+    index = index or os.environ.get('SCREENER_INDEX', 'sp500')
+    with _refresh_lock:
+        if _refresh_thread is None:
+            _refresh_thread = threading.Thread(target=_refresh_loop, args=(index, float(hours), poll_seconds),
+                                               name='screener-refresh', daemon=True)
+            _refresh_thread.start()
+    return _refresh_thread
+
+
+# -------------------------------------------------------------
+# 메모리 스냅샷 + 정렬 인덱스
+# -------------------------------------------------------------
+class Snapshot:
+    """
+    스냅샷 DataFrame과 컬럼 배열, INDEXED_FIELDS의 정렬 인덱스.
+    sorted_index[name] = (order, sorted_values, valid): 값 오름차순 행 위치, 정렬된 값, NaN이 아닌 개수
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.symbols = df.index.to_numpy()
+        self.arrays = {name: df[name].to_numpy() for name in NUMERIC_FIELDS if name in df.columns}
+        self.sorted_index = {}
+        for name in INDEXED_FIELDS:
+            values = self.arrays.get(name)
+            if values is None:
+                continue
+            order = np.argsort(values, kind='stable')  # NaN은 맨 뒤
+            self.sorted_index[name] = (order, values[order], int(np.count_nonzero(~np.isnan(values))))
+
+    def __len__(self):
+        return len(self.df)
+
+    def range_positions(self, name, low=-np.inf, high=np.inf, low_inclusive=True, high_inclusive=True):
+        """정렬 인덱스로 low~high 범위에 있는 행 위치."""
+        order, sorted_values, valid = self.sorted_index[name]
+        values = sorted_values[:valid]
+        start = np.searchsorted(values, low, side='left' if low_inclusive else 'right')
+        end = np.searchsorted(values, high, side='right' if high_inclusive else 'left')
+        return order[start:end]
+
+    def order_by(self, name, descending=False):
+        """name 기준 정렬 순서의 행 위치 (NaN은 항상 맨 뒤)."""
+        if name in self.sorted_index:
+            order, _, valid = self.sorted_index[name]
+        else:
+            values = self.df[name]
+            order = np.argsort(values.to_numpy(), kind='stable') if name in self.arrays else \
+                np.argsort(values.astype(str).to_numpy(), kind='stable')
+            valid = int(values.notna().sum())
+        return np.concatenate([order[:valid][::-1], order[valid:]]) if descending else order
+
+
+@shared_cache(max_bytes=64 * 1024 * 1024)
+def _load_snapshot(mtime):
+    df = pd.read_parquet(_snapshot_path())
+    return Snapshot(compact(df))
+
+
+def load_snapshot():
+    """저장된 스냅샷 (파일이 바뀌지 않는 한 메모리 캐시). 없으면 None."""
+    if not store.exists(SNAPSHOT_FILE):
+        return None
+    return _load_snapshot(os.path.getmtime(_snapshot_path()))
+
+
+# -------------------------------------------------------------
+# 필터 식 컴파일
+# -------------------------------------------------------------
+def _parse_value(text):
+    text = text.strip()
+    if text.lower() in FIELDS:
+        return ('field', text.lower())
+    match = _NUMBER.match(text)
+    if match:
+        return ('value', float(match.group(1)) * _UNITS.get(match.group(2).upper(), 1.0))
+    try:
+        return ('value', ast.literal_eval(text))
+    except (ValueError, SyntaxError):
+        return ('value', text)  # 따옴표 없는 문자열 (sector == Energy)
+
+
+def _split_clauses(expression):
+    """'and'/','로 조건을 나눕니다. 리스트/따옴표 안의 쉼표는 나누지 않습니다."""
+    parts, depth, quote, start = [], 0, None, 0
+    for match in re.finditer(r"[\[\](),'\"]|\s+and\s+", expression, flags=re.IGNORECASE):
+        token = match.group(0)
+        if quote:
+            quote = None if token == quote else quote
+        elif token in ('"', "'"):
+            quote = token
+        elif token in '[(':
+            depth += 1
+        elif token in '])':
+            depth -= 1
+        elif depth == 0:
+            parts.append(expression[start:match.start()])
+            start = match.end()
+    parts.append(expression[start:])
+    return [part for part in parts if part.strip()]
+
+
+@functools.lru_cache(maxsize=256)
+def compile_filter(expression):
+    """
+    필터 식을 (field, op, (kind, value)) 조건 튜플로 파싱합니다. 같은 식은 다시 파싱하지 않습니다.
+    잘못된 식이면 ValueError.
+    """
+    clauses = []
+    for part in _split_clauses(expression):
+        match = _CLAUSE.match(part)
+        if not match:
+            raise ValueError(f"조건을 해석할 수 없습니다: '{part.strip()}'")
+        field, op, raw = match.group(1).lower(), match.group(2).lower(), match.group(3)
+        if field not in FIELDS:
+            raise ValueError(f"알 수 없는 필드: '{field}' (사용 가능: {', '.join(FIELDS)})")
+        op = '==' if op == '=' else op
+        operand = _parse_value(raw)
+        kind = FIELDS[field][2]
+        if op == 'in':
+            if operand[0] != 'value' or not isinstance(operand[1], (list, tuple, set)):
+                raise ValueError(f"'in' 뒤에는 리스트가 와야 합니다: '{part.strip()}'")
+            operand = ('value', tuple(operand[1]))
+        elif kind in ('num', 'pct'):
+            if operand[0] == 'field' and FIELDS[operand[1]][2] not in ('num', 'pct'):
+                raise ValueError(f"숫자 필드와 비교할 수 없습니다: '{part.strip()}'")
+            if operand[0] == 'value' and not isinstance(operand[1], (int, float)):
+                raise ValueError(f"숫자가 필요합니다: '{part.strip()}'")
+        elif op not in ('==', '!='):
+            raise ValueError(f"'{field}'에는 ==, !=, in만 쓸 수 있습니다")
+        clauses.append((field, op, operand))
+    return tuple(clauses)
+
+
+_RANGE_OPS = {
+    '<': lambda v: dict(high=v, high_inclusive=False),
+    '<=': lambda v: dict(high=v),
+    '>': lambda v: dict(low=v, low_inclusive=False),
+    '>=': lambda v: dict(low=v),
+    '==': lambda v: dict(low=v, high=v),
+}
+_COMPARE = {
+    '<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal,
+    '==': np.equal, '!=': np.not_equal,
+}
+
+
+def _clause_mask(snapshot, field, op, operand):
+    kind, value = operand
+    n = len(snapshot)
+    if FIELDS[field][2] in ('num', 'pct'):
+        if kind == 'value' and op in _RANGE_OPS and field in snapshot.sorted_index:
+            # 정렬 인덱스로 범위 검색 (float32 컬럼과 같은 정밀도로 비교)
+            mask = np.zeros(n, dtype=bool)
+            mask[snapshot.range_positions(field, **_RANGE_OPS[op](np.float32(value)))] = True
+            return mask
+        left = snapshot.arrays[field]
+        right = snapshot.arrays[value] if kind == 'field' else np.float32(value)
+        if op == 'in':
+            return np.isin(left, np.asarray(value, dtype='float32'))
+        with np.errstate(invalid='ignore'):
+            return _COMPARE[op](left, right) & ~np.isnan(left)
+
+    if kind == 'field':
+        left = snapshot.df[field].astype(object).str.lower().to_numpy()
+        right = snapshot.df[value].astype(object).str.lower().to_numpy()
+        equal = (left == right) & pd.notnull(left)
+        return equal if op == '==' else ~equal
+    # 카테고리 목록에서 맞는 코드만 찾고 행은 정수 코드로 비교 (대소문자 무시)
+    targets = {str(v).lower() for v in (value if op == 'in' else (value,))}
+    column = snapshot.df[field]
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype('category')
+    matching = [code for code, category in enumerate(column.cat.categories) if str(category).lower() in targets]
+    equal = np.isin(column.cat.codes.to_numpy(), matching)
+    return equal if op != '!=' else ~equal
+
+
+@traced()
+def screen(expression='', sort_by='market_cap', descending=True, limit=None, snapshot=None):
+    """
+    필터 식으로 스냅샷을 걸러 sort_by 순으로 정렬한 DataFrame (index=symbol).
+    스냅샷이 없으면 빈 DataFrame. 잘못된 식이면 ValueError.
+    """
+    snapshot = snapshot if snapshot is not None else load_snapshot()
+    clauses = compile_filter(expression or '')
+    if snapshot is None:
+        return pd.DataFrame(columns=list(FIELDS))
+
+    mask = np.ones(len(snapshot), dtype=bool)
+    for field, op, operand in clauses:
+        mask &= _clause_mask(snapshot, field, op, operand)
+
+    # 정렬 인덱스 순서에서 통과한 행만 고름 (정렬을 다시 하지 않음)
+    order = snapshot.order_by(sort_by, descending) if sort_by else np.arange(len(snapshot))
+    positions = order[mask[order]]
+    if limit:
+        positions = positions[:limit]
+    return snapshot.df.iloc[positions]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Finviz 스타일 종목 스크리너')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_refresh = sub.add_parser('refresh', help='유니버스 스냅샷 갱신')
+    p_refresh.add_argument('index', nargs='?', default='sp500', choices=('sp500', 'dow', 'nasdaq', 'all'))
+    p_refresh.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS)
+
+    p_run = sub.add_parser('run', help='필터 식 실행')
+    p_run.add_argument('expression', nargs='?', default='')
+    p_run.add_argument('--sort', default='market_cap')
+    p_run.add_argument('--ascending', action='store_true')
+    p_run.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.command == 'refresh':
+        def progress(done, total, symbol):
+            print(f'\r{done}/{total} {symbol:<8}', end='', flush=True)
+
+        stats = refresh_index(args.index, max_workers=args.workers, progress=progress)
+        print(f"\n{stats['fetched']} fetched, {stats['failed']} failed, {stats['rows']} rows in {stats['seconds']:.1f}s")
+        return 0
+
+    load_snapshot()  # 디스크 읽기는 질의 시간에서 제외
+    start = time.perf_counter()
+    result = screen(args.expression, args.sort, not args.ascending, args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    with pd.option_context('display.width', 200, 'display.max_columns', 12):
+        print(result if not result.empty else 'no results')
+    print(f'{len(result)} rows in {elapsed:.2f}ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+섹터별 지표 분위수 표 (핵심 지표 대시보드의 섹터 내 백분위용).
+
+스크리너 스냅샷(screener.py)의 숫자 필드마다 섹터별 0~100 분위수(101개)를 미리 계산해
+BENJAMIN_DATA_DIR/sector_stats.parquet에 저장합니다. 스냅샷을 갱신할 때(CLI, 백그라운드 스레드) 같이 다시 만들고,
+화면에서는 이 표만 읽어 값 하나를 searchsorted로 찾습니다 (O(log n), 동종 종목 info를 따로 받지 않음).
+
+섹터는 스냅샷의 sector 컬럼(GICS 11개 섹터)을 그대로 씁니다. 스냅샷은 지수 구성 표의 GICS Sector를 우선하고,
+표에 없는 종목은 Yahoo 섹터(Technology, Healthcare ...)를 GICS 이름으로 바꿔 저장합니다 (screener.gics_sector).
+
+    python sector_stats.py build
+    python sector_stats.py rank AAPL
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import screener
+import store
+from cache import shared_cache
+
+STATS_FILE = 'sector_stats.parquet'
+QUANTILES = np.linspace(0, 1, 101)
+QUANTILE_COLUMNS = [f'q{i}' for i in range(len(QUANTILES))]
+# 섹터 내 종목이 이보다 적으면 백분위를 표시하지 않습니다.
+MIN_PEERS = 5
+# 백분위를 계산하지 않는 필드 (순위가 의미 없는 값)
+EXCLUDED_FIELDS = {'price'}
+METRICS = [name for name in screener.NUMERIC_FIELDS if name not in EXCLUDED_FIELDS]
+
+
+def build_stats(snapshot_df):
+    """
+    스냅샷 DataFrame -> 섹터별 분위수 표.
+    반환 컬럼: sector, metric, count, q0 ... q100 (float32). NaN 값은 제외하고 계산합니다.
+    """
+    df = snapshot_df[snapshot_df['sector'].notna()]
+    frames = []
+    for metric in METRICS:
+        grouped = df.groupby('sector', observed=True)[metric]
+        counts = grouped.count()
+        counts = counts[counts > 0]
+        if counts.empty:
+            continue
+        quantiles = grouped.quantile(QUANTILES).unstack()  # NaN은 quantile에서 제외됨
+        quantiles = quantiles.loc[counts.index]
+        quantiles.columns = QUANTILE_COLUMNS
+        frame = quantiles.astype('float32')
+        frame.insert(0, 'count', counts.astype('int32'))
+        frame.insert(0, 'metric', metric)
+        frames.append(frame.reset_index())
+    if not frames:
+        return pd.DataFrame(columns=['sector', 'metric', 'count'] + QUANTILE_COLUMNS)
+    stats = pd.concat(frames, ignore_index=True)
+    stats['sector'] = stats['sector'].astype(str)
+    return stats
+
+
+def rebuild(snapshot=None):
+    """스냅샷에서 분위수 표를 다시 만들어 저장합니다. 스냅샷이 없으면 None, 있으면 (섹터 수, 행 수)."""
+    snapshot = snapshot if snapshot is not None else screener.load_snapshot()
+    if snapshot is None:
+        return None
+    stats = build_stats(snapshot.df)
+    path = store.data_path(STATS_FILE)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    stats.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return stats['sector'].nunique(), len(stats)
+
+
+@shared_cache(max_bytes=16 * 1024 * 1024)
+def _load_table(mtime):
+    stats = pd.read_parquet(store.data_path(STATS_FILE))
+    # (섹터, 지표) -> (종목 수, 분위수 배열)
+    quantiles = stats[QUANTILE_COLUMNS].to_numpy(dtype='float32')
+    return {
+        (sector, metric): (int(count), quantiles[i])
+        for i, (sector, metric, count) in enumerate(zip(stats['sector'], stats['metric'], stats['count']))
+    }
+
+
+def load_table():
+    """저장된 분위수 표 {(sector, metric): (count, quantiles)}. 파일이 없으면 빈 dict."""
+    if not store.exists(STATS_FILE):
+        return {}
+    return _load_table(os.path.getmtime(store.data_path(STATS_FILE)))
+
+
+def percentile(quantiles, value):
+    """분위수 배열에서 value의 백분위(0~100). 같은 값이 여러 분위에 걸치면 가운데를 씁니다."""
+    low = np.searchsorted(quantiles, value, side='left')
+    high = np.searchsorted(quantiles, value, side='right')
+    return float(np.clip((low + high) / 2 - 0.5, 0, len(quantiles) - 1)) * 100 / (len(quantiles) - 1)
+
+
+def _sector_of(symbol, info):
+    snapshot = screener.load_snapshot()
+    if snapshot is not None and symbol in snapshot.df.index:
+        sector = snapshot.df.at[symbol, 'sector']
+        if pd.notnull(sector):
+            return str(sector)
+    try:
+        from data import load_sector_map
+        sector_map = load_sector_map()
+    except Exception:
+        sector_map = {}
+    return screener.gics_sector(symbol, info, sector_map)
+
+
+def percentile_ranks(symbol, info):
+    """
+    한 종목의 지표별 섹터 내 백분위 {metric: (백분위, 섹터 종목 수)}와 섹터 이름.
+    값은 info에서 읽어 스냅샷과 같은 방식으로 정규화합니다. 표가 없거나 섹터를 모르면 ({}, None).
+    """
+    table = load_table()
+    if not table or not info:
+        return {}, None
+    sector = _sector_of(symbol, info)
+    if not sector:
+        return {}, None
+
+    values = screener.info_values(info)
+    ranks = {}
+    for metric in METRICS:
+        entry = table.get((sector, metric))
+        value = values[metric]
+        if entry is None or entry[0] < MIN_PEERS or np.isnan(value):
+            continue
+        ranks[metric] = (percentile(entry[1], np.float32(value)), entry[0])
+    return ranks, sector
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='섹터별 지표 분위수 표')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build', help='스크리너 스냅샷에서 분위수 표 다시 만들기')
+    p_rank = sub.add_parser('rank', help='스냅샷에 있는 종목의 섹터 내 백분위')
+    p_rank.add_argument('symbol')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        result = rebuild()
+        if result is None:
+            print('no screener snapshot (run: python screener.py refresh)')
+            return 1
+        print(f'{result[0]} sectors, {result[1]} rows')
+        return 0
+
+    snapshot = screener.load_snapshot()
+    symbol = args.symbol.upper()
+    if snapshot is None or symbol not in snapshot.df.index:
+        print(f'{symbol} not in screener snapshot')
+        return 1
+    row = snapshot.df.loc[symbol]
+    info = {keys[0]: (None if pd.isna(row[name]) else row[name]) for name, (keys, _, _) in screener.FIELDS.items()}
+    ranks, sector = percentile_ranks(symbol, info)
+    print(f'{symbol} ({sector})')
+    for metric, (pct, count) in ranks.items():
+        print(f'  {screener.FIELDS[metric][1]:<15} {row[metric]:>12.4g}  P{pct:.0f} of {count}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
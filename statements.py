@@ -0,0 +1,216 @@
+"""
+재무제표 표 화면용 데이터 (번역/증감률/서식).
+
+display_styled_financials가 매 rerun마다 하던 일(항목 번역, 중복 제거, 증감률 계산, 셀별 서식과 색상)을
+build_statement_view에서 배열 연산으로 한 번에 만들고, load_statement_view가 (종목, 재무제표, 연간/분기)별로
+캐시합니다. 화면에서는 미리 만든 문자열 표와 CSS 표를 그대로 Styler에 넘기기만 합니다.
+"""
+import numpy as np
+import pandas as pd
+
+from cache import shared_cache
+from data import load_stock_data, STATEMENT_VIEW_CACHE_BYTES
+from tracing import traced
+from utils import format_currency_array
+
+# 재무제표 항목 한글 번역 매핑
+FINANCIAL_TERM_MAPPING = {
+    # 대차대조표 (Balance Sheet)
+    "Total Assets": "총자산",
+    "Total Liabilities Net Minority Interest": "총부채",
+    "Total Equity Gross Minority Interest": "총자본",
+    "Total Capitalization": "총자본화",
+    "Common Stock Equity": "보통주 자본",
+    "Net Tangible Assets": "순유형자산",
+    "Working Capital": "운전자본",
+    "Invested Capital": "투자자본",
+    "Tangible Book Value": "유형장부가치",
+    "Total Debt": "총부채",
+    "Net Debt": "순부채",
+    "Share Issued": "발행주식수",
+    "Ordinary Shares Number": "보통주 수",
+    "Treasury Shares Number": "자사주 수",
+
+    # 자산 세부
+    "Cash And Cash Equivalents": "현금 및 현금성자산",
+    "Other Short Term Investments": "기타 단기투자자산",
+    "Inventory": "재고자산",
+    "Accounts Receivable": "매출채권",
+    "Current Assets": "유동자산",
+    "Net PPE": "유형자산(순액)",
+    "Goodwill": "영업권",
+    "Intangible Assets": "무형자산",
+    "Goodwill And Other Intangible Assets": "영업권 및 기타무형자산",
+    "Non Current Assets": "비유동자산",
+    "Prepaid Assets": "선급금",
+
+    # 부채 세부
+    "Accounts Payable": "매입채무",
+    "Current Debt": "단기차입금",
+    "Current Liabilities": "유동부채",
+    "Long Term Debt": "장기차입금",
+    "Long Term Debt And Capital Lease Obligation": "장기차입금 및 리스부채",
+    "Non Current Liabilities": "비유동부채",
+    "Current Deferred Revenue": "유동 이연수익",
+    "Deferred Revenue": "이연수익",
+
+    # 현금흐름표 (Cash Flow)
+    "Operating Cash Flow": "영업활동 현금흐름",
+    "Investing Cash Flow": "투자활동 현금흐름",
+    "Financing Cash Flow": "재무활동 현금흐름",
+    "End Cash Position": "기말 현금잔액",
+    "Income Tax Paid Supplemental Data": "납부 법인세",
+    "Interest Paid Supplemental Data": "지급 이자",
+    "Capital Expenditure": "자본적 지출(CAPEX)",
+    "Issuance Of Capital Stock": "주식 발행",
+    "Issuance Of Debt": "차입금 조달",
+    "Repayment Of Debt": "차입금 상환",
+    "Repurchase Of Capital Stock": "자사주 매입",
+    "Free Cash Flow": "잉여현금흐름(FCF)",
+    "Changes In Cash": "현금 변동액",
+    "Effect Of Exchange Rate Changes": "환율 변동 효과",
+    "Beginning Cash Position": "기초 현금잔액",
+    "Net Income From Continuing Operations": "계속영업 당기순이익",
+    "Depreciation And Amortization": "감가상각비",
+    "Change In Working Capital": "운전자본 변동",
+    "Stock Based Compensation": "주식보상비용",
+
+    # 손익계산서 (Income Statement)
+    "Total Revenue": "매출액",
+    "Cost Of Revenue": "매출원가",
+    "Gross Profit": "매출총이익",
+    "Operating Expense": "영업비용",
+    "Operating Income": "영업이익",
+    "Net Income": "당기순이익",
+    "EBIT": "EBIT",
+    "EBITDA": "EBITDA",
+    "Interest Expense": "이자비용",
+    "Tax Provision": "법인세비용",
+    "Diluted EPS": "희석 EPS",
+    "Basic EPS": "기본 EPS",
+    "Research And Development": "연구개발비(R&D)",
+    "Selling General And Administration": "판관비(SG&A)",
+
+    # 기타 자주 나오는 항목들
+    "Minority Interest": "소수지분",
+    "Other Non Current Assets": "기타 비유동자산",
+    "Other Current Assets": "기타 유동자산",
+    "Other Non Current Liabilities": "기타 비유동부채",
+    "Other Current Liabilities": "기타 유동부채",
+    "Ppe Net": "유형자산(순액)",
+    "Retained Earnings": "이익잉여금",
+    "Gains Losses Not Affecting Retained Earnings": "기타포괄손익누계액(OCI)",
+    "Total Debt": "총차입금"
+}
+
+
+# load_stock_data 결과 튜플에서 (재무제표, 분기 여부) -> 위치
+STATEMENT_POSITIONS = {
+    ('income', False): 1,
+    ('income', True): 2,
+    ('balance', False): 3,
+    ('balance', True): 4,
+    ('cashflow', False): 5,
+    ('cashflow', True): 6,
+}
+
+GROWTH_COLOR_UP = 'color: #39e75f'
+GROWTH_COLOR_DOWN = 'color: #ff4b4b'
+GROWTH_COLOR_FLAT = 'color: #888'
+
+
+def translate_index(df):
+    """항목명을 FINANCIAL_TERM_MAPPING으로 번역하고, 번역 후 중복된 항목은 첫 번째만 남깁니다."""
+    labels = df.index.astype(str)
+    translated = pd.Index(labels.map(lambda label: FINANCIAL_TERM_MAPPING.get(label, label)))
+    out = df.set_axis(translated, axis=0)
+    return out.loc[~translated.duplicated(keep='first')]
+
+
+def create_growth_dataframe(df):
+    """
+    기간 컬럼을 최신순으로 정렬하고 (값) -> (직전 기간 대비 증감률) -> (다음 값) 순서로 배치합니다.
+    증감률은 모든 기간을 한 번의 배열 연산으로 계산합니다: (현재 - 직전) / |직전|
+
+    반환: (growth_df, 컬럼 순서). 증감률 컬럼 이름은 'DoD % (i)' (내부용)
+    """
+    if df is None or df.empty:
+        return df, []
+
+    # 1. 날짜 기준 내림차순 정렬 (최신이 왼쪽)
+    temp_df = df.copy()
+    temp_df.columns = pd.to_datetime(temp_df.columns)
+    temp_df = temp_df.sort_index(axis=1, ascending=False)
+
+    values = temp_df.to_numpy(dtype=float, na_value=np.nan)
+    n_rows, n_cols = values.shape
+
+    # 2. 이웃한 기간끼리 한 번에 증감률 계산
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (values[:, :-1] - values[:, 1:]) / np.abs(values[:, 1:])
+
+    # 3. 값과 증감률을 번갈아 배치
+    combined = np.empty((n_rows, 2 * n_cols - 1))
+    combined[:, 0::2] = values
+    combined[:, 1::2] = growth
+
+    final_cols = [None] * (2 * n_cols - 1)
+    final_cols[0::2] = temp_df.columns.strftime('%Y-%m-%d')
+    final_cols[1::2] = [f"DoD % ({i})" for i in range(n_cols - 1)]
+
+    growth_df = pd.DataFrame(combined, index=temp_df.index, columns=final_cols)
+    return growth_df, final_cols
+
+
+@traced()
+def build_statement_view(df_raw, quarterly=False):
+    """
+    재무제표 하나의 표시용 데이터를 만듭니다.
+    - 항목 번역/중복 제거, 증감률 계산 (create_growth_dataframe)
+    - 금액은 format_currency 형식, 증감률은 +12.5% 형식의 문자열로 미리 변환 (없는 값은 '-')
+    - 증감률 셀 색상(CSS) 표
+    - 증감률 컬럼 이름은 YoY % / QoQ % (중복되지 않도록 보이지 않는 공백을 덧붙임)
+
+    반환: {'display': 문자열 DataFrame, 'css': 같은 모양의 CSS DataFrame} 또는 데이터가 없으면 None
+    """
+    if df_raw is None or df_raw.empty:
+        return None
+
+    growth_df, ordered_cols = create_growth_dataframe(translate_index(df_raw))
+    values = growth_df.to_numpy()
+    is_growth = np.array(["DoD %" in col for col in ordered_cols])
+
+    text = np.empty(values.shape, dtype=object)
+    text[:, ~is_growth] = format_currency_array(values[:, ~is_growth], na_rep="-")
+
+    growth = values[:, is_growth]
+    finite = np.isfinite(growth)
+    with np.errstate(invalid='ignore'):
+        growth_text = np.char.mod('%+.1f%%', np.where(finite, growth * 100, 0.0))
+    text[:, is_growth] = np.where(finite, growth_text, "-")
+
+    css = np.full(values.shape, '', dtype=object)
+    css[:, is_growth] = np.select([finite & (growth > 0), finite & (growth < 0)],
+                                  [GROWTH_COLOR_UP, GROWTH_COLOR_DOWN], default=GROWTH_COLOR_FLAT)
+
+    growth_label = "QoQ %" if quarterly else "YoY %"
+    columns = []
+    for col, grow in zip(ordered_cols, is_growth):
+        # st.dataframe은 컬럼 이름이 중복되면 안 되므로 zero-width space로 구분
+        columns.append(growth_label + "\u200b" * len(columns) if grow else col)
+
+    return {
+        'display': pd.DataFrame(text, index=growth_df.index, columns=columns),
+        'css': pd.DataFrame(css, index=growth_df.index, columns=columns),
+    }
+
+
+# 조회 실패로 None이 나오면 캐시하지 않습니다 (다음 rerun에서 다시 시도).
+@shared_cache(ttl=3600, max_bytes=STATEMENT_VIEW_CACHE_BYTES, cache_if=lambda v: v is not None)
+def load_statement_view(symbol, statement, quarterly=False):
+    """
+    (종목, 재무제표, 연간/분기)별 build_statement_view 결과를 캐시합니다.
+    statement: 'income' / 'balance' / 'cashflow'
+    """
+    result = load_stock_data(symbol)
+    return build_statement_view(result[STATEMENT_POSITIONS[(statement, quarterly)]], quarterly)
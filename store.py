@@ -0,0 +1,54 @@
+"""
+로컬 데이터 저장소 (SQLite).
+
+여러 종목을 한꺼번에 모아 두는 일괄 수집 데이터(예: insider_store.py)를 BENJAMIN_DATA_DIR
+(기본 local_data/) 아래 SQLite 파일로 보관합니다. 화면 캐시(shared_cache, st.cache_data)와 달리
+프로세스를 다시 시작해도 남아 있고, 새로 받은 행만 추가하는 증분 갱신에 씁니다.
+"""
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+DATA_DIR = os.environ.get('BENJAMIN_DATA_DIR', 'local_data')
+
+
+def data_path(name):
+    """DATA_DIR 아래 파일 경로 (디렉터리가 없으면 만듭니다)."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, name)
+
+
+@contextmanager
+def connect(name):
+    """
+    짧게 쓰고 닫는 SQLite 연결. 블록이 정상 종료되면 commit, 예외면 rollback 합니다.
+    WAL 모드라 한 프로세스가 쓰는 동안 Streamlit 세션들이 동시에 읽을 수 있습니다.
+    """
+    conn = sqlite3.connect(data_path(name), timeout=30)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def exists(name):
+    """저장소 파일이 이미 있는지 (화면에서 수집을 유발하지 않고 읽기 전에 확인용)."""
+    return os.path.exists(os.path.join(DATA_DIR, name))
+
+
+def fetch_all(fetch, symbols, max_workers=8):
+    """
+    fetch(symbol)을 최대 max_workers개씩 동시에 실행하고, 끝나는 순서대로 (symbol, result, error)를 돌려줍니다.
+    결과 저장은 이 제너레이터를 도는 스레드 한 곳에서 하도록 해서 SQLite writer를 하나로 유지합니다.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='store-fetch') as pool:
+        futures = {pool.submit(fetch, symbol): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
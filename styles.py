@@ -32,6 +32,7 @@ def apply_finviz_style():
         }
         .fv-green { color: #00AA00 !important; }
         .fv-red { color: #AA0000 !important; }
+        .fv-pct { color: #888; font-size: 0.75em; font-weight: normal; margin-left: 4px; }
         
         /* Card Style for Overview */
         .metric-card {
@@ -96,9 +97,10 @@ def create_metric_card(label, value, delta=None, delta_pct=None, prefix="", suff
     """
     return html_content
 
-def create_finviz_row(label, value, is_good=False, is_bad=False, suffix="", prefix=""):
+def create_finviz_row(label, value, is_good=False, is_bad=False, suffix="", prefix="", percentile=None):
     """
     Generates HTML for a single row in the metrics dashboard.
+    percentile: (백분위, 섹터 종목 수, 섹터 이름) — 있으면 값 옆에 섹터 내 백분위를 작게 표시합니다.
     """
     color_class = ""
     if is_good:
@@ -107,6 +109,10 @@ def create_finviz_row(label, value, is_good=False, is_bad=False, suffix="", pref
         color_class = "fv-red"
     
     display_value = f"{prefix}{value}{suffix}" if value is not None and value != "N/A" else "-"
+    if percentile is not None and display_value != "-":
+        pct, count, sector = percentile
+        display_value += (f'<span class="fv-pct" title="{sector} 섹터 {count}개 종목 중 백분위">'
+                          f'P{pct:.0f}</span>')
     
     html_content = f"""
     <div class="finviz-row">
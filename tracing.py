@@ -0,0 +1,252 @@
+"""
+섹션별 실행 시간 계측.
+
+    with trace('section.overview'):
+        ...
+
+    @traced('utils.calculate_technical_indicators')
+    def calculate_technical_indicators(df): ...
+
+각 구간의 wall time, 캐시 hit/miss, 반환 데이터 크기를 기록합니다.
+- METRICS_PORT 환경 변수를 주면 http://localhost:<port>/metrics 에 Prometheus 형식으로 노출합니다.
+- 앱 주소에 ?debug=1 을 붙이면 페이지 하단에 이번 실행의 구간별 시간이 표시됩니다 (views/debug.py).
+"""
+import functools
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Prometheus histogram 버킷 (초). p95 페이지 지연 SLO(수 초 단위)를 판단할 수 있도록 10초까지 둡니다.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 디버그 패널의 p50/p95 계산에 쓰는 구간별 최근 샘플 수
+RECENT_SAMPLES = 500
+
+_lock = threading.Lock()
+_metrics = {}  # name -> _Metric
+_local = threading.local()
+
+
+class _Metric:
+    def __init__(self):
+        self.bucket_counts = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.payload_bytes = 0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+
+class Span:
+    """trace() 블록 안에서 hit/nbytes를 채워 넣을 수 있는 기록 객체."""
+    __slots__ = ('name', 'start', 'seconds', 'hit', 'nbytes')
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.seconds = None
+        self.hit = None     # True/False: 캐시 hit/miss, None: 캐시와 무관
+        self.nbytes = None  # 반환 데이터 크기 (bytes)
+
+
+def _record(span):
+    with _lock:
+        m = _metrics.get(span.name)
+        if m is None:
+            m = _metrics[span.name] = _Metric()
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if span.seconds <= bound:
+                m.bucket_counts[i] += 1
+        m.count += 1
+        m.total_seconds += span.seconds
+        m.recent.append(span.seconds)
+        if span.hit is True:
+            m.hits += 1
+        elif span.hit is False:
+            m.misses += 1
+        if span.nbytes:
+            m.payload_bytes += span.nbytes
+
+    spans = getattr(_local, 'spans', None)
+    if spans is not None:
+        spans.append(span)
+
+
+class trace:
+    """
+    구간 실행 시간을 기록하는 context manager.
+    예외가 나도 시간은 기록되며, 예외는 그대로 전파됩니다.
+    """
+
+    def __init__(self, name):
+        self.span = Span(name)
+
+    def __enter__(self):
+        self.span.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.seconds = time.perf_counter() - self.span.start
+        _record(self.span)
+        return False
+
+
+def traced(name=None, measure=False):
+    """
+    함수 호출 전체를 trace()로 감싸는 데코레이터.
+    measure=True이면 반환값의 크기(deep_sizeof)도 기록합니다. object 컬럼이 많은
+    DataFrame은 크기 계산 자체가 비싸므로 숫자형 결과를 돌려주는 함수에만 켭니다.
+    """
+    def decorator(f):
+        span_name = name or f'{f.__module__}.{f.__name__}'
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            with trace(span_name) as span:
+                result = f(*args, **kwargs)
+                if measure:
+                    from cache import deep_sizeof
+                    span.nbytes = deep_sizeof(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def start_request():
+    """
+    현재 스레드(= Streamlit 세션의 스크립트 실행)에서 기록되는 구간을 모으기 시작합니다.
+    app.py가 매 실행 시작 시 호출하며, 모인 구간은 request_spans()로 읽습니다.
+    """
+    _local.spans = []
+
+
+def request_spans():
+    return list(getattr(_local, 'spans', None) or [])
+
+
+def summary():
+    """
+    구간별 누적 통계를 반환합니다.
+    Key: 구간 이름, Value: count/total_ms/p50_ms/p95_ms/hits/misses/payload_bytes
+    """
+    with _lock:
+        items = [(name, m, sorted(m.recent)) for name, m in _metrics.items()]
+
+    def pct(samples, q):
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+    return {
+        name: {
+            'count': m.count,
+            'total_ms': m.total_seconds * 1000,
+            'p50_ms': pct(samples, 0.50),
+            'p95_ms': pct(samples, 0.95),
+            'hits': m.hits,
+            'misses': m.misses,
+            'payload_bytes': m.payload_bytes,
+        }
+        for name, m, samples in items
+    }
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus():
+    """
+    누적 통계와 shared_cache 저장소 상태를 Prometheus text exposition 형식으로 만듭니다.
+    """
+    lines = [
+        '# HELP benjamin_section_duration_seconds Wall time of traced sections.',
+        '# TYPE benjamin_section_duration_seconds histogram',
+    ]
+    with _lock:
+        items = sorted(_metrics.items())
+        for name, m in items:
+            n = _label(name)
+            for bound, c in zip(DURATION_BUCKETS, m.bucket_counts):
+                lines.append(f'benjamin_section_duration_seconds_bucket{{name="{n}",le="{bound}"}} {c}')
+            lines.append(f'benjamin_section_duration_seconds_bucket{{name="{n}",le="+Inf"}} {m.count}')
+            lines.append(f'benjamin_section_duration_seconds_sum{{name="{n}"}} {m.total_seconds:.6f}')
+            lines.append(f'benjamin_section_duration_seconds_count{{name="{n}"}} {m.count}')
+
+        lines += [
+            '# HELP benjamin_cache_requests_total Cache lookups of traced loaders.',
+            '# TYPE benjamin_cache_requests_total counter',
+        ]
+        for name, m in items:
+            if m.hits or m.misses:
+                n = _label(name)
+                lines.append(f'benjamin_cache_requests_total{{name="{n}",result="hit"}} {m.hits}')
+                lines.append(f'benjamin_cache_requests_total{{name="{n}",result="miss"}} {m.misses}')
+
+        lines += [
+            '# HELP benjamin_payload_bytes_total Bytes returned by traced sections.',
+            '# TYPE benjamin_payload_bytes_total counter',
+        ]
+        for name, m in items:
+            if m.payload_bytes:
+                lines.append(f'benjamin_payload_bytes_total{{name="{_label(name)}"}} {m.payload_bytes}')
+
+    from cache import cache_stats
+    stores = sorted(cache_stats().items())
+    lines += [
+        '# HELP benjamin_cache_bytes Bytes held by each shared cache store.',
+        '# TYPE benjamin_cache_bytes gauge',
+    ]
+    lines += [f'benjamin_cache_bytes{{store="{_label(s)}"}} {v["bytes"]}' for s, v in stores]
+    lines += [
+        '# HELP benjamin_cache_entries Entries held by each shared cache store.',
+        '# TYPE benjamin_cache_entries gauge',
+    ]
+    lines += [f'benjamin_cache_entries{{store="{_label(s)}"}} {v["entries"]}' for s, v in stores]
+    lines += [
+        '# HELP benjamin_cache_evictions_total Entries evicted from each shared cache store.',
+        '# TYPE benjamin_cache_evictions_total counter',
+    ]
+    lines += [f'benjamin_cache_evictions_total{{store="{_label(s)}"}} {v["evictions"]}' for s, v in stores]
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+
+
+def start_metrics_server(port=None):
+    """
+    /metrics 엔드포인트를 백그라운드 스레드로 띄웁니다.
+    port가 없으면 METRICS_PORT 환경 변수를 쓰고, 둘 다 없으면 아무것도 하지 않습니다.
+    프로세스당 한 번만 띄우며, 포트를 열 수 없으면 None을 반환합니다.
+    """
+    global _server
+    port = port or os.environ.get('METRICS_PORT')
+    if not port:
+        return None
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer(('0.0.0.0', int(port)), _MetricsHandler)
+            except (OSError, ValueError):
+                return None
+            threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+    return _server
@@ -1,16 +1,21 @@
+import os
+
 import pandas as pd
 import plotly.graph_objects as go
-from textblob import TextBlob
 import numpy as np
 
+from tracing import traced
+
 
 
+@traced(measure=True)
 def calculate_technical_indicators(df):
     """
     RSI(14)와 MACD(12, 26, 9)를 계산하여 데이터프레임에 추가합니다.
     """
     try:
-        df = df.copy()
+        # 캐시된 원본을 건드리지 않도록 얕은 복사 (CoW로 새 컬럼만 메모리를 차지)
+        df = df.copy(deep=False)
         
         # RSI Calculation
         delta = df['Close'].diff()
@@ -31,6 +36,125 @@ def calculate_technical_indicators(df):
     except Exception:
         return df
 
+# 차트 간격별 (표시 기간(년), 리샘플 규칙)
+# yfinance와 같은 라벨을 쓰도록 주봉은 월요일 시작, 월봉은 월초 기준으로 묶습니다.
+TIMEFRAME_SPECS = {
+    "Daily": (1, None),
+    "Weekly": (3, "W-MON"),
+    "Monthly": (5, "MS"),
+}
+
+@traced(measure=True)
+def resample_ohlcv(df, rule):
+    """
+    일봉 OHLCV를 주봉/월봉으로 리샘플링합니다.
+    Open=첫 값, High=최대, Low=최소, Close=마지막 값, Volume=합계.
+    """
+    agg = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum',
+           'Dividends': 'sum', 'Stock Splits': 'max'}
+    agg = {col: how for col, how in agg.items() if col in df.columns}
+    resampled = df.resample(rule, label='left', closed='left').agg(agg)
+    # 거래일이 없는 구간(휴장 주간 등)은 제거
+    return resampled.dropna(subset=['Close'])
+
+@traced()
+def get_timeframe_view(daily, timeframe):
+    """
+    캐시된 장기 일봉에서 Daily/Weekly/Monthly 화면용 데이터를 만듭니다 (네트워크 호출 없음).
+    """
+    years, rule = TIMEFRAME_SPECS[timeframe]
+    start = daily.index[-1] - pd.DateOffset(years=years)
+    view = daily[daily.index >= start]
+    if rule is None:
+        return view
+    return resample_ohlcv(view, rule)
+
+# 차트 다운샘플링 기준
+# 화면 폭(px)보다 많은 포인트는 보이지 않으므로 차트 폭 정도로 포인트 수를 제한합니다.
+CHART_TARGET_WIDTH_PX = int(os.environ.get("CHART_TARGET_WIDTH_PX", "1400"))
+# 이 이상의 포인트를 그리는 라인은 WebGL(Scattergl)로 렌더링합니다. CHART_WEBGL=1이면 항상 WebGL.
+WEBGL_MIN_POINTS = 5000
+
+def chart_point_budget(width_px=None, points_per_px=1.0):
+    """
+    표시 구간 전체를 width_px 폭에 그릴 때 필요한 최대 포인트 수.
+    """
+    return max(int((width_px or CHART_TARGET_WIDTH_PX) * points_per_px), 3)
+
+def line_trace_class(n_points):
+    """
+    포인트 수에 따라 go.Scatter 또는 go.Scattergl을 고릅니다.
+    """
+    if os.environ.get("CHART_WEBGL") == "1" or n_points >= WEBGL_MIN_POINTS:
+        return go.Scattergl
+    return go.Scatter
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: 라인의 모양(고점/저점)을 보존하며 n_out개 포인트의 위치를 고릅니다.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    # 지표 초반의 NaN이 면적 계산을 깨뜨리지 않도록 평균값으로 대체 (선택에만 사용)
+    if np.isnan(y).any():
+        y = np.where(np.isnan(y), np.nanmean(y) if not np.isnan(y).all() else 0.0, y)
+
+    # 첫/마지막 포인트를 제외한 구간을 n_out - 2개 버킷으로 나눔
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        xs, ys = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x) * (ys - y[a]) - (x[a] - xs) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+@traced()
+def downsample_line(series, n_out):
+    """
+    Series를 LTTB로 n_out개 포인트까지 줄입니다. (인덱스는 원래 시점 유지)
+    """
+    if len(series) <= n_out:
+        return series
+    if isinstance(series.index, pd.DatetimeIndex):
+        x = series.index.asi8
+    else:
+        x = np.arange(len(series))
+    return series.iloc[lttb_indices(x, series.values, n_out)]
+
+@traced()
+def downsample_ohlc(df, n_buckets):
+    """
+    캔들 데이터를 n_buckets개 구간으로 묶습니다.
+    OHLCV는 봉 합치기와 같은 규칙(첫 Open, 최대 High, 최소 Low, 마지막 Close, Volume 합계)을,
+    나머지 컬럼(지표 등)은 구간의 마지막 값을 사용합니다.
+    """
+    n = len(df)
+    if n <= n_buckets:
+        return df
+
+    groups = np.arange(n) * n_buckets // n
+    agg = {col: 'last' for col in df.columns}
+    agg.update({col: how for col, how in
+                {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}.items()
+                if col in df.columns})
+    out = df.groupby(groups).agg(agg)
+    # 각 구간의 첫 시점을 x 좌표로 사용
+    out.index = df.index[np.flatnonzero(np.diff(groups, prepend=-1))]
+    return out
+
 def format_currency(val):
     """
     Converts a number to a shortened currency string (e.g. 1.5B, 300M).
@@ -48,6 +172,18 @@ def format_currency(val):
     else:
         return f'{val:.2f}'
 
+def format_currency_array(values, na_rep=""):
+    """
+    format_currency의 배열 버전. 크기 구간(B/M/K)을 한 번에 골라 문자열 배열(object)로 반환합니다.
+    """
+    values = np.asarray(values, dtype=float)
+    val_abs = np.abs(values)
+    scale = np.select([val_abs >= 1e9, val_abs >= 1e6, val_abs >= 1e3], [1e9, 1e6, 1e3], default=1.0)
+    suffix = np.select([val_abs >= 1e9, val_abs >= 1e6, val_abs >= 1e3], ['B', 'M', 'K'], default='')
+    with np.errstate(invalid='ignore'):
+        text = np.char.add(np.char.mod('%.2f', values / scale), suffix)
+    return np.where(np.isnan(values), na_rep, text).astype(object)
+
 # Metric helpers
 def fmt(n, format_str="{:.2f}", suffix="", scale=1):
     if n is None: return "N/A"
@@ -296,6 +432,7 @@ def create_target_price_chart(current_price, low, mean, high, currency="$"):
     return fig
     return fig
 
+@traced()
 def analyze_sentiment_from_news(news_list):
     """
     뉴스 헤드라인을 분석하여 평균 감성 점수(-1.0 ~ 1.0)를 반환합니다.
@@ -303,6 +440,9 @@ def analyze_sentiment_from_news(news_list):
     """
     if not news_list:
         return 0, 0, "Neutral"
+    
+    # TextBlob은 NLTK까지 불러오므로 감성 분석을 실제로 할 때만 import
+    from textblob import TextBlob
         
     total_polarity = 0
     valid_count = 0
@@ -330,12 +470,13 @@ def analyze_sentiment_from_news(news_list):
     
     return avg_polarity, score, rating
 
+@traced()
 def detect_candlestick_patterns(df):
     """
     DataFrame에 캔들스틱 패턴(Doji, Hammer, Engulfing 등)을 감지하여 
     'Pattern' 컬럼에 패턴 이름을 기록합니다.
     """
-    df = df.copy()
+    df = df.copy(deep=False)
     df['Pattern'] = None
     df['Pattern_Marker'] = None # 차트 표시용 값 (High or Low)
     
@@ -386,3 +527,167 @@ def detect_candlestick_patterns(df):
                 continue
                 
     return df
+
+# PER 밴드 배수
+PER_BAND_MULTIPLES = (10, 15, 20, 25, 30)
+
+def _pick_eps_row(statement):
+    if statement is None:
+        return None
+    if 'Diluted EPS' in statement.index:
+        return statement.loc['Diluted EPS'].sort_index()
+    if 'Basic EPS' in statement.index:
+        return statement.loc['Basic EPS'].sort_index()
+    return None
+
+@traced()
+def select_eps_series(financials, quarterly_financials):
+    """
+    PER 밴드에 사용할 EPS 시계열을 고릅니다.
+    분기 EPS의 최근 4분기 합(TTM)을 우선 사용하고, 4분기가 안 되면 연간 EPS로 대체합니다.
+    반환: (EPS Series 또는 None, 출처 "TTM (Quarterly)" / "Annual")
+    """
+    q_eps = _pick_eps_row(quarterly_financials)
+
+    if q_eps is not None and len(q_eps) >= 1:
+        # Rolling Sum of last 4 quarters (앞쪽 3개 분기는 NaN이므로 제거)
+        ttm_eps = q_eps.rolling(window=4).sum().dropna()
+        if not ttm_eps.empty:
+            return ttm_eps, "TTM (Quarterly)"
+        if financials is None:
+            return ttm_eps, "TTM (Quarterly)"
+
+    return _pick_eps_row(financials), "Annual"
+
+@traced()
+def split_adjust_eps(eps, splits):
+    """
+    주식 분할을 EPS에 반영합니다.
+    yfinance EPS는 발표 당시 기준(As Reported)이고 주가는 분할 조정 값이므로,
+    EPS 날짜 이후에 일어난 분할 비율의 곱으로 EPS를 나눕니다. (4:1 분할 이전 EPS는 /4)
+    """
+    if splits is None or splits.empty:
+        return eps
+
+    splits_sorted = splits.sort_index()
+    # splits index는 tz-aware(America/New_York), 재무제표 날짜는 naive
+    if splits_sorted.index.tz is not None:
+        splits_sorted.index = splits_sorted.index.tz_localize(None)
+
+    adj_eps_values = []
+    for date, val in eps.items():
+        # 이 EPS 날짜 이후의 분할들 → 누적 분할 비율 (4.0과 2.0이면 8.0)
+        relevant_splits = splits_sorted[splits_sorted.index > date]
+        split_factor = relevant_splits.prod() if not relevant_splits.empty else 1.0
+        adj_eps_values.append(val / split_factor)
+
+    return pd.Series(adj_eps_values, index=eps.index)
+
+@traced()
+def build_per_bands(history, eps, multiples=PER_BAND_MULTIPLES):
+    """
+    일봉 이력에 해당 시점의 EPS(직전 발표 값)를 붙이고 PER_<배수> 밴드 가격 컬럼을 추가합니다.
+    EPS가 없는 구간은 제외됩니다.
+    """
+    eps_df = pd.DataFrame({'EPS': eps})
+    eps_df.index = pd.to_datetime(eps_df.index)
+    eps_df = eps_df.sort_index()
+
+    hist_sorted = history.sort_index()
+
+    # [Fix] Timezone Mismatch Error
+    if hist_sorted.index.tz is not None:
+        hist_sorted.index = hist_sorted.index.tz_localize(None)
+    if eps_df.index.tz is not None:
+        eps_df.index = eps_df.index.tz_localize(None)
+
+    combined = pd.merge_asof(hist_sorted, eps_df, left_index=True, right_index=True, direction='backward')
+    combined = combined.dropna(subset=['EPS'])
+
+    for mult in multiples:
+        combined[f'PER_{mult}'] = combined['EPS'] * mult
+    return combined
+
+# DCF 시나리오 (Very Bearish, Bearish, Base, Bullish, Very Bullish)
+DCF_SCENARIOS = {
+    "최악 (Very Bearish)": {"wacc": 0.12, "growth": 0.05, "terminal": 0.015, "color": "#b71c1c"}, # Dark Red
+    "약세 (Bearish)": {"wacc": 0.105, "growth": 0.10, "terminal": 0.02, "color": "#ff4b4b"}, # Red
+    "평범 (Base)": {"wacc": 0.09, "growth": 0.15, "terminal": 0.025, "color": "#f0f2f6"}, # Default
+    "강세 (Bullish)": {"wacc": 0.075, "growth": 0.20, "terminal": 0.03, "color": "#69f0ae"}, # Light Green
+    "최상 (Very Bullish)": {"wacc": 0.06, "growth": 0.25, "terminal": 0.035, "color": "#00c853"} # Green
+}
+
+@traced()
+def calculate_dcf_scenarios(cashflow, balance_sheet, shares_outstanding, current_price, scenarios=None):
+    """
+    연간 현금흐름표/대차대조표로 5년 DCF 적정 주가를 시나리오별로 계산합니다.
+    FCF = 영업현금흐름 - CapEx, 5년 성장 후 영구 성장률로 Terminal Value를 구하고 순현금을 더합니다.
+    반환: (base FCF, [{'name', 'wacc', 'growth', 'terminal', 'color', 'intrinsic_value', 'upside'}])
+    필요한 항목(Operating Cash Flow 등)이 없으면 KeyError가 발생합니다.
+    """
+    scenarios = scenarios or DCF_SCENARIOS
+
+    # 날짜 정렬 (과거 -> 최신)
+    cf_T = cashflow.T
+    cf_T.index = pd.to_datetime(cf_T.index)
+    cf_T = cf_T.sort_index(ascending=True)
+
+    bs_T = balance_sheet.T
+    bs_T.index = pd.to_datetime(bs_T.index)
+    bs_T = bs_T.sort_index(ascending=True)
+
+    # 1. Base FCF (Latest Annual)
+    recent_ocf = cf_T['Operating Cash Flow'].iloc[-1]
+    if 'Capital Expenditure' in cf_T.columns:
+        recent_capex = abs(cf_T['Capital Expenditure'].iloc[-1])
+    elif 'Purchase Of PPE' in cf_T.columns:
+        recent_capex = abs(cf_T['Purchase Of PPE'].iloc[-1])
+    else:
+        recent_capex = 0
+    fcf_base = recent_ocf - recent_capex
+
+    # Net Cash
+    total_debt = bs_T['Total Debt'].iloc[-1] if 'Total Debt' in bs_T.columns else 0
+    cash_and_equiv = bs_T['Cash And Cash Equivalents'].iloc[-1] if 'Cash And Cash Equivalents' in bs_T.columns else 0
+    net_cash = cash_and_equiv - total_debt
+
+    if shares_outstanding is None:
+        shares_outstanding = 1
+
+    results = []
+    for name, params in scenarios.items():
+        wacc = params['wacc']
+        growth = params['growth']
+        terminal_rate = params['terminal']
+
+        # 1. Projected FCFs (Years 1 to 5)
+        fcfs = []
+        current_fcf_proj = fcf_base
+        for i in range(1, 6):
+            current_fcf_proj *= (1 + growth)
+            fcfs.append(current_fcf_proj)
+
+        # 2. Present Value of Projected FCFs
+        pv_fcfs = [fcf / (1 + wacc)**(i+1) for i, fcf in enumerate(fcfs)]
+        total_pv_fcfs = sum(pv_fcfs)
+
+        # 3. Terminal Value
+        fcf_year_6 = fcfs[-1] * (1 + terminal_rate)
+        terminal_value = fcf_year_6 / (wacc - terminal_rate)
+        pv_terminal_value = terminal_value / ((1 + wacc) ** 5)
+
+        # 4. Total Value & Net Cash
+        enterprise_value = total_pv_fcfs + pv_terminal_value
+        equity_value = enterprise_value + net_cash
+        intrinsic_value = equity_value / shares_outstanding
+
+        results.append({
+            'name': name,
+            'wacc': wacc,
+            'growth': growth,
+            'terminal': terminal_rate,
+            'color': params.get('color'),
+            'intrinsic_value': intrinsic_value,
+            'upside': (intrinsic_value - current_price) / current_price * 100,
+        })
+    return fcf_base, results
@@ -0,0 +1,38 @@
+"""
+분석 화면: 선택한 종목의 대시보드.
+
+섹션마다 모듈로 나누고, 자체 위젯이 있는 섹션(차트 간격, 보고서 기준)은 st.fragment로 감쌉니다.
+해당 위젯을 바꾸면 페이지 전체가 아니라 그 섹션만 다시 실행됩니다.
+"""
+import streamlit as st
+
+from data import load_stock_data, load_price_history
+from tracing import traced
+from views import overview, charts, key_metrics, risk, valuation, insider, ownership
+from views import financials as financials_view
+
+
+@traced('page.analysis')
+def render(ticker_symbol):
+    # 데이터 로딩
+    # 일봉 이력 하나로 Daily/Weekly/Monthly를 모두 만들므로 간격 전환 시 재조회가 없습니다.
+    with st.spinner(f'{ticker_symbol} 데이터 불러오는 중...'):
+        daily_history = load_price_history(ticker_symbol)
+        if daily_history is not None and not daily_history.empty:
+            info, financials, quarterly_financials, balance_sheet, quarterly_balance_sheet, cashflow, quarterly_cashflow, splits = load_stock_data(ticker_symbol)
+            info = info or {}
+
+    if daily_history is None or daily_history.empty:
+        st.error(f"'{ticker_symbol}' 데이터를 찾을 수 없습니다.")
+    else:
+        # 개요/핵심 지표는 간격 선택과 무관하게 일봉 기준으로 계산합니다.
+        overview.render(ticker_symbol, daily_history, info)
+        charts.render(ticker_symbol, daily_history, financials, quarterly_financials, splits)
+        key_metrics.render(ticker_symbol, daily_history, info, financials, balance_sheet)
+        risk.render(ticker_symbol, daily_history, info)
+        financials_view.render(ticker_symbol, financials, quarterly_financials, balance_sheet, quarterly_balance_sheet, cashflow, quarterly_cashflow)
+        # 애널리스트 목표가/DCF는 연간 재무제표 기준이므로 보고서 기준 라디오와 분리
+        if info and financials is not None and not financials.empty:
+            valuation.render(info, cashflow, balance_sheet, daily_history['Close'].iloc[-1])
+        insider.render(ticker_symbol)
+        ownership.render(ticker_symbol)
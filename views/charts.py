@@ -0,0 +1,277 @@
+"""
+섹션 2: 차트 (기술적 분석 / PER 밴드).
+
+Daily/Weekly/Monthly 라디오를 포함한 fragment라서 간격을 바꾸면 이 섹션만 다시 실행됩니다.
+"""
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from utils import calculate_technical_indicators, get_timeframe_view, chart_point_budget, line_trace_class, downsample_line, downsample_ohlc, detect_candlestick_patterns
+from utils import select_eps_series, split_adjust_eps, build_per_bands
+from tracing import traced
+
+
+@traced('section.charts.technical')
+def render_technical_tab(ticker_symbol, history, timeframe):
+    from plotly.subplots import make_subplots
+
+    # 기술적 지표 계산
+    history = calculate_technical_indicators(history)
+    history = detect_candlestick_patterns(history)
+
+    # 긴 이력/분봉에서도 figure 크기가 차트 폭 수준으로 유지되도록 다운샘플링
+    # (지표는 전체 이력으로 계산한 뒤 그리기 직전에만 줄임)
+    max_points = chart_point_budget()
+    plot_hist = downsample_ohlc(history, max_points)
+    Line = line_trace_class(len(history))
+
+    # Subplots 생성 (Price, RSI, MACD)
+    fig = make_subplots(rows=3, cols=1, shared_xaxes=True, 
+                        vertical_spacing=0.1, 
+                        row_heights=[0.5, 0.25, 0.25],
+                        subplot_titles=(f'{ticker_symbol} Price', 'RSI', 'MACD'))
+
+    # 1. Price Chart (Candlestick)
+    fig.add_trace(go.Candlestick(x=plot_hist.index,
+                    open=plot_hist['Open'],
+                    high=plot_hist['High'],
+                    low=plot_hist['Low'],
+                    close=plot_hist['Close'], showlegend=False), row=1, col=1)
+
+    # 2. RSI Chart
+    rsi_line = downsample_line(history['RSI'], max_points)
+    fig.add_trace(Line(x=rsi_line.index, y=rsi_line, name='RSI', line=dict(color='purple', width=1.5)), row=2, col=1)
+    fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1, annotation_text="Overbought (70)")
+    fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1, annotation_text="Oversold (30)")
+
+    # 3. MACD Chart
+    # Histogram Colors
+    colors = np.where(plot_hist['MACD_Hist'] >= 0, 'green', 'red')
+
+    fig.add_trace(go.Bar(x=plot_hist.index, y=plot_hist['MACD_Hist'], name='MACD Hist', marker_color=colors), row=3, col=1)
+
+    # [NEW] Chart Patterns Overlay
+    # 1. Bullish Patterns
+    bullish_pat = history[history['Pattern'].isin(['Hammer', 'Bullish Engulfing'])]
+    if not bullish_pat.empty:
+        fig.add_trace(go.Scatter(
+            x=bullish_pat.index, y=bullish_pat['Pattern_Marker'],
+            mode='markers', marker=dict(symbol='triangle-up', size=12, color='#00ff00'),
+            text=bullish_pat['Pattern'], name='Bullish Pattern'
+        ), row=1, col=1)
+
+    # 2. Bearish Patterns
+    bearish_pat = history[history['Pattern'].isin(['Bearish Engulfing'])]
+    if not bearish_pat.empty:
+        fig.add_trace(go.Scatter(
+            x=bearish_pat.index, y=bearish_pat['Pattern_Marker'],
+            mode='markers', marker=dict(symbol='triangle-down', size=12, color='#ff0000'),
+            text=bearish_pat['Pattern'], name='Bearish Pattern'
+        ), row=1, col=1)
+
+    macd_line = downsample_line(history['MACD'], max_points)
+    signal_line = downsample_line(history['Signal_Line'], max_points)
+    fig.add_trace(Line(x=macd_line.index, y=macd_line, name='MACD', line=dict(color='blue', width=1.5)), row=3, col=1)
+    fig.add_trace(Line(x=signal_line.index, y=signal_line, name='Signal', line=dict(color='orange', width=1.5)), row=3, col=1)
+
+    title_text = f'{ticker_symbol} Technical Analysis ({timeframe})'
+
+    fig.update_layout(
+        title=title_text,
+        yaxis_title='Price',
+        xaxis_rangeslider_visible=False,
+        height=800,
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)' # 투명 배경
+    )
+
+    # Axis Styling for Boundaries (Subplots 구분선 명확화)
+    axis_style = dict(showline=True, linewidth=1, linecolor='white', mirror=True)
+
+    # Update all axes
+    fig.update_xaxes(**axis_style)
+    fig.update_yaxes(**axis_style)
+
+    # Fix Title Overlap: Shift subplot titles up
+    fig.update_annotations(yshift=20)
+
+    # Specific constraints
+    fig.update_yaxes(fixedrange=True, row=1, col=1)
+    fig.update_yaxes(fixedrange=True, row=2, col=1, range=[0, 100])
+    fig.update_yaxes(fixedrange=True, row=3, col=1)
+    fig.update_xaxes(fixedrange=False, row=3, col=1)
+
+    # [NEW] Layout Split: Chart vs Status Panel
+    col_chart_main, col_chart_info = st.columns([0.85, 0.15])
+
+    with col_chart_main:
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col_chart_info:
+        # 1. Spacer for Price Chart (Upper 50% of 800px = 400px)
+        # Adjusting for titles and margins
+        st.markdown("<div class='desktop-spacer' style='height: 380px;'></div>", unsafe_allow_html=True)
+
+        # 2. RSI Status
+        last_rsi = history['RSI'].iloc[-1]
+        rsi_color = "#999"
+        rsi_msg = "Neutral"
+
+        if last_rsi >= 70:
+            rsi_color = "#ff4b4b" # Red
+            rsi_msg = "Overbought (과매수)"
+        elif last_rsi <= 30:
+            rsi_color = "#00c853" # Green
+            rsi_msg = "Oversold (과매도)"
+
+        st.markdown(f"""
+        <div style="
+            border-left: 3px solid {rsi_color}; 
+            padding-left: 10px; 
+            margin-bottom: 0px;
+        ">
+            <div style="font-size: 0.8rem; color: #aaa;">RSI (14)</div>
+            <div style="font-size: 1.4rem; font-weight: bold;">{last_rsi:.1f}</div>
+            <div style="font-size: 0.9rem; color: {rsi_color};">{rsi_msg}</div>
+            <div style="font-size: 0.7rem; color: #666; margin-top: 5px; line-height: 1.2;">
+                RSI가 70이상이면 과매수, 30이하이면 과매도 상태를 의미합니다.
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # 3. Spacer for RSI section (25% of 800px = ~200px)
+        st.markdown("<div class='desktop-spacer' style='height: 100px;'></div>", unsafe_allow_html=True)
+
+        # 4. MACD Status
+        last_macd = history['MACD'].iloc[-1]
+        last_signal = history['Signal_Line'].iloc[-1]
+
+        macd_bullish = last_macd > last_signal
+        macd_color = "#00c853" if macd_bullish else "#ff4b4b"
+        macd_msg = "Bullish (매수세)" if macd_bullish else "Bearish (매도세)"
+
+        st.markdown(f"""
+        <div style="
+            border-left: 3px solid {macd_color}; 
+            padding-left: 10px;
+        ">
+            <div style="font-size: 0.8rem; color: #aaa;">MACD</div>
+            <div style="font-size: 1.4rem; font-weight: bold;">{last_macd:.2f}</div>
+            <div style="font-size: 0.9rem; color: #ccc;">Sig: {last_signal:.2f}</div>
+            <div style="font-size: 0.9rem; color: {macd_color}; margin-top: 2px;">{macd_msg}</div>
+            <div style="font-size: 0.7rem; color: #666; margin-top: 5px; line-height: 1.2;">
+                MACD가 시그널 선보다 높으면 상승 추세, 낮으면 하락 추세를 의미합니다.
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.info("💡 가이드\n\nRSI가 무조건 과매수라고 해서 팔아서는 안됩니다! 대부분의 주식들은 상승세일 때 과매수와 그 아래를 조금씩 유지하며 상승세를 이어갑니다. 과매수 상태에서도 상승세가 더 유지될 수 있고, 과매도 상태에서도 하락세가 더 유지될 수 있습니다. 이 지표들은 단순히 보조 지표로 활용해야 하며, 기업의 펀더멘탈, 밸류에이션을 함께 판단하여 투자 결정을 내려야 합니다. \n\nMACD 지표는 단순히 매수세일때 사고 매도세에 매도하는 지표가 아닙니다. 매도세에서 매수세로 전환되는 지점이나, 매도세가 꺾이고 줄어드는 지점을 찾는 안목도 매우 중요합니다. 주의할 점은 매도세와 매수세가 단순히 반복되지는 않는다는 점입니다. 매도세가 끝나려는 흐름에서 더 이어가버릴 수도 있고, 그 반대의 경우도 충분히 발생할 수 있습니다. 이러한 이유들로 이 지표들을 단순히 매수매도 결정의 기준으로 사용하는 것은 위험한 판단이 될 수 있습니다.")
+
+
+@traced('section.charts.per_band')
+def render_per_band_tab(ticker_symbol, history, financials, quarterly_financials, splits):
+    st.subheader(f"{ticker_symbol} PER Price Band")
+    
+    # 1-2. EPS (TTM 우선, 부족하면 연간)
+    final_eps_df, eps_source = select_eps_series(financials, quarterly_financials)
+
+    if final_eps_df is not None and not final_eps_df.empty:
+         # 3. Split Adjustment (EPS는 발표 당시 기준, 주가는 분할 조정 값)
+         final_eps_df = split_adjust_eps(final_eps_df, splits)
+
+         # 4-5. 일봉에 EPS를 merge_asof로 붙이고 PER 밴드 계산
+         combined = build_per_bands(history, final_eps_df)
+
+         if not combined.empty:
+               # 6. Plot
+               # 가격 라인을 LTTB로 줄이고, 밴드는 같은 시점만 사용 (EPS는 분기마다 바뀌는 계단형)
+               max_points = chart_point_budget()
+               price_line = downsample_line(combined['Close'], max_points)
+               plot_combined = combined.loc[price_line.index]
+               Line = line_trace_class(len(combined))
+               
+               fig_per = go.Figure()
+               
+               # Price
+               fig_per.add_trace(Line(
+                   x=price_line.index, y=price_line, 
+                   name='Price', 
+                   line=dict(color='white', width=2)
+               ))
+               
+               # Bands
+               bands = [
+                   (10, '#ef5350'),  # Red
+                   (15, '#ffa726'),  # Orange
+                   (20, '#66bb6a'),  # Green
+                   (25, '#42a5f5'),  # Blue
+                   (30, '#ab47bc')   # Purple
+               ]
+               
+               for mult, col in bands:
+                   # Show band only if EPS > 0
+                   mask = plot_combined['EPS'] > 0
+                   if mask.any():
+                       fig_per.add_trace(Line(
+                           x=plot_combined[mask].index, 
+                           y=plot_combined.loc[mask, f'PER_{mult}'], 
+                           name=f'PER {mult}x', 
+                           line=dict(color=col, width=1, dash='dot'),
+                           hoverinfo='name+y'
+                       ))
+                   
+               fig_per.update_layout(
+                   title=f'{ticker_symbol} Price vs PER Bands ({eps_source})',
+                   yaxis_title='Price',
+                   height=600,
+                   plot_bgcolor='rgba(0,0,0,0)',
+                   xaxis_rangeslider_visible=False,
+                   hovermode="x unified",
+                   legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+               )
+               
+               axis_style = dict(showline=True, linewidth=1, linecolor='white', mirror=True)
+               fig_per.update_xaxes(**axis_style)
+               fig_per.update_yaxes(**axis_style)
+
+               st.plotly_chart(fig_per, use_container_width=True)
+               
+               st.info(f"💡 **가이드**: 이 차트는 **{eps_source} EPS**와 **주식 분할(Split) 조정**이 반영된 데이터를 사용합니다. 주가가 수익성 대비 역사적으로 어느 구간(PER 10배~30배)에 있는지 확인하세요.")
+               
+         else:
+             st.warning("EPS 데이터를 매칭할 수 없어 밴드 차트를 그릴 수 없습니다.")
+    else:
+        st.warning("재무 데이터에서 EPS 정보를 찾을 수 없어 밴드 차트를 그릴 수 없습니다.")
+
+
+@st.fragment
+@traced('section.charts')
+def render(ticker_symbol, daily_history, financials, quarterly_financials, splits):
+    # UI 레이아웃 준비 (차트 아래에 간격 선택 라디오)
+    chart_container = st.container()
+    controls_container = st.container()
+
+    # 컨트롤 영역: Daily, Weekly, Monthly 버튼
+    with controls_container:
+        # 3개의 버튼으로 구성 (Daily, Weekly, Monthly)
+        # [Fix] 티커 변경 시 라디오 버튼 상태도 초기화되도록 key에 ticker_symbol을 포함
+        timeframe = st.radio("데이터 간격 (Interval)", ["Daily", "Weekly", "Monthly"], horizontal=True, key=f"interval_{ticker_symbol}")
+
+    # 캐시된 일봉에서 선택한 간격의 봉을 만듦 (네트워크 호출 없음)
+    history = get_timeframe_view(daily_history, timeframe)
+
+    # -----------------------------------------------------
+    # 섹션 2: 차트 (Chart Container)
+    # -----------------------------------------------------
+    with chart_container:
+        # [NEW] Tabs for Charts
+        tab_tech, tab_per = st.tabs(["기술적 분석 (Technical)", "PER 밴드 (PER Bands)"])
+
+        # --- Tab 1: Technical Analysis (Existing Code) ---
+        with tab_tech:
+            render_technical_tab(ticker_symbol, history, timeframe)
+
+        # --- Tab 2: PER Bands ---
+        with tab_per:
+            render_per_band_tab(ticker_symbol, history, financials, quarterly_financials, splits)
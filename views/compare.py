@@ -0,0 +1,126 @@
+"""
+비교 화면: 검색창에 쉼표로 구분한 여러 티커(AAPL, MSFT, NVDA)를 입력하면 표시됩니다.
+주가는 종목별 일봉 캐시를 재사용해 한 행렬로 맞추고, 구간/기준 종목 위젯은 fragment라서 바꿔도 재조회가 없습니다.
+"""
+import plotly.graph_objects as go
+import streamlit as st
+
+import compare
+from tracing import traced
+
+# 선이 많을 때 범례/호버가 읽기 어려워지므로 이 수를 넘으면 선 차트의 호버를 종목별로 바꿉니다.
+UNIFIED_HOVER_LIMIT = 10
+
+
+def _line_chart(frame, title, suffix='', baseline=None, height=420):
+    fig = go.Figure()
+    for symbol in frame.columns:
+        fig.add_trace(go.Scattergl(
+            x=frame.index, y=frame[symbol], name=str(symbol), mode='lines',
+            hovertemplate=f'{symbol}: %{{y:.2f}}{suffix}<extra></extra>',
+        ))
+    if baseline is not None:
+        fig.add_hline(y=baseline, line_dash='dot', line_color='rgba(200,200,200,0.5)')
+    fig.update_layout(
+        title=dict(text=title, x=0, xanchor='left'),
+        height=height,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified" if frame.shape[1] <= UNIFIED_HOVER_LIMIT else "closest",
+        margin=dict(t=60, l=10, r=10, b=10),
+    )
+    fig.update_yaxes(ticksuffix=suffix, showgrid=True, gridcolor='rgba(128,128,128,0.2)')
+    return fig
+
+
+def _correlation_heatmap(correlation):
+    labels = [str(c) for c in correlation.columns]
+    fig = go.Figure(go.Heatmap(
+        z=correlation.to_numpy(), x=labels, y=labels, zmin=-1, zmax=1, colorscale='RdBu_r',
+        hovertemplate='%{y} / %{x}: %{z:.2f}<extra></extra>',
+        text=correlation.round(2).to_numpy() if len(labels) <= 15 else None,
+        texttemplate='%{text}' if len(labels) <= 15 else None,
+    ))
+    fig.update_layout(
+        title=dict(text="일간 수익률 상관계수", x=0, xanchor='left'),
+        height=max(400, 22 * len(labels)),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=60, l=10, r=10, b=10),
+    )
+    fig.update_yaxes(autorange='reversed')
+    return fig
+
+
+@st.fragment
+@traced('section.compare.charts')
+def render_charts(matrix):
+    col_period, col_bench, col_window = st.columns([2, 1, 1])
+    with col_period:
+        period = st.radio("구간", list(compare.PERIODS), index=list(compare.PERIODS).index('1Y'),
+                          horizontal=True, key="compare_period")
+    with col_bench:
+        benchmark = st.selectbox("기준 종목", list(matrix.columns), key="compare_benchmark")
+    with col_window:
+        window = st.select_slider("상관계수 기간 (거래일)", [20, 60, 120, 250], value=60, key="compare_window")
+
+    result = compare.build_comparison(matrix, benchmark, period, window)
+    if result is None:
+        st.warning("선택한 구간에 비교할 데이터가 부족합니다.")
+        return
+
+    st.plotly_chart(_line_chart(result['normalized'], f"누적 수익률 ({period})", suffix='%', baseline=0),
+                    use_container_width=True)
+
+    st.dataframe(
+        result['summary'], use_container_width=True,
+        column_config={
+            'Return %': st.column_config.NumberColumn(format="%.2f%%"),
+            'Volatility %': st.column_config.NumberColumn(format="%.1f%%"),
+            'Max Drawdown %': st.column_config.NumberColumn(format="%.1f%%"),
+            'Correlation': st.column_config.NumberColumn(format="%.2f"),
+            'Beta': st.column_config.NumberColumn(format="%.2f"),
+            'Last': st.column_config.NumberColumn(format="%.2f"),
+        },
+    )
+    st.caption(f"상관계수/베타는 {result['benchmark']} 일간 수익률 기준입니다.")
+
+    tab_rs, tab_corr, tab_matrix = st.tabs(["상대 강도", "이동 상관계수", "상관계수 행렬"])
+    with tab_rs:
+        others = result['relative'].drop(columns=[result['benchmark']])
+        if others.empty:
+            st.caption("비교할 종목이 없습니다.")
+        else:
+            st.plotly_chart(_line_chart(others, f"{result['benchmark']} 대비 상대 강도 (1보다 크면 강세)", baseline=1),
+                            use_container_width=True)
+    with tab_corr:
+        rolling = result['rolling_corr']
+        if rolling is None or rolling.dropna(how='all').empty:
+            st.caption(f"상관계수를 계산하려면 {window}거래일 이상의 데이터가 필요합니다.")
+        else:
+            st.plotly_chart(_line_chart(rolling.dropna(how='all'), f"{result['benchmark']}와의 {window}일 이동 상관계수", baseline=0),
+                            use_container_width=True)
+    with tab_matrix:
+        st.plotly_chart(_correlation_heatmap(result['correlation']), use_container_width=True)
+
+
+@traced('page.compare')
+def render(symbols):
+    symbols = list(dict.fromkeys(symbols))
+    if len(symbols) > compare.MAX_SYMBOLS:
+        st.warning(f"최대 {compare.MAX_SYMBOLS}개 종목까지 비교할 수 있습니다. 앞의 {compare.MAX_SYMBOLS}개만 사용합니다.")
+        symbols = symbols[:compare.MAX_SYMBOLS]
+
+    with st.spinner('주가 데이터 불러오는 중...'):
+        matrix, failed = compare.load_close_matrix(tuple(symbols))
+
+    st.header(f"📊 종목 비교 ({matrix.shape[1]}개)")
+
+    if failed:
+        st.warning(f"데이터를 찾을 수 없는 종목: {', '.join(failed)}")
+    if matrix.empty:
+        st.error("비교할 수 있는 종목이 없습니다.")
+        return
+
+    render_charts(matrix)
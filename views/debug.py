@@ -0,0 +1,43 @@
+"""
+디버그 패널 (?debug=1): 이번 실행의 구간별 시간과 누적 p50/p95, 캐시 상태.
+"""
+import pandas as pd
+import streamlit as st
+
+import tracing
+from cache import cache_stats
+
+
+def render():
+    st.markdown("---")
+    with st.expander("🛠 Debug: 구간별 실행 시간", expanded=True):
+        spans = tracing.request_spans()
+        if spans:
+            st.caption("이번 실행 (호출 순서)")
+            st.dataframe(pd.DataFrame([{
+                '구간': s.name,
+                'ms': round(s.seconds * 1000, 1),
+                'cache': {True: 'hit', False: 'miss'}.get(s.hit, ''),
+                'KB': round(s.nbytes / 1024, 1) if s.nbytes else None,
+            } for s in spans]), use_container_width=True, hide_index=True)
+
+        summary = tracing.summary()
+        if summary:
+            st.caption("프로세스 누적 (최근 샘플 기준 p50/p95)")
+            df = pd.DataFrame.from_dict(summary, orient='index').sort_values('p95_ms', ascending=False)
+            st.dataframe(df.round(1), use_container_width=True)
+
+        stats = cache_stats()
+        if stats:
+            st.caption("shared_cache 저장소")
+            st.dataframe(pd.DataFrame.from_dict(stats, orient='index'), use_container_width=True)
+
+
+def render_profile(path, rows):
+    """프로파일링 모드(?profile=1)의 결과: 누적 시간 기준 상위 함수."""
+    with st.expander("🔬 Profile: 이번 rerun의 상위 함수 (cProfile)", expanded=True):
+        if path:
+            st.caption(f"저장됨: `{path}` — `python profiling.py stats {path}` 또는 snakeviz로 열 수 있습니다.")
+        df = pd.DataFrame(rows)
+        if not df.empty:
+            st.dataframe(df.round(1), use_container_width=True, hide_index=True)
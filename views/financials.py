@@ -0,0 +1,280 @@
+"""
+섹션 4: 재무 데이터 시각화 (차트 / 재무제표 표).
+
+연간/분기 라디오를 포함한 fragment라서 보고서 기준을 바꾸면 이 섹션만 다시 실행됩니다.
+"""
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from ratios import load_ratio_history, RATIO_LABELS
+from statements import load_statement_view
+from utils import format_currency
+from tracing import traced
+
+
+# 공통 차트 설정 함수 (Bar + Line for Growth)
+def create_bar_chart(df, y_col, title, color_seq=None):
+    from plotly.subplots import make_subplots
+
+    # Side-effect 방지를 위한 복사
+    plot_df = df.copy()
+
+    # 날짜순 정렬 보장
+    plot_df = plot_df.sort_index()
+
+    # [Growth Calculation]
+    # pct_change() computes percentage change from immediately previous row
+    # 첫 번째 값은 NaN이 됨
+    plot_df['Pct_Change'] = plot_df[y_col].pct_change() * 100
+
+    col_nametext = f'{y_col}_Text'
+    plot_df[col_nametext] = plot_df[y_col].apply(format_currency)
+
+    # X축 레이블
+    plot_df['X_Label'] = plot_df['Date_Str'] + "<br>(" + plot_df[col_nametext] + ")"
+
+    # Create Dual Axis Chart
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+    # 1. Bar Chart (Left Axis - Amount)
+    bar_color = color_seq[0] if color_seq else '#636efa' # Default Plotly Blue
+    fig.add_trace(
+        go.Bar(
+            x=plot_df['X_Label'], 
+            y=plot_df[y_col], 
+            name="Amount",
+            marker_color=bar_color,
+            hovertemplate='%{x}<br>Amount: %{text}',
+            text=plot_df[col_nametext] # For hover info mapping
+        ),
+        secondary_y=False
+    )
+
+    # 2. Line Chart (Right Axis - Growth %)
+    fig.add_trace(
+        go.Scatter(
+            x=plot_df['X_Label'], 
+            y=plot_df['Pct_Change'], 
+            name="Growth %",
+            mode='lines+markers+text',
+            line=dict(color='#ff3d00', width=2), # Red/Orange for visibility
+            marker=dict(size=6, color='#ff3d00'),
+            text=plot_df['Pct_Change'].apply(lambda x: f"{x:+.1f}%" if pd.notnull(x) else ""),
+            textposition="top center",
+            textfont=dict(color='white', size=10, weight='bold'),
+            hovertemplate='%{x}<br>Growth: %{y:+.2f}%'
+        ),
+        secondary_y=True
+    )
+
+    # Layout Updates
+    fig.update_layout(
+        title=dict(text=title, x=0, xanchor='left'),
+        showlegend=True,
+        height=400,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified" # Unified hover is nice for comparison
+    )
+
+    # Axes
+    fig.update_yaxes(title_text="", showgrid=True, gridcolor='rgba(128,128,128,0.2)', secondary_y=False)
+    fig.update_yaxes(title_text="", showgrid=False, zeroline=False, secondary_y=True) # Hide grid for right axis
+    fig.update_xaxes(title_text='', type='category')
+
+    # 막대 텍스트 제거 (X축으로 옮겼으므로)
+    return fig
+
+
+@traced('section.financials.table')
+def display_styled_financials(title, ticker_symbol, statement, freq_option):
+    # 번역/증감률/서식/색상은 statements.load_statement_view에서 (종목, 재무제표, 연간/분기)별로 캐시
+    view = load_statement_view(ticker_symbol, statement, freq_option != "연간 (Annual)")
+    if view is None:
+        return
+
+    st.subheader(title)
+
+    # 미리 계산한 CSS 표를 한 번에 적용 (셀별 콜백 없음)
+    css = view['css']
+    styler = view['display'].style.apply(lambda _: css, axis=None)
+    st.dataframe(styler, use_container_width=True, height=400)
+
+
+# 비율 추이 차트 구성: (제목, 비율 목록, 백분율 여부)
+RATIO_CHARTS = (
+    ("수익성 (Margins)", ('gross_margin', 'operating_margin', 'net_margin', 'fcf_margin'), True),
+    ("자본 효율 (Returns)", ('roe', 'roa'), True),
+    ("재무 안정성 (Leverage / Liquidity)", ('debt_to_equity', 'current_ratio'), False),
+)
+
+
+def create_ratio_chart(ratios, columns, title, percent):
+    fig = go.Figure()
+    x_labels = ratios.index.strftime('%b %Y')
+    for col in columns:
+        series = ratios[col]
+        if series.notna().sum() == 0:
+            continue
+        y = series * 100 if percent else series
+        fig.add_trace(go.Scatter(
+            x=x_labels, y=y, name=RATIO_LABELS[col], mode='lines+markers',
+            hovertemplate='%{x}<br>' + RATIO_LABELS[col] + (': %{y:.1f}%' if percent else ': %{y:.2f}') + '<extra></extra>',
+        ))
+    fig.update_layout(
+        title=dict(text=title, x=0, xanchor='left'),
+        height=350,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+    )
+    fig.update_yaxes(ticksuffix='%' if percent else '', showgrid=True, gridcolor='rgba(128,128,128,0.2)')
+    fig.update_xaxes(type='category')
+    return fig
+
+
+@traced('section.financials.ratios')
+def render_ratio_trends(ticker_symbol, freq_option):
+    quarterly = freq_option != "연간 (Annual)"
+    ratios = load_ratio_history(ticker_symbol, quarterly)
+    if ratios is None or ratios.empty or ratios.notna().sum().sum() == 0:
+        st.info("비율을 계산할 재무제표 데이터가 없습니다.")
+        return
+
+    chart_cols = st.columns(len(RATIO_CHARTS))
+    for col, (title, columns, percent) in zip(chart_cols, RATIO_CHARTS):
+        with col:
+            st.plotly_chart(create_ratio_chart(ratios, columns, title, percent), use_container_width=True)
+
+    # 기간별 표 (최신이 왼쪽)
+    table = ratios.sort_index(ascending=False).T
+    table.columns = table.columns.strftime('%Y-%m-%d')
+    percent_rows = [c for _, columns, percent in RATIO_CHARTS if percent for c in columns]
+    formatted = table.astype(object)
+    for row in table.index:
+        fmt_str = "{:.1%}" if row in percent_rows else "{:.2f}"
+        formatted.loc[row] = [fmt_str.format(v) if pd.notnull(v) else "-" for v in table.loc[row]]
+    formatted.index = [RATIO_LABELS[r] for r in formatted.index]
+    st.dataframe(formatted, use_container_width=True)
+    if quarterly:
+        st.caption("분기 ROE/ROA는 분기 순이익 × 4로 연환산한 값입니다. 비율은 각 기간 말 재무상태표 기준입니다.")
+    else:
+        st.caption("비율은 각 회계연도 말 재무상태표 기준입니다 (기초·기말 평균이 아님).")
+
+
+@st.fragment
+@traced('section.financials')
+def render(ticker_symbol, financials, quarterly_financials, balance_sheet, quarterly_balance_sheet, cashflow, quarterly_cashflow):
+
+    # -----------------------------------------------------
+    # 섹션 4: 재무 데이터 시각화 (Financials Container)
+    # -----------------------------------------------------
+    with st.container():
+        # Layout: Header/Options (Left) | Horizontal Ad (Right)
+        st.header("📊 재무 데이터 시각화")
+        # 연간/분기 선택 라디오 버튼
+        freq_option = st.radio("보고서 기준", ["연간 (Annual)", "분기별 (Quarterly)"], horizontal=True, key=f"freq_{ticker_symbol}")
+
+        if freq_option == "연간 (Annual)":
+            bs_data = balance_sheet
+            fin_data = financials
+            cf_data = cashflow
+        else:
+            bs_data = quarterly_balance_sheet
+            fin_data = quarterly_financials
+            cf_data = quarterly_cashflow
+
+        # Tabs (Full Width)
+        tab_viz, tab_data, tab_ratio = st.tabs(["차트 보기", "데이터 보기", "비율 추이"])
+
+        # 재무제표가 있는 경우에만 처리
+        if fin_data is not None and not fin_data.empty:
+            # Transpose for easy plotting: Columns become dates, rows become metrics
+            fin_T = fin_data.T
+            # 인덱스(날짜)를 Datetime으로 변환하고 오름차순 정렬 (시계열 일치)
+            fin_T.index = pd.to_datetime(fin_T.index)
+            fin_T = fin_T.sort_index()
+
+            # 그래프 표시를 위해 날짜 포맷 변경 (예: Mar 2023)
+            fin_T_plot = fin_T.copy()
+            fin_T_plot['Date_Str'] = fin_T_plot.index.strftime('%b %Y')
+
+            with tab_viz:
+                viz_col1, viz_col2, viz_col3 = st.columns(3)
+
+
+                # 1. 매출액 (Total Revenue)
+                with viz_col1:
+                    if 'Total Revenue' in fin_data.index:
+                        fig_rev = create_bar_chart(fin_T_plot, 'Total Revenue', f'매출액 ({freq_option})')
+                        st.plotly_chart(fig_rev, use_container_width=True)
+
+                # 2. 순이익 (Net Income)
+                with viz_col2:
+                    if 'Net Income' in fin_data.index:
+                        fig_net = create_bar_chart(fin_T_plot, 'Net Income', f'순이익 ({freq_option})', ['#2ca02c'])
+                        st.plotly_chart(fig_net, use_container_width=True)
+
+                # 3. 영업이익 (Operating Income)
+                with viz_col3:
+                    if 'Operating Income' in fin_data.index:
+                        # 영업이익도 막대그래프로 변경
+                        fig_op = create_bar_chart(fin_T_plot, 'Operating Income', f'영업이익 ({freq_option})', ['#ff7f0e'])
+                        st.plotly_chart(fig_op, use_container_width=True)
+
+                # [NEW] 현금흐름표 차트 추가
+                if cf_data is not None and not cf_data.empty:
+                    # 현금흐름 데이터 전처리
+                    cf_T = cf_data.T
+                    cf_T.index = pd.to_datetime(cf_T.index)
+                    cf_T = cf_T.sort_index()
+
+                    cf_T_plot = cf_T.copy()
+                    cf_T_plot['Date_Str'] = cf_T_plot.index.strftime('%b %Y')
+
+                    with st.container():
+                        cf_col1, cf_col2, cf_col3 = st.columns(3)
+
+                        # 4. 영업활동 현금흐름
+                        with cf_col1:
+                            if 'Operating Cash Flow' in cf_data.index:
+                                fig_ocf = create_bar_chart(cf_T_plot, 'Operating Cash Flow', f'영업활동 현금흐름 ({freq_option})', ['#17becf'])
+                                st.plotly_chart(fig_ocf, use_container_width=True)
+
+                        # 5. 투자활동 현금흐름
+                        with cf_col2:
+                            if 'Investing Cash Flow' in cf_data.index:
+                                fig_icf = create_bar_chart(cf_T_plot, 'Investing Cash Flow', f'투자활동 현금흐름 ({freq_option})', ['#9467bd'])
+                                st.plotly_chart(fig_icf, use_container_width=True)
+
+                        # 6. 재무활동 현금흐름
+                        with cf_col3:
+                            if 'Financing Cash Flow' in cf_data.index:
+                                fig_fcf = create_bar_chart(cf_T_plot, 'Financing Cash Flow', f'재무활동 현금흐름 ({freq_option})', ['#bcbd22'])
+                                st.plotly_chart(fig_fcf, use_container_width=True)
+
+            st.info("💡 가이드\n\n 순이익과 영업이익만 보고 기업의 모든 것을 판단해서는 안됩니다. 순이익과 영업이익은 생각보다 오염되기 쉽습니다. 인수합병, 자산상각, 임직원의 스톡옵션 행사 등 수많은 요소들이 영향을 미칠 수 있고, 심한 경우 경영진들이 의도적으로 부풀리거나 축소할 수도 있습니다. 특히나 임직원들의 스톡옵션 행사 비율이 높은 초기 IT 기업의 경우 순이익과 영업이익이 마이너스로 표기되는 경우가 많습니다.\n\n 기업이 제대로 돈을 벌고 있는지 확인하고 싶다면, 영업활동 현금흐름을 확인하는 것도 좋은 방법이 될 수 있습니다. 우량한 기업들의 경우 영업활동 현금흐름이 +, 투자활동, 재무활동 현금흐름이 -로 표기되는 경우가 많습니다. (금융 기업들의 경우 영업활동 현금흐름이 -로 표기되고, 재무활동 현금흐름이 +로 표기되는 경우도 있으니 참고하시기 바랍니다.)")
+
+            with tab_data:
+
+                # -----------------------------------------------------------------
+                # [NEW] Enhanced Financial Data Table with Growth % and Coloring
+                # -----------------------------------------------------------------
+
+
+                # 렌더링 실행
+                display_styled_financials("손익계산서", ticker_symbol, 'income', freq_option)
+
+                if bs_data is not None:
+                    st.markdown("---")
+                    display_styled_financials("대차대조표", ticker_symbol, 'balance', freq_option)
+
+                if cf_data is not None:
+                    st.markdown("---")
+                    display_styled_financials("현금흐름표", ticker_symbol, 'cashflow', freq_option)
+
+            with tab_ratio:
+                render_ratio_trends(ticker_symbol, freq_option)
@@ -0,0 +1,132 @@
+"""
+공통 헤더: 로고(홈 링크)와 종목 검색창.
+"""
+import base64
+
+import streamlit as st
+
+from data import get_all_tickers_dict, is_valid_symbol
+from tracing import traced
+
+
+def get_base64_of_bin_file(bin_file):
+    with open(bin_file, 'rb') as f:
+        data = f.read()
+    return base64.b64encode(data).decode()
+
+
+def resolve_ticker(query, ticker_map):
+    """
+    검색어를 티커로 변환합니다: 티커 직접 매칭 → 기업명 부분 일치 → 입력값 그대로.
+    """
+    if not query: return None
+    q = query.strip()
+
+    # A. 티커 직접 매칭 (대문자로 변환하여 확인)
+    q_upper = q.upper()
+    if q_upper in ticker_map.values():
+        return q_upper
+
+    # B. 기업명 검색 (부분 일치 Case-insensitive)
+    # 키 형식: "Apple Inc. (AAPL)" 등
+    q_lower = q.lower()
+    for label, ticker in ticker_map.items():
+        if q_lower in label.lower():
+            return ticker
+
+    # C. 매칭 실패 시 입력값 그대로 티커로 사용 (직접 입력 모드)
+    return q_upper
+
+
+def resolve_compare_query(query, ticker_map):
+    """
+    쉼표로 구분한 여러 검색어를 티커 목록으로 변환합니다 (비교 화면용, 중복 제거).
+    """
+    tickers = [resolve_ticker(part, ticker_map) for part in query.split(',') if part.strip()]
+    return list(dict.fromkeys(tickers))
+
+
+@traced('section.header')
+def render():
+    """
+    헤더를 그리고 현재 선택된 티커(대문자, 없으면 "")를 반환합니다.
+    """
+    # [Logo 2.0] [Search 3.5] [Empty 4.5] -> Search takes ~35% width
+    col_header_logo, col_header_search, col_header_empty = st.columns([0.2, 0.35, 0.45])
+
+    with col_header_logo:
+        try:
+            logo_b64 = get_base64_of_bin_file("assets/logo.png")
+            # Clickable Logo -> Refreshes Page (Home)
+            st.markdown(
+                f"""
+                <style>
+                    .logo-img-hover {{
+                        width: 90%;
+                        max-width: 220px;
+                        border-radius: 15px;
+                        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+                        filter: drop-shadow(0 4px 6px rgba(0,0,0,0.3));
+                        opacity: 0.95;
+                    }}
+                    .logo-img-hover:hover {{
+                        transform: scale(1.05) translateY(-2px);
+                        filter: drop-shadow(0 10px 20px rgba(41, 98, 255, 0.5)) brightness(1.1);
+                        opacity: 1;
+                        cursor: pointer;
+                    }}
+                </style>
+                <a href="." target="_self" style="text-decoration: none;">
+                    <img src="data:image/png;base64,{logo_b64}" 
+                         class="logo-img-hover"
+                         alt="Benjamin Financial Analysis">
+                </a>
+                """,
+                unsafe_allow_html=True
+            )
+        except Exception:
+            # Fallback Text Title (Clickable)
+            st.markdown('<a href="." target="_self" style="text-decoration: none; color: white;"><h2>📈 Benjamin</h2></a>', unsafe_allow_html=True)
+
+    with col_header_search:
+        st.markdown('<div style="margin-top: 0px;"></div>', unsafe_allow_html=True)
+
+        # 1. 맵 데이터 로드
+        ticker_map = get_all_tickers_dict()
+
+        # 2. Unified Search Input
+        # 현재 세션의 티커를 기본값으로 표시
+        current_val = st.session_state.ticker_symbol
+
+        search_query = st.text_input(
+            label="주식 검색 (티커를 입력)",
+            value=current_val,
+            placeholder="티커(AAPL, GOOGL, MSFT) 입력...",
+            label_visibility="visible"
+            # key를 지정하지 않음으로써 value 변경 시 UI 업데이트가 자연스럽게 되도록 유도
+        )
+
+        # 3. 변경 감지 및 처리
+        if search_query != st.session_state.ticker_symbol:
+            # 쉼표로 여러 종목을 입력하면 비교 화면 (존재 여부는 비교 화면에서 주가를 불러올 때 확인)
+            compare_tickers = resolve_compare_query(search_query, ticker_map) if ',' in search_query else []
+            if len(compare_tickers) > 1:
+                if ",".join(compare_tickers) != st.session_state.ticker_symbol:
+                    st.session_state.ticker_symbol = ",".join(compare_tickers)
+                    st.rerun()
+                new_ticker = None
+            else:
+                new_ticker = compare_tickers[0] if compare_tickers else resolve_ticker(search_query, ticker_map)
+            if new_ticker:
+                # 직접 입력 모드의 티커는 전체 데이터 조회 전에 존재 여부부터 확인
+                # (확인 요청 자체가 실패하면 None이므로 그대로 진행하고 분석 화면에서 오류를 보여줌)
+                if is_valid_symbol(new_ticker) is False:
+                    st.error(f"'{search_query.strip()}'에 해당하는 종목을 찾을 수 없습니다.")
+                # 입력값과 다른 티커가 리졸브 되었다면 (예: Apple -> AAPL)
+                # 혹은 그냥 직접 입력 티커라면
+                elif new_ticker != st.session_state.ticker_symbol:
+                    st.session_state.ticker_symbol = new_ticker
+                    st.rerun()
+
+    # 편의를 위해 변수에 할당 (st.session_state.ticker_symbol과 동일)
+    return st.session_state.ticker_symbol.upper() if st.session_state.ticker_symbol else ""
@@ -0,0 +1,189 @@
+"""
+섹션 6: 내부자 거래 (Insider Trading).
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data import load_insider_trading
+from utils import format_currency, fmt_bn
+from insider_analytics import activity_windows, SIDE_BUY, SIDE_SELL
+from tracing import traced
+
+
+# 매수/매도 행 색상 (숨김 컬럼 Side 기준, 표 전체를 한 번에 계산)
+SIDE_ROW_STYLES = {
+    SIDE_BUY: 'background-color: rgba(0, 200, 83, 0.2)', # Green
+    SIDE_SELL: 'background-color: rgba(255, 75, 75, 0.2)', # Red
+}
+
+def highlight_insider(df):
+    row_styles = df['Side'].astype(str).map(SIDE_ROW_STYLES).fillna('').to_numpy()
+    return pd.DataFrame(np.repeat(row_styles[:, None], df.shape[1], axis=1), index=df.index, columns=df.columns)
+
+
+@traced('section.insider')
+def render(ticker_symbol):
+    # -----------------------------------------------------
+    # 섹션 6: 내부자 거래 (Insider Trading)
+    # -----------------------------------------------------
+    st.markdown("---")
+    st.header("👔 내부자 거래 (Insider Trading)")
+
+    insider_data = load_insider_trading(ticker_symbol)
+
+    if insider_data is not None and not insider_data.empty:
+         st.info("💡 **가이드**: 내부자(경영진/주요주주)의 매수(Buy)는 기업 미래에 대한 자신감을, 매도(Sell)는 차익 실현을 의미할 수 있습니다.\n\n 전설적인 투자자 피터 린치는 내부자 매도는 여러 가지 이유가 있을 수 있지만, 내부자 매수의 이유는 한 가지라고 했습니다. 기업의 경영진으로서, 지금보다 주가가 더 오를 것이라고 판단하기 때문입니다.")
+
+         # load_insider_trading이 날짜/금액 파싱, Side 분류, 최신순 정렬까지 마친 상태로 돌려줍니다.
+         # (캐시된 원본의 얕은 복사본이므로 아래에서 컬럼을 바꿔도 원본은 그대로입니다)
+         disp_insider = insider_data
+
+         # --- [NEW] Ratio Analysis Logic ---
+         try:
+             # 1/3/6/12개월 집계를 한 번에 계산, 비율 막대는 최근 1년 기준
+             windows = activity_windows(insider_data)
+             last_year = windows.loc['12M']
+             buy_count, sell_count = int(last_year['buy_count']), int(last_year['sell_count'])
+             buy_val, sell_val = last_year['buy_value'], last_year['sell_value']
+
+             total_count = buy_count + sell_count
+             total_val = buy_val + sell_val
+
+             if total_count > 0:
+                 buy_ratio = buy_count / total_count
+                 sell_ratio = sell_count / total_count
+
+                 st.markdown(f"**최근 1년 매수/매도 비율 (Total: {total_count}건)**")
+
+                 # 1. Count Ratio Bar
+                 st.markdown(f"""
+                 <div style="display: flex; align-items: center; margin-bottom: 10px;">
+                    <div style="width: 80px; font-size: 0.8rem; color: #ccc;">건수 (Count)</div>
+                    <div style="flex-grow: 1; margin-right: 10px;">
+                        <div style="display: flex; height: 18px; border-radius: 9px; overflow: hidden; background-color: #333;">
+                            <div style="width: {buy_ratio*100}%; background-color: #00C853; display: flex; align-items: center; justify-content: center; color: black; font-size: 0.7rem; font-weight: bold;">
+                                {buy_count}
+                            </div>
+                            <div style="width: {sell_ratio*100}%; background-color: #FF3D00; display: flex; align-items: center; justify-content: center; color: white; font-size: 0.7rem; font-weight: bold;">
+                                {sell_count}
+                            </div>
+                        </div>
+                    </div>
+                    <div style="font-size: 0.8rem; color: #ddd; width: 120px; text-align: right;">
+                        <span style="color: #00C853;">{buy_ratio*100:.0f}%</span> vs <span style="color: #FF3D00;">{sell_ratio*100:.0f}%</span>
+                    </div>
+                 </div>
+                 """, unsafe_allow_html=True)
+
+                 # 2. Value Ratio Bar
+                 if total_val > 0:
+                     buy_val_ratio = buy_val / total_val
+                     sell_val_ratio = sell_val / total_val
+
+                     # Format values nicely (e.g. 1.2M)
+                     b_val_str = fmt_bn(buy_val)
+                     s_val_str = fmt_bn(sell_val)
+
+                     st.markdown(f"""
+                     <div style="display: flex; align-items: center; margin-bottom: 20px;">
+                        <div style="width: 80px; font-size: 0.8rem; color: #ccc;">금액 (Value)</div>
+                        <div style="flex-grow: 1; margin-right: 10px;">
+                            <div style="display: flex; height: 18px; border-radius: 9px; overflow: hidden; background-color: #333;">
+                                <div style="width: {buy_val_ratio*100}%; background-color: #00C853; display: flex; align-items: center; justify-content: center; color: black; font-size: 0.7rem; font-weight: bold;">
+                                    {b_val_str}
+                                </div>
+                                <div style="width: {sell_val_ratio*100}%; background-color: #FF3D00; display: flex; align-items: center; justify-content: center; color: white; font-size: 0.7rem; font-weight: bold;">
+                                    {s_val_str}
+                                </div>
+                            </div>
+                        </div>
+                        <div style="font-size: 0.8rem; color: #ddd; width: 120px; text-align: right;">
+                            <span style="color: #00C853;">{buy_val_ratio*100:.0f}%</span> vs <span style="color: #FF3D00;">{sell_val_ratio*100:.0f}%</span>
+                        </div>
+                     </div>
+                     """, unsafe_allow_html=True)
+
+             # 기간별 매수/매도와 순매수 비율 (금액 기준, +면 매수 우위)
+             if total_count > 0:
+                 window_table = pd.DataFrame({
+                     '매수 건수': windows['buy_count'],
+                     '매도 건수': windows['sell_count'],
+                     '매수 금액': windows['buy_value'].map(format_currency),
+                     '매도 금액': windows['sell_value'].map(format_currency),
+                     '순매수 비율': windows['net_buy_ratio'].map(lambda x: f"{x:+.0%}" if pd.notnull(x) else "-"),
+                 }).rename(index=lambda w: f"최근 {w[:-1]}개월")
+                 st.dataframe(window_table, use_container_width=True)
+         except Exception as e:
+             # st.error(f"비율 계산 중 오류: {e}")
+             pass
+         # ----------------------------------
+
+         # 1. Map Ownership ('D' -> Direct, 'I' -> Indirect)
+         for owner_col in ['Ownership', 'Ownership Type']:
+             if owner_col in disp_insider.columns:
+                 disp_insider[owner_col] = disp_insider[owner_col].map({'D': 'Direct', 'I': 'Indirect'}).fillna(disp_insider[owner_col])
+
+         # Create Price Column if not exists
+         if 'Value' in disp_insider.columns and 'Shares' in disp_insider.columns:
+             # Calculate Price = Value / Shares (Value/Shares는 로드 시 숫자로 변환됨, 0주는 NaN)
+             disp_insider['Price'] = (disp_insider['Value'] / disp_insider['Shares'].replace(0, np.nan)).round(2)
+
+
+         # 3. Format Numbers (K, M, B)
+         # Apply formatting directly to DataFrame columns for robust display
+
+         if 'Value' in disp_insider.columns:
+             # Use format_currency for K, M, B support
+             disp_insider['Value'] = disp_insider['Value'].apply(lambda x: format_currency(x) if pd.notnull(x) else x)
+
+         if 'Shares' in disp_insider.columns:
+             disp_insider['Shares'] = disp_insider['Shares'].apply(lambda x: format_currency(x) if pd.notnull(x) else x)
+
+         if 'Price' in disp_insider.columns:
+             # User requested no decimal representation for Price (Integer)
+             disp_insider['Price'] = disp_insider['Price'].apply(lambda x: f"${x:,.0f}" if pd.notnull(x) else None)
+
+         # [NEW] 컬럼명 한글 변환
+         # 화면 표시용이므로 포맷팅 이후에 변경
+         insider_col_map = {
+             "Start Date": "날짜",
+             "Insider": "내부자",
+             "Relation": "직위",
+             "Position": "직위", 
+             "Shares": "수량",
+             "Value": "금액",
+             "Price": "평단가",
+             "Ownership": "소유 형태",
+             "Ownership Type": "소유 형태"
+         }
+         disp_insider.rename(columns=insider_col_map, inplace=True)
+
+         # Create Styler
+         styler = disp_insider.style.apply(highlight_insider, axis=None)
+
+         # Format Columns (Removed styler specific formats as we did it in DF)
+         # if 'Value' in disp_insider.columns:
+         #      styler.format({'Value': '${:,.0f}'}) 
+         # ...
+
+         # Hide Columns
+         cols_to_hide = ['URL', 'Transaction', 'Text', 'SEC Form 4', 'Id', 'Side']
+         existing_cols_to_hide = [c for c in cols_to_hide if c in disp_insider.columns]
+         styler.hide(axis="columns", subset=existing_cols_to_hide)
+
+         # Configure Columns
+         hide_config = {
+             "날짜": st.column_config.DateColumn("날짜", format="YYYY-MM-DD"),
+         }
+         for c in existing_cols_to_hide:
+             hide_config[c] = None # Ensure logic hides them in dataframe config too depending on streamlit version
+
+         st.dataframe(
+              styler,
+              use_container_width=True,
+              hide_index=True,
+              column_config=hide_config
+         )
+    else:
+        st.write("최근 내부자 거래 내역이 없습니다.")
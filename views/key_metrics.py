@@ -0,0 +1,182 @@
+"""
+섹션 2.5: 핵심 지표 대시보드 (Finviz 스타일).
+"""
+import streamlit as st
+
+import sector_stats
+from styles import create_finviz_row
+from utils import fmt, fmt_bn
+from tracing import traced
+
+
+@traced('section.key_metrics')
+def render(ticker_symbol, history, info, financials, balance_sheet):
+    # -----------------------------------------------------
+    # 섹션 2.5: 핵심 지표 대시보드 (Key Metrics)
+    # -----------------------------------------------------
+    with st.container():
+        if info:
+            # -------------------------
+            # Data Extraction
+            # -------------------------
+            # Col 1
+            index_name = "S&P 500" # Placeholder
+            mkt_cap = info.get('marketCap')
+            income = info.get('netIncomeToCommon')
+            sales = info.get('totalRevenue')
+            book_sh = info.get('bookValue')
+            shares = info.get('sharesOutstanding')
+            cash_sh = (info.get('totalCash') / shares) if (info.get('totalCash') and shares) else None
+            div_yield = info.get('dividendYield') # yfinance 1.x는 % 값 (0.52 = 0.52%)
+
+            # Col 2
+            employees = info.get('fullTimeEmployees')
+            recom = info.get('recommendationMean')
+            pe_ratio = info.get('trailingPE')
+            fwd_pe = info.get('forwardPE')
+
+            # Col 3
+            peg_ratio = info.get('pegRatio')
+            if peg_ratio is None: peg_ratio = info.get('trailingPegRatio')
+
+            ps_ratio = info.get('priceToSalesTrailing12Months')
+            pb_ratio = info.get('priceToBook')
+
+            # P/C, P/FCF Helper
+            total_cash = info.get('totalCash')
+            fcf = info.get('freeCashflow')
+            pc_ratio = (mkt_cap / total_cash) if (mkt_cap and total_cash) else None
+            pfcf_ratio = (mkt_cap / fcf) if (mkt_cap and fcf) else None
+
+            quick_ratio = info.get('quickRatio')
+            current_ratio = info.get('currentRatio')
+
+            # Col 4
+            debt_eq = info.get('debtToEquity') # Usually returned as a number like 0.5 or 50? YF returns percentage usually, e.g. 150.
+            lt_debt_eq = None # Not directly avail
+
+            roa = info.get('returnOnAssets')
+            roe = info.get('returnOnEquity')
+            gross_margin = info.get('grossMargins')
+
+            # ROIC (Custom)
+            roic = None
+            try:
+                if financials is not None and balance_sheet is not None:
+                    op_inc = financials.loc['Operating Income'].iloc[0] if 'Operating Income' in financials.index else None
+                    tax_prov = financials.loc['Tax Provision'].iloc[0] if 'Tax Provision' in financials.index else 0
+                    pretax = financials.loc['Pretax Income'].iloc[0] if 'Pretax Income' in financials.index else None
+                    equity = balance_sheet.loc['Stockholders Equity'].iloc[0] if 'Stockholders Equity' in balance_sheet.index else None
+                    debt = balance_sheet.loc['Total Debt'].iloc[0] if 'Total Debt' in balance_sheet.index else 0
+
+                    if op_inc and equity:
+                        tax_rate = (tax_prov / pretax) if (pretax and pretax != 0) else 0.21
+                        nopat = op_inc * (1 - tax_rate)
+                        inv_cap = equity + debt
+                        if inv_cap > 0: roic = nopat / inv_cap
+            except: pass
+
+            # Col 5
+            op_margin = info.get('operatingMargins')
+            profit_margin = info.get('profitMargins')
+            payout = info.get('payoutRatio')
+            insider_own = info.get('heldPercentInsiders')
+            inst_own = info.get('heldPercentInstitutions')
+
+            # Col 6 (Performance)
+            beta = info.get('beta')
+            prev_close = info.get('previousClose')
+            curr_price = history['Close'].iloc[-1] if not history.empty else 0
+            change = curr_price - prev_close if prev_close else 0
+            change_pct = (change / prev_close * 100) if prev_close else 0
+
+            # Perf Calcs
+            perf_week, perf_month, perf_year, volatility = None, None, None, None
+
+            # Length Safety Checks
+            hist_len = len(history)
+            if hist_len >= 5:
+                perf_week = (curr_price / history['Close'].iloc[-5] - 1) * 100
+            if hist_len >= 21:
+                perf_month = (curr_price / history['Close'].iloc[-21] - 1) * 100
+            if hist_len >= 252:
+                perf_year = (curr_price / history['Close'].iloc[-252] - 1) * 100
+
+            if hist_len > 20:
+                # Volatility (Annualized std dev of daily returns)
+                daily_ret = history['Close'].pct_change()
+                volatility = daily_ret.std() * (252 ** 0.5) * 100
+
+            # 섹터 내 백분위: sector_stats.py가 미리 만든 분위수 표에서 조회 (표가 없으면 표시하지 않음)
+            try:
+                ranks, sector = sector_stats.percentile_ranks(ticker_symbol, info)
+            except Exception:
+                ranks, sector = {}, None
+
+            def rank(metric):
+                return (*ranks[metric], sector) if metric in ranks else None
+
+            # -------------------------
+            # Rendering 6 Columns
+            # -------------------------
+            c1, c2, c3, c4, c5, c6 = st.columns(6)
+
+            with c1:
+                st.markdown(create_finviz_row("Index", "S&P 500"), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Market Cap", fmt_bn(mkt_cap), percentile=rank('market_cap')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Income", fmt_bn(income)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Sales", fmt_bn(sales)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Book/sh", fmt(book_sh)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Cash/sh", fmt(cash_sh)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Dividend", fmt(div_yield, suffix="%"), percentile=rank('dividend_yield')), unsafe_allow_html=True)
+
+            with c2:
+                st.markdown(create_finviz_row("Employees", fmt(employees, "{:,.0f}")), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Optionable", "Yes"), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Shortable", "Yes"), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Recom", fmt(recom), is_good=(recom and recom<2), is_bad=(recom and recom>3), percentile=rank('recom')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("P/E", fmt(pe_ratio), is_good=(pe_ratio and pe_ratio<15), is_bad=(pe_ratio and pe_ratio>50), percentile=rank('pe')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Forward P/E", fmt(fwd_pe), is_good=(fwd_pe and fwd_pe<15), percentile=rank('fwd_pe')), unsafe_allow_html=True)
+
+            with c3:
+                # PEG
+                peg_good = (peg_ratio and peg_ratio < 1)
+                peg_bad = (peg_ratio and peg_ratio > 2)
+                st.markdown(create_finviz_row("PEG", fmt(peg_ratio), is_good=peg_good, is_bad=peg_bad, percentile=rank('peg')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("P/S", fmt(ps_ratio), is_bad=(ps_ratio and ps_ratio>10), percentile=rank('ps')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("P/B", fmt(pb_ratio), percentile=rank('pb')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("P/C", fmt(pc_ratio)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("P/FCF", fmt(pfcf_ratio)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Quick Ratio", fmt(quick_ratio), is_good=(quick_ratio and quick_ratio>1), is_bad=(quick_ratio and quick_ratio<0.5)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Current Ratio", fmt(current_ratio), is_good=(current_ratio and current_ratio>1.5), percentile=rank('current_ratio')), unsafe_allow_html=True)
+
+            with c4:
+                st.markdown(create_finviz_row("Debt/Eq", fmt(debt_eq), is_bad=(debt_eq and debt_eq>200), percentile=rank('debt_eq')), unsafe_allow_html=True) # Assuming %
+                st.markdown(create_finviz_row("LT Debt/Eq", "-"), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("ROA", fmt(roa, scale=100, suffix="%"), is_good=(roa and roa>0.15), is_bad=(roa and roa<0), percentile=rank('roa')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("ROE", fmt(roe, scale=100, suffix="%"), is_good=(roe and roe>0.20), is_bad=(roe and roe<0), percentile=rank('roe')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("ROIC", fmt(roic, scale=100, suffix="%"), is_good=(roic and roic>0.15)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Gross Margin", fmt(gross_margin, scale=100, suffix="%"), is_good=(gross_margin and gross_margin>0.4), percentile=rank('gross_margin')), unsafe_allow_html=True)
+
+            with c5:
+                st.markdown(create_finviz_row("Oper. Margin", fmt(op_margin, scale=100, suffix="%"), is_good=(op_margin and op_margin>0.2), percentile=rank('op_margin')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Profit Margin", fmt(profit_margin, scale=100, suffix="%"), is_good=(profit_margin and profit_margin>0.2), percentile=rank('profit_margin')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Payout", fmt(payout, scale=100, suffix="%"), percentile=rank('payout')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Insider Own", fmt(insider_own, scale=100, suffix="%"), percentile=rank('insider_own')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Inst Own", fmt(inst_own, scale=100, suffix="%"), percentile=rank('inst_own')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("SMA20", "-"), unsafe_allow_html=True) # Todo
+                st.markdown(create_finviz_row("SMA50", "-"), unsafe_allow_html=True)
+
+            with c6:
+                st.markdown(create_finviz_row("Perf Week", fmt(perf_week, suffix="%"), is_good=(perf_week and perf_week>0), is_bad=(perf_week and perf_week<0)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Perf Month", fmt(perf_month, suffix="%"), is_good=(perf_month and perf_month>0), is_bad=(perf_month and perf_month<0)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Perf Year", fmt(perf_year, suffix="%"), is_good=(perf_year and perf_year>0), is_bad=(perf_year and perf_year<0)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Volatility", fmt(volatility, suffix="%")), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Beta", fmt(beta), percentile=rank('beta')), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Prev Close", fmt(prev_close)), unsafe_allow_html=True)
+                st.markdown(create_finviz_row("Price", fmt(curr_price)), unsafe_allow_html=True)
+
+            pass
+        else:
+             st.info("지표 정보를 불러올 수 없습니다.")
+        st.markdown("---")
@@ -0,0 +1,308 @@
+"""
+초기 화면: 시장 티커, 주요 지수, Fear & Greed 지수, 퍼포먼스 맵.
+"""
+import streamlit as st
+
+from data import load_indices_data, fetch_fear_and_greed_index, load_market_ticker_data
+import insider_store
+from utils import create_fear_greed_gauge
+from tracing import traced
+from views import market_map, risk, screener
+
+
+def get_label(score):
+    try:
+        s = float(score)
+        if s < 25: return "Extreme Fear"
+        elif s < 45: return "Fear"
+        elif s <= 55: return "Neutral"
+        elif s < 75: return "Greed"
+        else: return "Extreme Greed"
+    except: return ""
+
+
+def get_color(label):
+    l = label.lower()
+    if 'extreme greed' in l: return "#66bb6a"
+    elif 'greed' in l: return "#9ccc65"
+    elif 'neutral' in l: return "#ffca28"
+    elif 'extreme fear' in l: return "#ef5350"
+    elif 'fear' in l: return "#ffa726"
+    return "#eeeeee"
+
+
+def render_history_row(title, val):
+    try: 
+        score = float(val)
+        label = get_label(score)
+        color = get_color(label)
+        value_str = f"{score:.0f}"
+    except: 
+        value_str = "-"
+        label = ""
+        color = "#ccc"
+
+    st.markdown(
+        f"""
+        <div style="margin-bottom: 20px;">
+            <div style="font-size: 1.2rem; color: #aaa; margin-bottom: 5px;">{title}</div>
+            <div style="font-size: 2.4rem; font-weight: bold; color: white;">
+                {value_str} <span style="font-size: 1.4rem; color: {color}; font-weight: 600; margin-left: 8px;">{label}</span>
+            </div>
+        </div>
+        """, 
+        unsafe_allow_html=True
+    )
+
+
+@traced('section.insider_clusters')
+def render_insider_clusters(days=30, min_insiders=3):
+    """
+    로컬 저장소(insider_store.py refresh로 미리 수집)에서 최근 내부자 집단 매수 종목을 보여줍니다.
+    화면에서는 수집하지 않으며, 저장소가 없으면 아무것도 표시하지 않습니다.
+    """
+    try:
+        summary = insider_store.store_summary()
+        if not summary:
+            return
+        clusters = insider_store.cluster_buys(days=days, min_insiders=min_insiders)
+    except Exception:
+        return
+
+    with st.expander(f"🕵️ 내부자 집단 매수 (최근 {days}일, {min_insiders}명 이상) — {len(clusters)}개 종목"):
+        if clusters.empty:
+            st.caption("조건에 맞는 종목이 없습니다.")
+        else:
+            st.dataframe(
+                clusters.rename(columns={
+                    'symbol': 'Symbol', 'insiders': '내부자 수', 'trades': '거래 수', 'shares': '주식 수',
+                    'value': '매수 금액', 'first_date': '첫 거래', 'last_date': '마지막 거래', 'names': '내부자',
+                }),
+                hide_index=True, use_container_width=True,
+                column_config={'매수 금액': st.column_config.NumberColumn(format="$%.0f"),
+                               '주식 수': st.column_config.NumberColumn(format="%.0f")},
+            )
+        refreshed = summary['refreshed_at']
+        st.caption(f"{summary['symbols']}개 종목, {summary['rows']:,}건 저장"
+                   + (f" · 마지막 수집 {refreshed:%Y-%m-%d %H:%M} UTC" if refreshed is not None else ""))
+
+
+@traced('page.landing')
+def render():
+    # ---------------------------------------------------------
+    # 초기 화면: S&P 500 스크리너 & 맵
+    # ---------------------------------------------------------
+
+    # -------------------------------------------------------------
+    # 0. Market Ticker Marquee (Top)
+    # -------------------------------------------------------------
+    ticker_data = load_market_ticker_data()
+    
+    if ticker_data:
+        ticker_items = []
+        for item in ticker_data:
+            color = "#00C853" if item['change'] >= 0 else "#FF3D00"
+            icon = "▲" if item['change'] >= 0 else "▼"
+            
+            # Format display
+            # item has 'prefix' ($ or empty) and 'suffix' (% or empty for yield, but we might want just unit)
+            # Actually for Yield let's say: "US 10Y Yield: 4.25% (▲ 1.2%)"
+            
+            price_str = f"{item['prefix']}{item['price']:,.2f}{item['suffix']}"
+            
+            # Change display
+            # If yield, change is also roughly in basis points terms from Yahoo, but change_pct is mostly what people look at for momentum or the absolute basis point move.
+            # Let's stick to Pct Change for consistency, or absolute change for Yield?
+            # User said: "Show as Yield"
+            # Usually for Yields, we show "4.25% (+0.05)" meaning +5 bps.
+            # But let's keep consistency with % change for now unless absolute is weird.
+            # Users often prefer simple % change of the value.
+            
+            # Conditionally show change
+            change_html = f"<span style='color: {color}; margin-left: 5px;'>{icon} {item['change_pct']:.2f}%</span>"
+            
+            # User request: "Crypto change remove"
+            if item.get('type') == 'crypto':
+                change_html = ""
+            
+            ticker_items.append(
+                f"<span style='margin-left: 20px; font-weight: bold; color: #ddd;'>{item['name']}</span> "
+                f"<span style='color: white;'>{price_str}</span> "
+                f"{change_html}"
+            )
+        
+        # 4x Duplication for smooth seamless loop on wide screens
+        # Animation: Move -25% (one full length of original content)
+        ticker_html_content = "".join(ticker_items) * 4  
+        
+        st.markdown(
+            f"""
+            <style>
+            @keyframes marquee {{
+                0%   {{ transform: translateX(0); }}
+                100% {{ transform: translateX(-25%); }}
+            }}
+            .marquee-container {{
+                width: 100%;
+                overflow: hidden;
+                white-space: nowrap;
+                box-sizing: border-box;
+                background-color: #0e1117;
+                border-bottom: 1px solid #333;
+                padding: 10px 0;
+                margin-bottom: 20px;
+            }}
+            .marquee-content {{
+                display: inline-block;
+                /* Remove padding-left to avoid jumpiness */
+                /* padding-left: 100%; */ 
+                animation: marquee 20s linear infinite;
+            }}
+            /* Faster animation for better feel */
+            .marquee-content:hover {{
+                animation-play-state: paused;
+            }}
+            </style>
+            <div class="marquee-container">
+                <div class="marquee-content">
+                    {ticker_html_content}
+                </div>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+    
+    st.markdown("---")
+    
+    # Market Index Screener (Indices)
+    indices_data = load_indices_data()
+    
+    if indices_data:
+        st.markdown("##### 🌏 주요 시장 지수 (Daily)")
+        idx_cols = st.columns(4)
+        idx_names = ["DOW", "NASDAQ", "S&P 500", "RUSSELL 2000"]
+        
+        for i, name in enumerate(idx_names):
+            if name in indices_data:
+                data = indices_data[name]
+                with idx_cols[i]:
+                    # Custom HTML Card (No st.container to avoid top padding)
+                    change_color = "#39e75f" if data['change'] >= 0 else "#ff4b4b"
+                    sign = "+" if data['change'] >= 0 else ""
+                    change_text = f"{sign}{data['change']:,.2f} ({sign}{data['pct_change']:.2f}%)"
+                    
+                    st.markdown(f"""
+                    <div style="
+                        border: 1px solid rgba(49, 51, 63, 0.2);
+                        border-radius: 0.25rem;
+                        padding: 10px;
+                        background-color: #1a1c24; 
+                        margin-bottom: 0px;
+                    ">
+                        <div style="display: flex; justify-content: space-between; align-items: center;">
+                            <div style="font-weight: bold; font-size: 1.0rem; color: #ddd;">{name}</div>
+                            <div style="text-align: right;">
+                                <div style="font-size: 1.1rem; font-weight: bold; color:white;">{data['price']:,.2f}</div>
+                                <div style="font-size: 0.8rem; color: {change_color};">{change_text}</div>
+                            </div>
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+    # Fear & Greed Index Section
+    fg_data = fetch_fear_and_greed_index()
+    if fg_data and fg_data.get('score') is not None:
+        st.markdown("---")
+        st.subheader("CNN Fear & Greed Index")
+        
+        # 3-Column Layout: [Gauge] | [Historical Values] | [Indicators] | [ Spacer ]
+        col_gauge, col_history, col_indicators, col_dummy = st.columns([0.4, 0.2, 0.35, 0.05])
+        
+        # 1. Gauge Chart (Left)
+        with col_gauge:
+            fig_fg = create_fear_greed_gauge(fg_data['score'])
+            if fig_fg:
+                # Increase height slightly for vertical feel if needed, or keep responsive
+                fig_fg.update_layout(height=400)
+                st.plotly_chart(fig_fg, use_container_width=True, key="fg_gauge")
+                ts = fg_data.get('timestamp')
+                if ts:
+                    st.caption(f"Last Updated: {ts}")
+        
+        # 2. Historical Values (Middle, Vertical)
+        with col_history:
+            st.markdown("##### Historical Values")
+            st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
+            
+
+            # Render rows
+            render_history_row("Prev Close", fg_data.get('previous_close'))
+            render_history_row("1 Week Ago", fg_data.get('previous_1_week'))
+            render_history_row("1 Month Ago", fg_data.get('previous_1_month'))
+            render_history_row("1 Year Ago", fg_data.get('previous_1_year'))
+
+        # 3. Sub-indicators (Right, Vertical)
+        with col_indicators:
+            st.markdown("##### Market Sentiment Indicators")
+            st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
+            
+            indicators_list = [
+                ('market_momentum', 'Market Momentum'),
+                ('stock_price_strength', 'Stock Price Strength'),
+                ('stock_price_breadth', 'Stock Price Breadth'),
+                ('put_call_options', 'Put and Call Options'),
+                ('market_volatility', 'Market Volatility'),
+                ('safe_haven_demand', 'Safe Haven Demand'),
+                ('junk_bond_demand', 'Junk Bond Demand')
+            ]
+            
+            for key, title in indicators_list:
+                data = fg_data.get(key, {})
+                rating = data.get('rating', 'N/A')
+                if isinstance(rating, str):
+                    rating = rating.title()
+                
+                # Color Mapping
+                r_lower = rating.lower()
+                if 'extreme greed' in r_lower: rating_color = "#66bb6a"
+                elif 'greed' in r_lower: rating_color = "#9ccc65"
+                elif 'neutral' in r_lower: rating_color = "#ffca28"
+                elif 'extreme fear' in r_lower: rating_color = "#ef5350"
+                elif 'fear' in r_lower: rating_color = "#ffa726"
+                else: rating_color = "#eeeeee"
+
+                score = data.get('score')
+                
+                # Format Score
+                score_str = f"{float(score):.2f}" if score else '-'
+                
+                # Compact Card
+                st.markdown(
+                    f"""
+                    <div style="
+                        background-color: #262730; 
+                        padding: 10px 15px; 
+                        border-radius: 6px; 
+                        border: 1px solid #444; 
+                        margin-bottom: 10px;
+                        display: flex; justify-content: space-between; align-items: center;
+                    ">
+                        <div style="font-size: 1.0rem; font-weight: 500; color: #eee;">{title}</div>
+                        <div style="text-align: right;">
+                            <div style="font-size: 1.25rem; font-weight: 800; color: {rating_color}; letter-spacing: 0.5px;">{rating}</div>
+                            <div style="font-size: 0.8rem; color: #999;">{score_str}</div>
+                        </div>
+                    </div>
+                    """, 
+                    unsafe_allow_html=True
+                )
+
+    st.markdown("---")
+
+    st.markdown("---")
+
+    render_insider_clusters()
+    screener.render()
+    risk.render_universe()
+
+    market_map.render()
@@ -0,0 +1,162 @@
+"""
+주요 지수 퍼포먼스 맵 (섹터별 트리맵).
+기간별 수익률은 price_store 일봉 행렬에서 한 번에 계산해 두므로 기간을 바꿔도 다시 받지 않습니다.
+"""
+import pandas as pd
+import streamlit as st
+
+import performance
+import price_store
+from data import load_sp500_tickers, load_dow_tickers, load_nasdaq_tickers, load_market_data
+from tracing import traced
+
+
+# 맵 그룹 기준: 라벨 -> 종류
+GROUPINGS = {"GICS 섹터": 'sector', "상관관계 클러스터": 'cluster'}
+
+
+@traced('section.market_map.clusters')
+def load_cluster_groups(tickers, sectors):
+    """
+    종목 -> 상관관계 클러스터 이름. 가격 행렬(price_store)이 없거나 부족하면 백그라운드에서 받기 시작하고
+    그동안은 None입니다. 클러스터링은 correlation.py에서 거래일마다 한 번만 계산합니다. 실패하면 None.
+    """
+    import correlation
+    try:
+        close, _ = price_store.ensure_updated(tickers)
+        if close is None or price_store.pending(tickers):
+            return None
+        labels, _ = correlation.load_clusters(tickers)
+        if labels is None or labels.empty:
+            return None
+        return correlation.name_clusters(labels, sectors)
+    except Exception:
+        return None
+
+
+@traced('section.market_map.performance')
+def load_horizon_data(tickers, horizon):
+    """
+    (Symbol, Price, PctChange, Volume, TradedValue) 표, 기간 시작일, 가격 저장소 사용 여부.
+    시작일에 상장 전이던 종목은 뺍니다. 가격 행렬을 쓸 수 없으면 최근 5일 일봉(load_market_data)의 1D 등락률로 대신합니다.
+    """
+    try:
+        table, dates = performance.load_performance(tickers)
+    except Exception:
+        table, dates = None, None
+    if table is None or table.empty:
+        return load_market_data(tickers), None, False
+    market_df = table[['Price', 'Volume', 'TradedValue']].assign(PctChange=table[horizon]).dropna(subset=['PctChange'])
+    return market_df.rename_axis('Symbol').reset_index(), dates[horizon], True
+
+
+# 주식 맵 렌더링 함수
+# 기간/그룹 라디오를 바꾸면 이 탭만 다시 실행됩니다.
+@st.fragment
+@traced('section.market_map.tab')
+def render_map_tab(index_name, load_tickers_func):
+    # plotly.express는 무거우므로 맵을 그릴 때 처음 import
+    import plotly.express as px
+
+    tickers_df, err = load_tickers_func()
+    if tickers_df is not None:
+         col_horizon, col_group = st.columns(2)
+         with col_horizon:
+             horizon = st.radio("기간", list(performance.HORIZONS), horizontal=True, key=f"map_horizon_{index_name}")
+         with col_group:
+             grouping = st.radio("그룹", list(GROUPINGS), horizontal=True, key=f"map_group_{index_name}",
+                                 help="상관관계 클러스터: 최근 1년 일간 수익률이 비슷하게 움직인 종목끼리 묶습니다 (하루 한 번 계산).")
+
+         # Auto load without button
+         with st.spinner(f"{index_name} 데이터를 불러오는 중..."):
+            tickers = tickers_df['Symbol'].tolist()
+            tickers = [str(t).replace('.', '-') for t in tickers]
+            market_df, start_date, stored = load_horizon_data(tickers, horizon)
+            if not stored:
+                horizon = '1D'
+
+            if market_df is not None and not market_df.empty:
+                tickers_df['Symbol_YF'] = tickers_df['Symbol'].astype(str).str.replace('.', '-')
+
+                # 컬럼 이름 표준화 (Sector, Name)
+                if 'GICS Sector' in tickers_df.columns:
+                    tickers_df['Sector'] = tickers_df['GICS Sector']
+                elif 'Sector' in tickers_df.columns: 
+                    tickers_df['Sector'] = tickers_df['Sector']
+                elif 'Industry' in tickers_df.columns:
+                    tickers_df['Sector'] = tickers_df['Industry']
+                else:
+                    tickers_df['Sector'] = 'Other'
+
+                if 'Security' in tickers_df.columns:
+                    tickers_df['Name'] = tickers_df['Security']
+                elif 'Company' in tickers_df.columns:
+                    tickers_df['Name'] = tickers_df['Company']
+                else:
+                    tickers_df['Name'] = tickers_df['Symbol']
+
+                merged_df = pd.merge(market_df, tickers_df[['Symbol_YF', 'Sector', 'Name']], 
+                                     left_on='Symbol', right_on='Symbol_YF')
+
+                merged_df['Group'] = merged_df['Sector']
+                if GROUPINGS[grouping] == 'cluster':
+                    clusters = load_cluster_groups(tickers, merged_df.set_index('Symbol')['Sector'])
+                    if clusters is None:
+                        st.caption("가격 이력을 받는 중이라 GICS 섹터로 표시합니다." if price_store.is_updating()
+                                   else "가격 이력을 불러오지 못해 GICS 섹터로 표시합니다.")
+                    else:
+                        merged_df['Group'] = merged_df['Symbol'].map(clusters).fillna('Unclustered')
+
+                # Finviz Style Color Scale
+                fig_tree = px.treemap(merged_df, 
+                                      path=[px.Constant(index_name), 'Group', 'Symbol'], 
+                                      values='TradedValue',
+                                      color='PctChange',
+                                      color_continuous_scale=[(0, "#f63538"), (0.5, "#414554"), (1, "#30cc5a")],
+                                      range_color=[-performance.HORIZONS[horizon][1], performance.HORIZONS[horizon][1]],
+                                      custom_data=['Name', 'Price', 'PctChange', 'Symbol'])
+
+                fig_tree.update_traces(
+                    texttemplate="%{label}<br>%{customdata[2]:.2f}%",
+                    hovertemplate='<b>%{customdata[0]}</b><br>Ticker: %{customdata[3]}<br>Price: $%{customdata[1]:.2f}<br>Change: %{customdata[2]:.2f}%<extra></extra>',
+                    textposition="middle center",
+                    textfont=dict(color='white', size=14, family="Arial")
+                )
+
+                fig_tree.update_layout(margin=dict(t=0, l=0, r=0, b=0), height=600, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+
+                event = st.plotly_chart(fig_tree, use_container_width=True, on_select="rerun", selection_mode="points", key=f"map_{index_name}")
+                if not stored:
+                    st.caption("가격 이력을 받는 중이라 최근 일봉 기준 1D 등락률로 표시합니다 (다 받으면 기간을 고를 수 있습니다)."
+                               if price_store.is_updating() else "가격 저장소를 쓸 수 없어 최근 일봉 기준 1D 등락률로 표시합니다.")
+                elif start_date is not None:
+                    st.caption(f"{horizon} 수익률: {start_date:%Y-%m-%d} 종가 대비 · 크기는 마지막 거래일 거래대금")
+
+                if event and "selection" in event and "points" in event["selection"]:
+                     points = event["selection"]["points"]
+                     if points:
+                         first_point = points[0]
+                         if 'customdata' in first_point:
+                             clicked_ticker = first_point['customdata'][3]
+                             st.session_state.ticker_symbol = clicked_ticker
+                             st.rerun()
+            elif stored:
+                st.warning(f"{index_name} {horizon} 수익률을 계산할 가격 이력이 부족합니다.")
+            else:
+                st.error(f"{index_name} 데이터 로드 실패. 시장이 열려있는지 확인하세요.")
+    else:
+        st.error(f"티커 리스트 로드 실패: {err}")
+
+
+def render():
+    st.header("🏢 주요 지수 퍼포먼스 맵")
+
+    # 탭 구성
+    tab_sp500, tab_dow, tab_nasdaq = st.tabs(["S&P 500", "DOW", "NASDAQ 100"])
+    
+    with tab_sp500:
+        render_map_tab("S&P 500", load_sp500_tickers)
+    with tab_dow:
+        render_map_tab("DOW", load_dow_tickers)
+    with tab_nasdaq:
+        render_map_tab("NASDAQ 100", load_nasdaq_tickers)
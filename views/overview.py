@@ -0,0 +1,33 @@
+"""
+섹션 1: 회사 개요 카드.
+"""
+import streamlit as st
+
+from styles import create_metric_card
+from tracing import traced
+
+
+@traced('section.overview')
+def render(ticker_symbol, history, info):
+    # -----------------------------------------------------
+    # 섹션 1: 회사 개요 (Custom Card Design)
+    # -----------------------------------------------------
+    with st.container():
+        info_col1, info_col2, info_col3 = st.columns(3)
+        current_price = history['Close'].iloc[-1]
+        previous_price = history['Close'].iloc[-2] if len(history) > 1 else current_price
+        delta = current_price - previous_price
+        delta_pct = (delta / previous_price) * 100 if previous_price != 0 else 0
+
+        company_name = info.get('longName', ticker_symbol)
+        sector = info.get('sector', 'N/A')
+
+        with info_col1:
+            st.markdown(create_metric_card("Company Name", company_name), unsafe_allow_html=True)
+        with info_col2:
+            st.markdown(create_metric_card("Sector / Industry", sector), unsafe_allow_html=True)
+        with info_col3:
+            # Price with Delta & Percentage
+            st.markdown(create_metric_card("Current Price", f"{current_price:.2f}", delta=delta, delta_pct=delta_pct, prefix="$"), unsafe_allow_html=True)
+
+        st.markdown("---")
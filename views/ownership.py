@@ -0,0 +1,125 @@
+"""
+섹션 7: 투자자 분석 (Ownership Analysis).
+"""
+import pandas as pd
+import streamlit as st
+
+from data import load_ownership_data
+import ownership_store
+from utils import fmt_bn
+from tracing import traced
+
+
+def _pct(x):
+    return f"{x*100:,.2f}%" if pd.notnull(x) else "-"
+
+
+@traced('section.ownership_universe')
+def render_holder_universe(inst_holders):
+    """
+    로컬 저장소(ownership_store.py refresh로 미리 수집)에서 이 종목 보유 기관의 다른 보유 종목과
+    기관 보유가 몰린 종목을 보여줍니다. 화면에서는 수집하지 않으며, 저장소가 없으면 표시하지 않습니다.
+    """
+    try:
+        summary = ownership_store.store_summary()
+    except Exception:
+        return
+    if not summary or not summary['symbols']:
+        return
+
+    with st.expander(f"🔎 기관별 보유 종목 (저장된 {summary['symbols']}개 종목, {summary['holders']}개 기관)"):
+        tab_holder, tab_crowded = st.tabs(["기관별 보유 종목", "기관 보유 집중 종목 Top 20"])
+
+        with tab_holder:
+            names = []
+            if inst_holders is not None and not inst_holders.empty and 'Holder' in inst_holders.columns:
+                names = inst_holders['Holder'].dropna().astype(str).tolist()
+            if not names:
+                st.caption("보유 기관 정보가 없습니다.")
+            else:
+                col_name, col_filter = st.columns([0.6, 0.4])
+                holder = col_name.selectbox("기관", names, key="ownership_universe_holder")
+                change = col_filter.radio("지분율 변화", ["전체", "증가", "감소"], horizontal=True,
+                                          key="ownership_universe_change")
+                increased = {"전체": None, "증가": True, "감소": False}[change]
+                positions = ownership_store.holder_positions(holder, increased=increased)
+                if positions.empty:
+                    st.caption("조건에 맞는 보유 종목이 없습니다.")
+                else:
+                    disp = positions.drop(columns=['holder'])
+                    disp['value'] = disp['value'].apply(lambda x: fmt_bn(x) if pd.notnull(x) else x)
+                    disp['shares'] = disp['shares'].apply(lambda x: fmt_bn(x) if pd.notnull(x) else x)
+                    disp['pct_held'] = disp['pct_held'].apply(_pct)
+                    disp['pct_change'] = disp['pct_change'].apply(_pct)
+                    disp = disp.rename(columns={'symbol': 'Symbol', 'date_reported': '보고일', 'pct_held': '지분율',
+                                                'shares': '보유 주식수', 'value': '평가 가치', 'pct_change': '지분율 변화'})
+                    st.dataframe(disp, use_container_width=True, hide_index=True)
+
+        with tab_crowded:
+            crowded = ownership_store.most_crowded(20)
+            if crowded.empty:
+                st.caption("저장된 데이터가 없습니다.")
+            else:
+                disp = crowded[['symbol', 'institutions_pct', 'top_holders_pct', 'insiders_pct', 'latest_report']].copy()
+                for col in ('institutions_pct', 'top_holders_pct', 'insiders_pct'):
+                    disp[col] = disp[col].apply(_pct)
+                disp = disp.rename(columns={'symbol': 'Symbol', 'institutions_pct': '기관 보유 비중',
+                                            'top_holders_pct': '상위 기관 지분율 합', 'insiders_pct': '내부자 보유 비중',
+                                            'latest_report': '보고일'})
+                st.dataframe(disp, use_container_width=True, hide_index=True)
+
+        refreshed = summary['refreshed_at']
+        if refreshed is not None:
+            st.caption(f"마지막 수집 {refreshed:%Y-%m-%d %H:%M} UTC")
+
+
+@traced('section.ownership')
+def render(ticker_symbol):
+    # -----------------------------------------------------
+    # 섹션 7: 투자자 분석 (Investor Analysis)
+    # -----------------------------------------------------
+    st.markdown("---")
+    st.header("👥 투자자 분석 (Ownership Analysis)")
+
+    ownership = load_ownership_data(ticker_symbol)
+
+    if ownership:
+         # 1. Top Institutional Holders Only (User Requested Deletion of Shareholders Pie Chart)
+         st.subheader("주요 보유 기관 (Top Institutions)")
+         inst_holders = ownership.get('institutional')
+
+         if inst_holders is not None and not inst_holders.empty:
+             disp_inst = inst_holders.copy()
+
+             # Format Numbers (Quantity/Value) uses fmt_bn (Billions/Millions/etc)
+             if 'Value' in disp_inst.columns:
+                 disp_inst['Value'] = disp_inst['Value'].apply(lambda x: fmt_bn(x) if pd.notnull(x) else x)
+             if 'Shares' in disp_inst.columns:
+                 disp_inst['Shares'] = disp_inst['Shares'].apply(lambda x: fmt_bn(x) if pd.notnull(x) else x)
+             if 'Date Reported' in disp_inst.columns:
+                  disp_inst['Date Reported'] = pd.to_datetime(disp_inst['Date Reported']).dt.strftime('%Y-%m-%d')
+
+             # Format Percentage Columns (Multiply by 100 and add %)
+             # yfinance usually returns 0.05 for 5%. User wants "5.00%"
+             for pct_col in ['pctHeld', 'pctChange']:
+                 if pct_col in disp_inst.columns:
+                     disp_inst[pct_col] = disp_inst[pct_col].apply(lambda x: f"{x*100:,.2f}%" if pd.notnull(x) and isinstance(x, (int, float)) else x)
+
+             # Translate Columns
+             inst_columns_map = {
+                 "Holder": "기관명",
+                 "Shares": "보유 주식수",
+                 "Date Reported": "보고일",
+                 "pctHeld": "지분율",
+                 "pctChange": "지분율 변화",
+                 "Value": "평가 가치"
+             }
+             disp_inst.rename(columns=inst_columns_map, inplace=True)
+
+             st.dataframe(disp_inst, use_container_width=True, hide_index=True)
+         else:
+             st.info("기관 보유 데이터 없음")
+
+         render_holder_universe(inst_holders)
+    else:
+        st.info("주주 데이터를 불러올 수 없습니다.")
@@ -0,0 +1,116 @@
+"""
+리스크 지표 섹션 (베타/변동성/낙폭을 일봉에서 직접 계산).
+
+종목 화면: 종목 일봉과 ^GSPC 일봉(둘 다 load_price_history 캐시)으로 계산하고, Yahoo Beta와 나란히 보여줍니다.
+price_store 행렬이 있으면 지수 전체에서의 백분위도 붙입니다 (화면에서 수집하지 않음).
+초기 화면: 행렬이 있을 때만 지수 전체 리스크 순위 표를 보여줍니다.
+"""
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+import compare
+import risk
+from data import load_price_history
+from styles import create_metric_card
+from tracing import traced
+
+CARDS = [
+    ('beta', "Beta (1Y, 직접 계산)", "{:.2f}", ""),
+    ('volatility', "Volatility (1Y)", "{:.1f}", "%"),
+    ('downside_deviation', "Downside Deviation", "{:.1f}", "%"),
+    ('max_drawdown', "Max Drawdown (1Y)", "{:.1f}", "%"),
+]
+RANKING_LIMIT = 100
+
+
+def _rolling_beta_chart(series_by_window):
+    fig = go.Figure()
+    for window, series in series_by_window.items():
+        fig.add_trace(go.Scatter(x=series.index, y=series, mode='lines', name=f"{window}일",
+                                 hovertemplate=f'{window}일 베타: %{{y:.2f}}<extra></extra>'))
+    fig.add_hline(y=1, line_dash='dot', line_color='rgba(200,200,200,0.5)')
+    fig.update_layout(
+        title=dict(text="S&P 500 대비 이동 베타", x=0, xanchor='left'),
+        height=320,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+        margin=dict(t=60, l=10, r=10, b=10),
+    )
+    fig.update_yaxes(showgrid=True, gridcolor='rgba(128,128,128,0.2)')
+    return fig
+
+
+def _percentile_note(metric, value):
+    try:
+        pct = risk.percentile_in_universe(metric, value)
+    except Exception:
+        return ""
+    return f" <span style='font-size:0.6em;color:gray;'>P{pct:.0f}</span>" if pct is not None else ""
+
+
+@traced('section.risk')
+def render(ticker_symbol, history, info):
+    benchmark = load_price_history(risk.BENCHMARK)
+    if benchmark is None or benchmark.empty or ticker_symbol == risk.BENCHMARK:
+        return
+    close = compare.align_closes({ticker_symbol: history, risk.BENCHMARK: benchmark})
+    table = risk.compute_risk(close)
+    if table.empty or np.isnan(table.loc[ticker_symbol, 'volatility']):
+        return
+    row = table.loc[ticker_symbol]
+
+    st.markdown("### 📉 리스크 지표 (Risk)")
+    cols = st.columns(len(CARDS) + 1)
+    ranked = False
+    for col, (metric, label, fmt, suffix) in zip(cols, CARDS):
+        value = row[metric]
+        note = _percentile_note(metric, value)
+        ranked = ranked or bool(note)
+        text = fmt.format(value) + suffix + note if not np.isnan(value) else "-"
+        with col:
+            st.markdown(create_metric_card(label, text), unsafe_allow_html=True)
+    with cols[-1]:
+        yahoo_beta = info.get('beta') if info else None
+        st.markdown(create_metric_card("Beta (Yahoo)", f"{yahoo_beta:.2f}" if yahoo_beta is not None else "-"),
+                    unsafe_allow_html=True)
+
+    rolling = {window: risk.rolling_beta(close, ticker_symbol, window=window).dropna()
+               for window in (risk.SHORT_WINDOW, risk.WINDOW)}
+    if any(not series.empty for series in rolling.values()):
+        st.plotly_chart(_rolling_beta_chart(rolling), use_container_width=True)
+    st.caption(f"최근 {risk.WINDOW}거래일 일간 수익률 기준 · 상관계수 {row['correlation']:.2f} · "
+               f"3개월 변동성 {row['volatility_3m']:.1f}% · 1년 고점 대비 {row['current_drawdown']:.1f}%"
+               + (" · P는 지수 전체(가격 저장소) 중 백분위입니다." if ranked else ""))
+
+
+@st.fragment
+@traced('section.risk_ranking')
+def render_universe():
+    """초기 화면: price_store 행렬 전체의 리스크 순위. 행렬이 없으면 표시하지 않습니다."""
+    try:
+        table = risk.universe_risk()
+    except Exception:
+        return
+    if table is None or table.dropna(how='all').empty:
+        return
+
+    with st.expander(f"📉 리스크 순위 ({table['volatility'].notna().sum():,}개 종목, S&P 500 대비)"):
+        col_sort, col_dir = st.columns([3, 1])
+        with col_sort:
+            sort_by = st.selectbox("정렬", list(risk.RISK_LABELS), key="risk_sort",
+                                   format_func=risk.RISK_LABELS.get)
+        with col_dir:
+            ascending = st.radio("순서", ["내림차순", "오름차순"], key="risk_order", horizontal=True) == "오름차순"
+        ranked = table.sort_values(sort_by, ascending=ascending, na_position='last').head(RANKING_LIMIT)
+        st.dataframe(
+            ranked.reset_index(), hide_index=True, use_container_width=True, height=360,
+            column_config={
+                'symbol': st.column_config.TextColumn('Symbol'),
+                **{name: st.column_config.NumberColumn(label, format="%.2f" if name in ('beta', 'correlation') else "%.1f%%")
+                   for name, label in risk.RISK_LABELS.items()},
+            },
+        )
+        st.caption(f"상위 {RANKING_LIMIT}개 · 최근 {risk.WINDOW}거래일 일간 수익률 기준 (python price_store.py update로 갱신)")
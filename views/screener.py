@@ -0,0 +1,79 @@
+"""
+초기 화면의 종목 스크리너 섹션.
+스냅샷(screener.py refresh 또는 백그라운드 갱신)이 있을 때만 표시합니다. 필터/정렬 위젯이 있는 fragment라서
+조건을 바꾸면 이 섹션만 다시 실행되고, 결과 행을 선택하면 해당 종목 분석 화면으로 이동합니다.
+"""
+import streamlit as st
+
+import screener
+from tracing import traced
+
+EXAMPLES = [
+    "pe < 20 and roe > 15%",
+    "market_cap > 100B, dividend_yield >= 2%",
+    "fwd_pe < pe and peg < 1.5",
+    "sector == 'Energy' and beta < 1",
+]
+DISPLAY_LIMIT = 200
+
+
+def _column_config():
+    config = {'name': st.column_config.TextColumn('Company')}
+    for name, (_, label, kind) in screener.FIELDS.items():
+        if kind == 'pct':
+            config[name] = st.column_config.NumberColumn(label, format="percent")
+        elif name == 'market_cap':
+            config[name] = st.column_config.NumberColumn(label, format="compact")
+        elif kind == 'num':
+            config[name] = st.column_config.NumberColumn(label, format="%.2f")
+        elif kind == 'cat':
+            config[name] = st.column_config.TextColumn(label)
+    return config
+
+
+@st.fragment
+@traced('section.screener')
+def render():
+    try:
+        snapshot = screener.load_snapshot()
+    except Exception:
+        return
+    if snapshot is None or len(snapshot) == 0:
+        return
+
+    st.markdown("##### 🔎 종목 스크리너")
+    col_expr, col_sort, col_dir = st.columns([4, 1.2, 0.8])
+    with col_expr:
+        expression = st.text_input(
+            "필터", key="screener_expression", placeholder=EXAMPLES[0],
+            help="조건을 and 또는 ,로 연결합니다. 예: " + " | ".join(EXAMPLES)
+                 + f"\n\n필드: {', '.join(screener.FIELDS)}",
+        )
+    with col_sort:
+        sort_by = st.selectbox("정렬", list(screener.INDEXED_FIELDS), key="screener_sort",
+                               format_func=lambda name: screener.FIELDS[name][1])
+    with col_dir:
+        descending = st.radio("순서", ["내림차순", "오름차순"], key="screener_order") == "내림차순"
+
+    try:
+        result = screener.screen(expression, sort_by, descending, snapshot=snapshot)
+    except ValueError as e:
+        st.warning(str(e))
+        return
+
+    shown = result.head(DISPLAY_LIMIT)
+    event = st.dataframe(
+        shown.reset_index(), hide_index=True, use_container_width=True, height=360,
+        column_config={'symbol': st.column_config.TextColumn('Symbol'), **_column_config()},
+        on_select="rerun", selection_mode="single-row", key="screener_table",
+    )
+    age = screener.snapshot_age_hours()
+    st.caption(f"{len(result):,} / {len(snapshot):,}개 종목"
+               + (f" (상위 {DISPLAY_LIMIT}개 표시)" if len(result) > DISPLAY_LIMIT else "")
+               + (f" · 스냅샷 {age:.1f}시간 전" if age is not None else "")
+               + " · 행을 선택하면 종목 분석으로 이동합니다.")
+
+    rows = event.selection.rows if event else []
+    if rows:
+        st.session_state.ticker_symbol = shown.index[rows[0]]
+        st.rerun()
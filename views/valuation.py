@@ -0,0 +1,121 @@
+"""
+애널리스트 목표 주가와 DCF 적정 가치 (연간 재무제표 기준).
+"""
+import streamlit as st
+
+from utils import format_currency, create_target_price_chart, calculate_dcf_scenarios
+from tracing import traced
+
+
+@traced('section.valuation')
+def render(info, cashflow, balance_sheet, current_price):
+    with st.container():
+        # -----------------------------------------------------
+        # Analyst Target Price Section
+        # -----------------------------------------------------
+        target_mean = info.get('targetMeanPrice')
+        if target_mean:
+            st.markdown("---")
+            st.markdown("### 🎯 애널리스트 목표 주가 (Analyst Targets)")
+
+            an_col1, an_col2 = st.columns([0.65, 0.35])
+
+            with an_col1:
+                target_low = info.get('targetLowPrice')
+                target_high = info.get('targetHighPrice')
+                current_p = info.get('currentPrice')
+                if not current_p: current_p = current_price
+
+                currency = info.get('currency', 'USD')
+                sym = '$' if currency == 'USD' else ''
+
+                fig_target = create_target_price_chart(current_p, target_low, target_mean, target_high, currency=sym)
+                if fig_target:
+                    st.plotly_chart(fig_target, use_container_width=True)
+
+            with an_col2:
+                st.markdown("<div style='height: 10px;'></div>", unsafe_allow_html=True) 
+                st.markdown("#### 투자의견 (Consensus)")
+
+                rec_mean = info.get('recommendationMean')
+                rec_key = info.get('recommendationKey', 'N/A').upper().replace('_', ' ')
+                num_analysts = info.get('numberOfAnalystOpinions')
+
+                # Custom Metric styled
+                st.metric("투자의견", rec_key)
+
+                mc1, mc2, mc3 = st.columns(3)
+                with mc1:
+                     if rec_mean:
+                        st.metric("Mean Score", f"{rec_mean:.1f}", help="1=Strong Buy, 5=Sell")
+                with mc2:
+                     if target_mean:
+                        st.metric("평균 목표주가", f"{sym}{target_mean:,.2f}", help="Average Analyst Target")
+                with mc3:
+                     if num_analysts:
+                        st.metric("애널리스트 수", f"{num_analysts}")
+
+        st.markdown("---")
+        st.markdown("### 💎 적정 가치 산출 (DCF)")
+
+        st.markdown("##### DCF 가치평가 (간이 모델 - Annual Data)")
+
+        # DCF는 항상 연간 데이터 기준 (TTM or Last Year)
+        dcf_cf_data = cashflow
+        dcf_bs_data = balance_sheet
+
+        if dcf_cf_data is not None and not dcf_cf_data.empty and dcf_bs_data is not None and not dcf_bs_data.empty:
+            try:
+                fcf_base, dcf_results = calculate_dcf_scenarios(dcf_cf_data, dcf_bs_data, info.get('sharesOutstanding', 1), current_price)
+
+                st.markdown(f"**Base FCF (Latest Annual)**: {format_currency(fcf_base)}")
+
+                st.markdown("#### 시나리오별 적정 주가 (Scenario Analysis)")
+
+                # Prepare columns for scenarios
+                s_cols = st.columns(5)
+
+                # Loop through scenarios
+                for idx, result in enumerate(dcf_results):
+                    name = result['name']
+                    wacc = result['wacc']
+                    growth = result['growth']
+                    color = result['color']
+                    intrinsic_value = result['intrinsic_value']
+                    upside = result['upside']
+
+                    # Display Card
+                    with s_cols[idx]:
+                        st.markdown(f"""
+                        <div style="
+                            border: 1px solid rgba(255, 255, 255, 0.1);
+                            border-radius: 8px;
+                            padding: 15px;
+                            background-color: #262730;
+                            text-align: center;
+                        ">
+                            <div style="font-size: 1.1em; font-weight: bold; margin-bottom: 10px; color: {color};">
+                                {name}
+                            </div>
+                            <div style="font-size: 0.9em; color: #aaa; margin-bottom: 5px;">
+                                WACC: {wacc*100:.1f}% | Growth: {growth*100:.1f}%
+                            </div>
+                            <div style="font-size: 1.8em; font-weight: bold; color: white;">
+                                ${intrinsic_value:,.2f}
+                            </div>
+                            <div style="font-size: 1.0em; color: {'#39e75f' if upside >= 0 else '#ff4b4b'};">
+                                {upside:+.2f}%
+                            </div>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                # Additional Detail for Base Case (Mental Check)
+                # Optional: Could add a toggle or expander to see calculation detail for Base
+
+                st.markdown("")
+                st.info("💡 **가정 설명 (Assumptions)**: 각 시나리오는 WACC(할인율), 향후 5년 성장률, 영구 성장률을 다르게 적용하여 산출되었습니다.")
+
+            except Exception as e:
+                st.error(f"DCF 계산 중 오류가 발생했습니다: {e}")
+        else:
+            st.warning("DCF 계산을 위한 충분한 재무 데이터(현금흐름표/대차대조표)가 없습니다.")
@@ -0,0 +1,347 @@
+"""
+재무제표 로컬 저장소 (long format, Parquet).
+
+load_stock_data는 종목별 wide DataFrame(항목 × 기간)을 돌려줍니다. 여기서는 지수 구성 종목 전체의
+재무제표 6종을 (symbol, statement, frequency, line_item, period_end, value) 한 줄씩의 long format으로
+BENJAMIN_DATA_DIR/fundamentals/ 아래 종목별 Parquet 파일에 저장하고, 전체를 한 번 읽어 메모리에 캐시한 뒤
+종목 간 질의(섹터 내 매출 성장률 순위, 500개 종목 마진 추이 등)를 Yahoo 호출 없이 바로 답합니다.
+
+    python warehouse.py refresh sp500                # 7일 안에 받은 종목은 건너뜀
+    python warehouse.py refresh all --force
+    python warehouse.py growth "Total Revenue" --sector "Information Technology"
+    python warehouse.py margin "Operating Income"
+
+statement: income / balance / cashflow,  frequency: annual / quarterly
+line_item은 yfinance 원래 항목명(영문)입니다 (예: 'Total Revenue', 'Free Cash Flow').
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import store
+from cache import shared_cache
+from tracing import traced
+
+WAREHOUSE_DIR = 'fundamentals'
+
+DEFAULT_MAX_WORKERS = 8
+# 재무제표는 분기마다 바뀌므로 이 기간 안에 받은 종목은 다시 받지 않습니다
+DEFAULT_MIN_AGE_DAYS = 7
+
+COLUMNS = ['symbol', 'statement', 'frequency', 'line_item', 'period_end', 'value']
+_CATEGORY_COLUMNS = ['symbol', 'statement', 'frequency', 'line_item']
+
+
+def _schema():
+    """쓰기/읽기에 같이 쓰는 Parquet 스키마. 파일마다 추론하면 타입이 달라져 한 번에 읽지 못할 수 있습니다."""
+    import pyarrow as pa
+    return pa.schema([(col, pa.string()) for col in _CATEGORY_COLUMNS]
+                     + [('period_end', pa.timestamp('ns')), ('value', pa.float64())])
+
+
+def _dir():
+    path = store.data_path(WAREHOUSE_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _symbol_path(symbol):
+    return os.path.join(_dir(), f'{symbol}.parquet')
+
+
+def to_long(symbol, statements):
+    """
+    {(statement, frequency): wide DataFrame(항목 × 기간)} -> long DataFrame (COLUMNS).
+    값이 없는 칸은 저장하지 않습니다.
+    """
+    frames = []
+    for (statement, frequency), wide in statements.items():
+        if wide is None or wide.empty:
+            continue
+        values = wide.to_numpy(dtype=float, na_value=np.nan)
+        periods = pd.to_datetime(wide.columns, errors='coerce')
+        items = wide.index.astype(str)
+        # 항목 × 기간 격자를 한 번에 펼침
+        item_idx, period_idx = np.nonzero(~np.isnan(values) & ~periods.isna()[None, :])
+        if len(item_idx) == 0:
+            continue
+        frames.append(pd.DataFrame({
+            'symbol': symbol,
+            'statement': statement,
+            'frequency': frequency,
+            'line_item': items[item_idx],
+            'period_end': periods[period_idx].tz_localize(None) if periods.tz is not None else periods[period_idx],
+            'value': values[item_idx, period_idx],
+        }))
+    if not frames:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in
+                             zip(COLUMNS, [object, object, object, object, 'datetime64[ns]', float])})
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_symbol(symbol, long_df):
+    """종목 하나의 파일을 통째로 교체합니다 (임시 파일에 쓴 뒤 rename). 빈 표는 쓰지 않고 ValueError."""
+    if long_df.empty:
+        raise ValueError(f'no statements for {symbol}')
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    path = _symbol_path(symbol)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    pq.write_table(pa.Table.from_pandas(long_df[COLUMNS], schema=_schema(), preserve_index=False), tmp)
+    os.replace(tmp, path)
+
+
+def stored_symbols():
+    """저장된 종목 -> 파일 수정 시각 (unix time)."""
+    if not store.exists(WAREHOUSE_DIR):
+        return {}
+    out = {}
+    with os.scandir(_dir()) as entries:
+        for entry in entries:
+            if entry.name.endswith('.parquet'):
+                out[entry.name[:-len('.parquet')]] = entry.stat().st_mtime
+    return out
+
+
+def refresh_symbols(symbols, max_workers=DEFAULT_MAX_WORKERS, min_age_days=DEFAULT_MIN_AGE_DAYS, progress=None):
+    """
+    symbols의 재무제표를 동시에 max_workers개씩 받아 종목별 Parquet 파일로 저장합니다.
+    min_age_days 안에 저장한 종목은 건너뜁니다 (0이면 모두 받음). 쓰기는 호출한 스레드에서만 합니다.
+    재무제표가 하나도 없으면 (상장폐지/ETF/일시적 실패) 실패로 세고 기존 파일은 그대로 둡니다.
+
+    반환: {'requested', 'fetched', 'skipped', 'failed', 'rows', 'seconds', 'errors': {symbol: message}}
+    """
+    from data import fetch_financial_statements  # streamlit import는 실제 수집할 때만
+
+    start = time.perf_counter()
+    symbols = list(dict.fromkeys(symbols))
+    if min_age_days > 0:
+        cutoff = time.time() - min_age_days * 86400
+        stored = stored_symbols()
+        targets = [s for s in symbols if stored.get(s, 0) < cutoff]
+    else:
+        targets = symbols
+    stats = {'requested': len(symbols), 'fetched': 0, 'skipped': len(symbols) - len(targets),
+             'failed': 0, 'rows': 0, 'errors': {}}
+
+    for done, (symbol, statements, error) in enumerate(store.fetch_all(fetch_financial_statements, targets, max_workers), 1):
+        if progress:
+            progress(done, len(targets), symbol)
+        if error is None:
+            try:
+                long_df = to_long(symbol, statements)
+                write_symbol(symbol, long_df)
+            except Exception as e:
+                error = e
+        if error is not None:
+            stats['failed'] += 1
+            stats['errors'][symbol] = f'{type(error).__name__}: {error}'
+            continue
+        stats['fetched'] += 1
+        stats['rows'] += len(long_df)
+
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def refresh_index(index='sp500', **kwargs):
+    """지수 구성 종목 전체를 refresh_symbols로 수집합니다 (index: sp500/dow/nasdaq/all)."""
+    from data import load_index_symbols
+    return refresh_symbols(load_index_symbols(index), **kwargs)
+
+
+# -------------------------------------------------------------
+# 조회
+# -------------------------------------------------------------
+def version():
+    """저장소 버전 (파일 수, 마지막 수정 시각). 새로 수집하면 바뀌므로 캐시 키로 씁니다."""
+    stored = stored_symbols()
+    return len(stored), max(stored.values(), default=0.0)
+
+
+@shared_cache(max_bytes=256 * 1024 * 1024)
+def _load(version_key):
+    paths = [_symbol_path(symbol) for symbol in sorted(stored_symbols())]
+    if not paths:
+        return None
+    # 종목별 파일을 pyarrow가 한 번에 읽어 하나의 테이블로 합침 (예전에 쓴 파일도 같은 스키마로 맞춤)
+    import pyarrow.parquet as pq
+    df = pq.read_table(paths, schema=_schema()).to_pandas()
+    for col in _CATEGORY_COLUMNS:
+        df[col] = df[col].astype('category')
+    df['period_end'] = pd.to_datetime(df['period_end'])
+    return df.sort_values(['statement', 'frequency', 'line_item', 'symbol', 'period_end'],
+                          kind='stable', ignore_index=True)
+
+
+@traced()
+def load_fundamentals():
+    """
+    저장소 전체를 long DataFrame으로 (문자열 컬럼은 category). 저장소가 바뀌지 않는 한 메모리 캐시를 씁니다.
+    저장소가 비어 있으면 None.
+    """
+    return _load(version())
+
+
+def select(line_items=None, frequency='annual', statement=None, symbols=None):
+    """
+    조건에 맞는 long 행. line_items는 항목명 하나 또는 리스트.
+    """
+    df = load_fundamentals()
+    if df is None:
+        return pd.DataFrame(columns=COLUMNS)
+    mask = df['frequency'] == frequency
+    if line_items is not None:
+        items = [line_items] if isinstance(line_items, str) else list(line_items)
+        mask &= df['line_item'].isin(items)
+    if statement is not None:
+        mask &= df['statement'] == statement
+    if symbols is not None:
+        mask &= df['symbol'].isin(list(symbols))
+    return df.loc[mask]
+
+
+@traced()
+def line_item_frame(line_item, frequency='annual', symbols=None, statement=None):
+    """항목 하나의 기간 × 종목 wide 표 (index=period_end, columns=symbol)."""
+    rows = select(line_item, frequency, statement, symbols)
+    if rows.empty:
+        return pd.DataFrame()
+    # 같은 항목명이 여러 재무제표에 있으면 먼저 나오는 값 사용
+    rows = rows.drop_duplicates(['period_end', 'symbol'])
+    wide = rows.pivot(index='period_end', columns='symbol', values='value')
+    wide.columns = wide.columns.astype(str)
+    return wide.sort_index()
+
+
+@traced()
+def margin_series(numerator, denominator='Total Revenue', frequency='annual', symbols=None):
+    """
+    numerator / denominator 비율의 기간 × 종목 표 (예: 'Operating Income' / 'Total Revenue' = 영업이익률).
+    분모가 0 이하이거나 없는 칸은 NaN.
+    """
+    num = line_item_frame(numerator, frequency, symbols)
+    den = line_item_frame(denominator, frequency, symbols)
+    if num.empty or den.empty:
+        return pd.DataFrame()
+    num, den = num.align(den, join='inner')
+    return num / den.where(den > 0)
+
+
+@traced()
+def growth_ranks(line_item='Total Revenue', frequency='annual', sector=None, symbols=None, sectors=None,
+                 statement=None):
+    """
+    종목별 최근 기간의 직전 기간 대비 성장률과 섹터 내 순위.
+    sectors: {symbol: sector} (기본: data.load_sector_map()). sector를 주면 그 섹터만.
+    같은 항목명이 여러 재무제표에 있으면 statement로 고르거나, 아니면 먼저 나오는 재무제표 값을 씁니다.
+
+    반환: DataFrame [symbol, sector, period_end, value, previous, growth, sector_rank, sector_count, sector_pct]
+          (sector, growth 내림차순). sector_pct = 섹터 내 백분위 (1.0이 최고)
+    """
+    rows = select(line_item, frequency, statement, symbols)
+    columns = ['symbol', 'sector', 'period_end', 'value', 'previous', 'growth', 'sector_rank', 'sector_count', 'sector_pct']
+    if rows.empty:
+        return pd.DataFrame(columns=columns)
+    rows = rows.drop_duplicates(['symbol', 'period_end']).sort_values(['symbol', 'period_end'], kind='stable')
+
+    # (symbol, period_end) 순으로 정렬했으므로 종목 경계만 보면 직전 기간 값을 얻을 수 있음
+    symbol_codes = rows['symbol'].cat.codes.to_numpy()
+    values = rows['value'].to_numpy()
+    last = np.flatnonzero(np.r_[symbol_codes[1:] != symbol_codes[:-1], True])
+    has_previous = (last > 0) & (symbol_codes[np.maximum(last - 1, 0)] == symbol_codes[last])
+    previous = np.where(has_previous, values[np.maximum(last - 1, 0)], np.nan)
+
+    out = pd.DataFrame({
+        'symbol': rows['symbol'].to_numpy()[last].astype(str),
+        'period_end': rows['period_end'].to_numpy()[last],
+        'value': values[last],
+        'previous': previous,
+    })
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out['growth'] = (out['value'] - out['previous']) / np.abs(out['previous'])
+    out.loc[~np.isfinite(out['growth']), 'growth'] = np.nan
+
+    if sectors is None:
+        from data import load_sector_map
+        sectors = load_sector_map()
+    out['sector'] = out['symbol'].map(sectors).fillna('Unknown')
+    if sector is not None:
+        out = out[out['sector'] == sector]
+
+    grouped = out.groupby('sector')['growth']
+    out['sector_rank'] = grouped.rank(ascending=False, method='min')
+    out['sector_count'] = grouped.transform('count')
+    out['sector_pct'] = grouped.rank(pct=True)
+    return (out[columns].sort_values(['sector', 'growth'], ascending=[True, False], na_position='last')
+            .reset_index(drop=True))
+
+
+def store_summary():
+    """저장된 종목 수/행 수/마지막 수집 시각. 저장소가 없으면 None."""
+    stored = stored_symbols()
+    if not stored:
+        return None
+    df = load_fundamentals()
+    return {'symbols': len(stored), 'rows': 0 if df is None else len(df),
+            'refreshed_at': pd.Timestamp(max(stored.values()), unit='s')}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='재무제표 로컬 저장소 (long format Parquet)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_refresh = sub.add_parser('refresh', help='지수 구성 종목의 재무제표 수집')
+    p_refresh.add_argument('index', nargs='?', default='sp500', choices=('sp500', 'dow', 'nasdaq', 'all'))
+    p_refresh.add_argument('--symbols', nargs='+', help='지수 대신 이 종목들만 수집')
+    p_refresh.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS)
+    p_refresh.add_argument('--force', action='store_true', help='최근에 수집한 종목도 다시 수집')
+
+    p_growth = sub.add_parser('growth', help='섹터 내 성장률 순위')
+    p_growth.add_argument('line_item', nargs='?', default='Total Revenue')
+    p_growth.add_argument('--sector')
+    p_growth.add_argument('--quarterly', action='store_true')
+
+    p_margin = sub.add_parser('margin', help='마진 추이 (numerator / Total Revenue)')
+    p_margin.add_argument('numerator', nargs='?', default='Operating Income')
+    p_margin.add_argument('--denominator', default='Total Revenue')
+    p_margin.add_argument('--quarterly', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.command == 'refresh':
+        def progress(done, total, symbol):
+            print(f'\r{done}/{total} {symbol:<8}', end='', flush=True)
+
+        kwargs = {'max_workers': args.workers, 'min_age_days': 0 if args.force else DEFAULT_MIN_AGE_DAYS,
+                  'progress': progress}
+        if args.symbols:
+            stats = refresh_symbols([s.upper() for s in args.symbols], **kwargs)
+        else:
+            stats = refresh_index(args.index, **kwargs)
+        print(f"\n{stats['fetched']} fetched, {stats['skipped']} skipped, {stats['failed']} failed, "
+              f"{stats['rows']} rows in {stats['seconds']:.1f}s")
+        for symbol, message in sorted(stats['errors'].items()):
+            print(f'  {symbol:<8} {message}')
+        return 0
+
+    frequency = 'quarterly' if args.quarterly else 'annual'
+    load_fundamentals()  # 디스크 읽기는 질의 시간에서 제외
+    start = time.perf_counter()
+    if args.command == 'growth':
+        result = growth_ranks(args.line_item, frequency, sector=args.sector)
+    else:
+        result = margin_series(args.numerator, args.denominator, frequency)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    with pd.option_context('display.width', 160, 'display.max_rows', 60):
+        print(result if not result.empty else 'no results')
+    print(f'{result.shape} in {elapsed:.1f}ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())